@@ -0,0 +1,77 @@
+"""
+PDF处理引擎
+
+不依赖 tkinter 的纯函数接口：输入文件路径和参数，返回结果或抛出 errors 中定义的异常。
+界面（pdf工具合集.py）和批处理脚本都通过这里调用实际的PDF操作。
+"""
+
+from .docinfo import (
+    DEFAULT_CACHE_NAME,
+    DocumentInfoCache,
+    cached_document_info,
+    document_info,
+    page_count,
+    set_document_info_cache,
+)
+from .doccache import DocumentCache, borrow_fitz, borrow_reader, set_document_cache
+from .encrypt import encrypt_pdf
+from .errors import (
+    InputFileError,
+    OperationCancelled,
+    PageRangeError,
+    PDFToolError,
+    WatermarkError,
+)
+from .extract import extract_images
+from .fonts import FontIndex, register_chinese_fonts
+from .insert import insert_index, insert_multiple, insert_pdf, insert_plan
+from .jobs import BackgroundJob, JobExecutor, MapJob
+from .merge import merge_pdfs
+from .page_batch import insert_into_files, replace_in_files
+from .pages import PageSet, parse_page_ranges
+from .plan import PagePlan
+from .replace import build_replace_map, replace_pdf
+from .split import split_pdf
+from .watermark import add_image_watermark, add_text_watermark
+from .watermark_batch import watermark_files
+
+__all__ = [
+    "PDFToolError",
+    "InputFileError",
+    "PageRangeError",
+    "WatermarkError",
+    "OperationCancelled",
+    "merge_pdfs",
+    "split_pdf",
+    "insert_pdf",
+    "insert_index",
+    "insert_multiple",
+    "insert_plan",
+    "replace_pdf",
+    "build_replace_map",
+    "insert_into_files",
+    "replace_in_files",
+    "encrypt_pdf",
+    "add_text_watermark",
+    "add_image_watermark",
+    "watermark_files",
+    "register_chinese_fonts",
+    "FontIndex",
+    "extract_images",
+    "parse_page_ranges",
+    "PageSet",
+    "PagePlan",
+    "page_count",
+    "document_info",
+    "cached_document_info",
+    "set_document_info_cache",
+    "DocumentInfoCache",
+    "DEFAULT_CACHE_NAME",
+    "DocumentCache",
+    "set_document_cache",
+    "borrow_reader",
+    "borrow_fitz",
+    "JobExecutor",
+    "BackgroundJob",
+    "MapJob",
+]
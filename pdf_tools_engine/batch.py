@@ -0,0 +1,284 @@
+"""
+按任务清单批量处理PDF
+
+清单可以是 JSON 或 CSV 文件，每个任务用 op 字段指定操作，其余字段与对应引擎函数的参数同名：
+
+    [
+        {"op": "merge", "input_files": ["a.pdf", "b.pdf"], "output_path": "ab.pdf"},
+        {"op": "watermark", "type": "text", "input_file": "a.pdf",
+         "output_path": "a_wm.pdf", "text": "CONFIDENTIAL"},
+        {"op": "encrypt", "input_file": "a.pdf", "output_path": "a_enc.pdf",
+         "password": "123"},
+        {"op": "watermark_files", "inputs": "待处理", "output_dir": "已加水印",
+         "watermark_type": "image", "image_path": "logo.png"},
+        {"op": "insert_files", "insert_file": "封面.pdf", "inputs": "合同",
+         "output_dir": "已加封面", "method": "head"}
+    ]
+
+JSON 清单也可以写成 {"jobs": [...]}。CSV 清单第一行为列名，空单元格表示使用默认值，
+input_files 列中的多个文件用 ";" 分隔。字符串形式的参数值按 _PARAM_TYPES 中的类型
+转换：布尔值写 true/false、1/0 或 yes/no，颜色写 "0.5;0.5;0.5"。
+
+用法：
+    python pdf工具合集.py 清单.json [-j 进程数]
+    python -m pdf_tools_engine.batch 清单.csv [-j 进程数]
+"""
+
+import argparse
+import csv
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .encrypt import encrypt_pdf
+from .extract import extract_images
+from .insert import insert_pdf
+from .merge import merge_pdfs
+from .page_batch import insert_into_files, replace_in_files
+from .replace import replace_pdf
+from .split import split_pdf
+from .watermark import add_image_watermark, add_text_watermark
+from .watermark_batch import watermark_files
+
+# 操作名称 -> 引擎函数
+OPERATIONS = {
+    "merge": merge_pdfs,
+    "split": split_pdf,
+    "insert": insert_pdf,
+    "replace": replace_pdf,
+    "insert_files": insert_into_files,
+    "replace_files": replace_in_files,
+    "encrypt": encrypt_pdf,
+    "watermark_text": add_text_watermark,
+    "watermark_image": add_image_watermark,
+    "watermark_files": watermark_files,
+    "extract": extract_images,
+}
+
+# 布尔参数可以写成的字符串
+_BOOL_WORDS = {
+    "true": True, "1": True, "yes": True,
+    "false": False, "0": False, "no": False,
+}
+
+
+def _parse_bool(text):
+    value = _BOOL_WORDS.get(text.strip().lower())
+    if value is None:
+        raise ValueError(f"无法识别的布尔值：{text}")
+    return value
+
+
+def _parse_floats(text):
+    return tuple(float(part) for part in text.replace(",", ";").split(";"))
+
+
+def _parse_ints(text):
+    return [int(part) for part in text.replace(",", ";").split(";") if part.strip()]
+
+
+_WATERMARK_TYPES = {
+    "font_size": int,
+    "color": _parse_floats,
+    "alpha": float,
+    "rotation": float,
+    "opacity": float,
+    "scale_percent": int,
+    "rotation_angle": float,
+    "workers": int,
+    "page_indices": _parse_ints,
+}
+
+_PAGE_BATCH_TYPES = {"position": int, "workers": int}
+
+# 操作名称 -> {参数名: 转换函数}，字符串形式的参数值（如 CSV 中的 "30"、"false"）按此
+# 转换；不在表中的参数保持字符串
+_PARAM_TYPES = {
+    "merge": {"prefetch": int, "dedup": _parse_bool, "append": _parse_bool},
+    "split": {"pages_per_file": int},
+    "insert": {"position": int},
+    "replace": {"position": int},
+    "insert_files": _PAGE_BATCH_TYPES,
+    "replace_files": _PAGE_BATCH_TYPES,
+    "watermark_text": _WATERMARK_TYPES,
+    "watermark_image": _WATERMARK_TYPES,
+    "watermark_files": _WATERMARK_TYPES,
+}
+
+# 需要自动创建上级目录的输出参数
+_OUTPUT_FILE_PARAMS = ("output_path",)
+_OUTPUT_DIR_PARAMS = ("output_dir",)
+
+
+def load_manifest(manifest_path):
+    """
+    读取任务清单
+
+    Args:
+        manifest_path: JSON 或 CSV 清单文件路径
+
+    Returns:
+        list: 任务字典列表
+    """
+    if manifest_path.lower().endswith(".csv"):
+        with open(manifest_path, newline="", encoding="utf-8-sig") as f:
+            jobs = []
+            for row in csv.DictReader(f):
+                job = {
+                    k.strip(): v.strip()
+                    for k, v in row.items()
+                    if k and v and v.strip()
+                }
+                if "input_files" in job:
+                    job["input_files"] = [
+                        p.strip() for p in job["input_files"].split(";") if p.strip()
+                    ]
+                jobs.append(job)
+            return jobs
+
+    with open(manifest_path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("jobs", [])
+    if not isinstance(data, list):
+        raise ValueError("任务清单必须是任务列表或包含 jobs 字段的对象")
+    return data
+
+
+def resolve_job(job):
+    """
+    将任务字典解析为 (引擎函数, 参数字典)
+
+    未知参数会报错（函数接受 **kwargs 时除外）；字符串形式的参数值按 _PARAM_TYPES
+    转换，无法转换时报错。
+    """
+    job = dict(job)
+    op = job.pop("op", None)
+    if op == "watermark":
+        watermark_type = job.pop("type", "text")
+        op = "watermark_image" if watermark_type == "image" else "watermark_text"
+    if op not in OPERATIONS:
+        raise ValueError(f"未知的操作：{op}")
+
+    func = OPERATIONS[op]
+    params = inspect.signature(func).parameters
+    var_keyword = any(p.kind == p.VAR_KEYWORD for p in params.values())
+    types = _PARAM_TYPES.get(op, {})
+    kwargs = {}
+    for name, value in job.items():
+        if name == "progress" or (name not in params and not var_keyword):
+            raise ValueError(f"操作 {op} 不支持参数：{name}")
+        if isinstance(value, str) and name in types:
+            try:
+                value = types[name](value)
+            except ValueError:
+                raise ValueError(f"操作 {op} 的参数 {name} 的值无效：{value}") from None
+        kwargs[name] = value
+    return func, kwargs
+
+
+def run_job(job):
+    """
+    执行单个任务，不抛出异常
+
+    Returns:
+        dict: 包含 op、ok、seconds、result 或 error 的结果字典
+    """
+    start = time.perf_counter()
+    outcome = {"op": job.get("op")}
+    try:
+        func, kwargs = resolve_job(job)
+        for name in _OUTPUT_FILE_PARAMS:
+            if kwargs.get(name):
+                output_dir = os.path.dirname(os.path.abspath(kwargs[name]))
+                os.makedirs(output_dir, exist_ok=True)
+        for name in _OUTPUT_DIR_PARAMS:
+            if kwargs.get(name):
+                os.makedirs(kwargs[name], exist_ok=True)
+        outcome["result"] = func(**kwargs)
+        outcome["ok"] = True
+    except Exception as e:
+        outcome["ok"] = False
+        outcome["error"] = f"{type(e).__name__}: {e}"
+    outcome["seconds"] = time.perf_counter() - start
+    return outcome
+
+
+def run_jobs(jobs, workers=None, on_done=None):
+    """
+    并行执行任务列表
+
+    Args:
+        jobs: 任务字典列表
+        workers: 工作进程数，默认等于CPU核数；为1时在当前进程内顺序执行
+        on_done: 每个任务完成时的回调 on_done(任务序号, 结果字典)
+
+    Returns:
+        list: 与 jobs 顺序一致的结果字典列表
+    """
+    workers = workers or os.cpu_count() or 1
+    results = [None] * len(jobs)
+
+    if workers == 1 or len(jobs) <= 1:
+        for index, job in enumerate(jobs):
+            results[index] = run_job(job)
+            if on_done:
+                on_done(index, results[index])
+        return results
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = {pool.submit(run_job, job): index for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            index = futures[future]
+            results[index] = future.result()
+            if on_done:
+                on_done(index, results[index])
+    return results
+
+
+def main(argv=None):
+    """
+    命令行入口
+
+    Returns:
+        int: 全部成功返回0，有任务失败返回1，清单无法读取返回2
+    """
+    parser = argparse.ArgumentParser(description="按任务清单批量处理PDF")
+    parser.add_argument("manifest", help="JSON 或 CSV 任务清单")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="工作进程数（默认为CPU核数）",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"无法读取任务清单：{e}", file=sys.stderr)
+        return 2
+
+    total = len(jobs)
+
+    def report(index, outcome):
+        status = "成功" if outcome["ok"] else "失败"
+        detail = outcome.get("error") if not outcome["ok"] else ""
+        print(
+            f"[{index + 1}/{total}] {outcome['op']} {status} "
+            f"{outcome['seconds']:.2f}s {detail}".rstrip()
+        )
+
+    start = time.perf_counter()
+    results = run_jobs(jobs, args.workers, on_done=report)
+    failed = sum(1 for r in results if not r["ok"])
+    print(f"共 {total} 个任务，失败 {failed} 个，总耗时 {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
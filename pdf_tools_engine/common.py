@@ -0,0 +1,179 @@
+"""
+引擎内部通用的读写辅助函数
+"""
+
+import os
+from io import BytesIO
+
+import pypdf
+
+from .errors import InputFileError
+from .mapped import map_file
+
+
+def check_input_file(file_path, label="输入文件"):
+    """
+    检查输入文件是否存在
+
+    Args:
+        file_path: 文件路径
+        label: 出错提示中使用的文件描述
+
+    Raises:
+        InputFileError: 未指定文件或文件不存在
+    """
+    if not file_path:
+        raise InputFileError(f"请先选择{label}！")
+    if not os.path.exists(file_path):
+        raise InputFileError(f"{label}不存在：{file_path}")
+
+
+def list_pdf_files(inputs):
+    """
+    展开输入为PDF文件列表
+
+    Args:
+        inputs: 文件夹路径（只取其中的 .pdf 文件，不含子文件夹），或文件路径列表
+
+    Returns:
+        list: PDF文件路径列表
+
+    Raises:
+        InputFileError: 文件夹不存在或没有PDF文件
+    """
+    if isinstance(inputs, str):
+        if not os.path.isdir(inputs):
+            raise InputFileError(f"文件夹不存在：{inputs}")
+        inputs = [
+            os.path.join(inputs, name)
+            for name in sorted(os.listdir(inputs))
+            if name.lower().endswith(".pdf")
+        ]
+    if not inputs:
+        raise InputFileError("没有找到需要处理的PDF文件！")
+    return list(inputs)
+
+
+def batch_output_paths(input_files, output_dir, suffix):
+    """
+    批量处理时每个输入文件对应的输出文件，并创建输出文件夹
+
+    Args:
+        input_files: 输入文件路径列表
+        output_dir: 输出文件夹，输出文件名为 原文件名+suffix.pdf
+        suffix: 输出文件名后缀
+
+    Returns:
+        dict: {输入文件: 输出文件}
+
+    Raises:
+        InputFileError: 输出文件会覆盖输入文件，或多个输入文件的输出文件同名
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = {}
+    for input_file in input_files:
+        name = os.path.splitext(os.path.basename(input_file))[0]
+        output_path = os.path.join(output_dir, f"{name}{suffix}.pdf")
+        if os.path.abspath(output_path) == os.path.abspath(input_file):
+            raise InputFileError(f"输出文件会覆盖输入文件：{input_file}")
+        if output_path in jobs.values():
+            raise InputFileError(f"多个输入文件的输出文件同名：{output_path}")
+        jobs[input_file] = output_path
+    return jobs
+
+
+def open_reader(file_path, label="输入文件", preload=False):
+    """
+    打开PDF文件并返回 pypdf.PdfReader
+
+    文件通过内存映射读取（见 mapped 模块），不把整个文件读入内存，比内存还大的文件
+    也能打开。读取器被回收时映射自动关闭，也可以调用 reader.stream.close() 立即关闭。
+
+    Args:
+        file_path: 文件路径
+        label: 出错提示中使用的文件描述
+        preload: 为 True 时整个文件读入内存，用于在后台线程中预读（如网络共享盘上的
+            文件），之后解析时不再等待读取
+
+    Returns:
+        pypdf.PdfReader: 读取器
+
+    Raises:
+        InputFileError: 文件不存在或无法解析
+    """
+    check_input_file(file_path, label)
+    try:
+        if preload:
+            with open(file_path, "rb") as f:
+                stream = BytesIO(f.read())
+        else:
+            stream = map_file(file_path)
+    except (OSError, ValueError) as e:
+        raise InputFileError(f"读取文件 {file_path} 时出错：{e}") from e
+    try:
+        return pypdf.PdfReader(stream)
+    except Exception as e:
+        stream.close()
+        raise InputFileError(f"读取文件 {file_path} 时出错：{e}") from e
+
+
+def check_decrypted(reader, file_path, label="输入文件"):
+    """
+    检查加密的文件能否不用密码读取
+
+    只设置了权限密码（所有者密码）的文件不需要密码就能打开，pypdf 打开时已经用空密码
+    解密，可以正常读取；需要打开密码的文件抛出 InputFileError。
+
+    Raises:
+        InputFileError: 文件需要密码才能打开
+    """
+    if reader.is_encrypted and not reader.decrypt(""):
+        raise InputFileError(f"{label}已加密：{file_path}")
+
+
+def write_pdf(writer, output_path):
+    """
+    将 PdfWriter 的内容写入文件
+
+    先写入同目录下的临时文件，完成后再改名，失败或取消时不会留下不完整的输出文件。
+
+    Args:
+        writer: pypdf.PdfWriter
+        output_path: 输出文件路径
+
+    Returns:
+        str: 输出文件路径
+    """
+    temp_path = output_path + ".part"
+    try:
+        with open(temp_path, "wb") as output_file:
+            writer.write(output_file)
+        replace_file(temp_path, output_path)
+    except BaseException:
+        remove_files([temp_path])
+        raise
+    return output_path
+
+
+def replace_file(temp_path, output_path):
+    """
+    用写好的临时文件替换输出文件
+
+    输出文件可能正是某个输入文件，替换前先把它移出文档缓存并关闭对它的内存映射
+    （Windows 下被映射的文件不能被替换）。
+    """
+    # doccache 依赖本模块，在这里导入避免循环导入
+    from .doccache import release_file
+
+    release_file(output_path)
+    os.replace(temp_path, output_path)
+
+
+def remove_files(paths):
+    """删除文件，忽略不存在或无法删除的文件"""
+    for path in paths:
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,237 @@
+"""
+打开的文档缓存
+
+同一个文件在一次运行中会被多次打开：选择文件时、每次执行操作时、切换页面后再操作时。
+DocumentCache 按 LRU 保留已解析的 pypdf.PdfReader 和 fitz 文档，以 (路径, 文件大小,
+修改时间) 为键，文件变化后自动失效；内存按文件大小估算（映射的文件实际只占用读到的
+部分），超出预算时关闭最久未用的文档。
+
+引擎函数通过 borrow_reader / borrow_fitz 借用文档：
+
+    with borrow_reader(input_file) as reader:
+        ...
+
+借出的文档在归还前不会被关闭，也不会同时借给其他线程（此时另开一个不缓存的文档），
+所以借用方可以放心地在后台线程中使用。借用方不能修改文档（如在页面上合并水印），
+需要修改页面的操作应该用 common.open_reader 打开自己的读取器。
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import fitz
+
+from .common import check_input_file, open_reader
+from .errors import InputFileError
+from .mapped import release_file as release_mapped
+from .mapped import view_file
+
+# 默认内存预算（字节），按缓存文档的文件大小合计
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+
+# 当前进程使用的文档缓存，由 set_document_cache 设置
+_document_cache = None
+
+
+class _Entry:
+    """缓存中的一个文档"""
+
+    def __init__(self, document, size, mtime_ns, close):
+        self.document = document
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.close = close
+        self.in_use = False
+        self.evicted = False  # 借出期间被淘汰，归还时关闭
+
+
+class DocumentCache:
+    """
+    打开的文档的 LRU 缓存
+
+    文档通过内存映射打开（见 mapped 模块），不占用文件句柄；替换或删除文件前调用
+    release_file 移出缓存并关闭映射。
+    """
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        """
+        Args:
+            memory_budget: 内存预算（字节），按文件大小估算；单个文件超过预算时不缓存
+        """
+        self.memory_budget = memory_budget
+        self.memory_used = 0
+        self._entries = OrderedDict()  # (类型, 路径) -> _Entry
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def borrow(self, file_path, kind, opener, closer=None):
+        """
+        借用文档，归还前独占
+
+        Args:
+            file_path: 文件路径
+            kind: 文档类型，如 pypdf、fitz
+            opener: 打开函数 opener(文件路径)，缓存中没有时调用
+            closer: 关闭函数 closer(文档)，淘汰时调用
+
+        Yields:
+            打开的文档
+        """
+        check_input_file(file_path)
+        stat = os.stat(file_path)
+        key = (kind, os.path.normcase(os.path.abspath(file_path)))
+        close = closer or (lambda document: None)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                entry.size != stat.st_size or entry.mtime_ns != stat.st_mtime_ns
+            ):
+                # 文件已经变化
+                self._evict(key)
+                entry = None
+            if entry is not None and not entry.in_use:
+                entry.in_use = True
+                self._entries.move_to_end(key)
+            else:
+                entry = None
+
+        if entry is None:
+            document = opener(file_path)
+            cacheable = stat.st_size <= self.memory_budget
+            if cacheable:
+                entry = _Entry(document, stat.st_size, stat.st_mtime_ns, close)
+                entry.in_use = True
+                with self._lock:
+                    if key in self._entries:
+                        # 同一个文件正借给其他线程，这一份用完即关闭
+                        cacheable = False
+                    else:
+                        self._entries[key] = entry
+                        self.memory_used += entry.size
+                        self._shrink()
+            if not cacheable:
+                try:
+                    yield document
+                finally:
+                    close(document)
+                return
+
+        try:
+            yield entry.document
+        finally:
+            with self._lock:
+                entry.in_use = False
+                if entry.evicted:
+                    entry.close(entry.document)
+
+    def invalidate(self, file_path=None):
+        """从缓存中移除文件的所有文档，file_path 为 None 时清空缓存"""
+        path = os.path.normcase(os.path.abspath(file_path)) if file_path else None
+        with self._lock:
+            for key in list(self._entries):
+                if path is None or key[1] == path:
+                    self._evict(key)
+
+    def close(self):
+        """关闭所有缓存的文档"""
+        self.invalidate()
+
+    def _shrink(self):
+        """淘汰最久未用的文档，直到不超过内存预算"""
+        for key in list(self._entries):
+            if self.memory_used <= self.memory_budget:
+                break
+            self._evict(key)
+
+    def _evict(self, key):
+        entry = self._entries.pop(key)
+        self.memory_used -= entry.size
+        if entry.in_use:
+            entry.evicted = True
+        else:
+            entry.close(entry.document)
+
+
+def release_file(file_path):
+    """
+    释放对文件的所有引用：移出文档缓存，关闭内存映射
+
+    在替换或删除文件之前调用。
+    """
+    if _document_cache is not None:
+        _document_cache.invalidate(file_path)
+    release_mapped(file_path)
+
+
+def set_document_cache(cache):
+    """
+    设置当前进程使用的文档缓存
+
+    Args:
+        cache: DocumentCache，为 None 时不缓存，每次借用都重新打开文件
+    """
+    global _document_cache
+    _document_cache = cache
+
+
+@contextmanager
+def borrow_reader(file_path, label="输入文件"):
+    """
+    借用文件的 pypdf.PdfReader，有缓存时复用已解析的读取器
+
+    借用期间不能修改读取器中的对象。
+
+    Raises:
+        InputFileError: 文件不存在或无法解析
+    """
+    if _document_cache is None:
+        yield open_reader(file_path, label)
+        return
+    with _document_cache.borrow(
+        file_path, "pypdf", lambda path: open_reader(path, label)
+    ) as reader:
+        yield reader
+
+
+@contextmanager
+def borrow_fitz(file_path, label="输入文件"):
+    """
+    借用文件的 fitz 文档，有缓存时复用已打开的文档
+
+    Raises:
+        InputFileError: 文件不存在或无法打开
+    """
+    if _document_cache is None:
+        check_input_file(file_path, label)
+        document = _open_fitz(file_path)
+        try:
+            yield document
+        finally:
+            _close_fitz(document)
+        return
+    with _document_cache.borrow(file_path, "fitz", _open_fitz, _close_fitz) as document:
+        yield document
+
+
+def _open_fitz(file_path):
+    """通过内存映射打开，fitz 直接使用映射的内存"""
+    try:
+        view = view_file(file_path)
+    except (OSError, ValueError) as e:
+        raise InputFileError(f"读取文件 {file_path} 时出错：{e}") from e
+    try:
+        return fitz.open(stream=view, filetype="pdf")
+    except Exception as e:
+        view.release()
+        raise InputFileError(f"读取文件 {file_path} 时出错：{e}") from e
+
+
+def _close_fitz(document):
+    """关闭文档并释放它使用的 memoryview，之后映射才能关闭"""
+    view = document.stream
+    document.close()
+    if isinstance(view, memoryview):
+        view.release()
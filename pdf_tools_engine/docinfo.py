@@ -0,0 +1,247 @@
+"""
+文档信息
+
+选择文件时显示的页数和是否加密，以及各页大小、各页引用的图片和最后一个交叉引用表的
+位置。读取结果可以保存在 SQLite 缓存中，以 (路径, 文件大小, 修改时间) 为键：文件没有
+变化时直接从缓存返回，不再解析文件，下次启动程序后依然有效。只需要页数时先用
+quickinfo 快速读取，不完整解析文件，缓存中只记录页数和是否加密。
+
+各函数可以在后台线程中对很多文件同时调用。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+from .common import check_input_file
+from .doccache import borrow_fitz
+from .errors import InputFileError
+from .quickinfo import QuickReadError, quick_page_count
+from .rawpdf import find_last_xref
+
+# 缓存格式版本，文档信息的内容变化时递增以清空旧缓存
+INFO_VERSION = 3
+
+# 缓存文件的默认名称（界面程序放在 config.ini 旁边）
+DEFAULT_CACHE_NAME = "document_info.sqlite3"
+
+# 当前进程使用的文档信息缓存，由 set_document_info_cache 设置
+_info_cache = None
+
+
+def read_document_info(file_path):
+    """
+    解析文件，读取文档信息（不使用缓存）
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        dict: page_count 为页数；encrypted 为是否需要密码才能打开；page_sizes 为
+            各页裁剪框的 [宽, 高]（不计旋转）；image_xrefs 为各页引用的图片对象编号
+            列表；xref_offset 为最后一个交叉引用表的偏移量，找不到时为 None。
+            需要密码的文件 page_sizes 和 image_xrefs 为空列表
+
+    Raises:
+        InputFileError: 文件不存在或无法读取
+    """
+    with borrow_fitz(file_path) as document:
+        try:
+            encrypted = bool(document.needs_pass)
+            pages = [] if encrypted else range(document.page_count)
+            info = {
+                "page_count": document.page_count,
+                "encrypted": encrypted,
+                "page_sizes": [
+                    [box.width, box.height]
+                    for box in map(document.page_cropbox, pages)
+                ],
+                "image_xrefs": [
+                    [image[0] for image in document.get_page_images(page_index)]
+                    for page_index in pages
+                ],
+            }
+        except Exception as e:
+            raise InputFileError(f"读取文件 {file_path} 时出错：{e}") from e
+    try:
+        with open(file_path, "rb") as f:
+            info["xref_offset"] = find_last_xref(f)[0]
+    except (OSError, ValueError, IndexError, InputFileError):
+        info["xref_offset"] = None
+    return info
+
+
+class DocumentInfoCache:
+    """
+    磁盘上的文档信息缓存（SQLite）
+
+    以文件的绝对路径为主键，同时记录文件大小和修改时间，两者都与当前文件一致时缓存
+    才有效。可以在多个线程中同时使用；缓存文件无法打开或写入时只是不缓存，不影响
+    读取文档信息。
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = None
+        try:
+            connection = sqlite3.connect(db_path, check_same_thread=False)
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != INFO_VERSION:
+                connection.execute("DROP TABLE IF EXISTS documents")
+                connection.execute(f"PRAGMA user_version = {INFO_VERSION}")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "path TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+                "mtime_ns INTEGER NOT NULL, info TEXT NOT NULL)"
+            )
+            connection.commit()
+            self._connection = connection
+        except sqlite3.Error as e:
+            print(f"打开文档信息缓存失败 {db_path}: {e}")
+
+    def get(self, file_path, size, mtime_ns):
+        """
+        查找缓存
+
+        Returns:
+            dict: 文档信息，没有缓存或文件已变化时为 None
+        """
+        if self._connection is None:
+            return None
+        with self._lock:
+            try:
+                row = self._connection.execute(
+                    "SELECT size, mtime_ns, info FROM documents WHERE path = ?",
+                    (_cache_key(file_path),),
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+        if row is None or row[0] != size or row[1] != mtime_ns:
+            return None
+        return json.loads(row[2])
+
+    def put(self, file_path, size, mtime_ns, info):
+        """保存文档信息，写入失败时忽略"""
+        if self._connection is None:
+            return
+        with self._lock:
+            try:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)",
+                    (_cache_key(file_path), size, mtime_ns, json.dumps(info)),
+                )
+                self._connection.commit()
+            except sqlite3.Error as e:
+                print(f"保存文档信息缓存失败 {self.db_path}: {e}")
+
+    def close(self):
+        if self._connection is not None:
+            with self._lock:
+                self._connection.close()
+                self._connection = None
+
+
+def set_document_info_cache(cache):
+    """
+    设置当前进程使用的文档信息缓存
+
+    Args:
+        cache: DocumentInfoCache，为 None 时不使用缓存
+    """
+    global _info_cache
+    _info_cache = cache
+
+
+def document_info(file_path, cache=None):
+    """
+    读取文档信息，文件没有变化时直接使用缓存
+
+    Args:
+        file_path: 文件路径
+        cache: DocumentInfoCache，默认使用 set_document_info_cache 设置的缓存
+
+    Returns:
+        dict: 同 read_document_info
+
+    Raises:
+        InputFileError: 文件不存在或无法读取
+    """
+    check_input_file(file_path)
+    if cache is None:
+        cache = _info_cache
+    if cache is None:
+        return read_document_info(file_path)
+
+    stat = os.stat(file_path)
+    info = cache.get(file_path, stat.st_size, stat.st_mtime_ns)
+    # 快速读取页数时缓存的信息不完整，需要完整解析
+    if info is None or "page_sizes" not in info:
+        info = read_document_info(file_path)
+        cache.put(file_path, stat.st_size, stat.st_mtime_ns, info)
+    return info
+
+
+def cached_document_info(file_path, cache=None):
+    """
+    只从缓存中查找文档信息，不解析文件
+
+    Returns:
+        dict: 同 read_document_info，没有缓存、文件已变化或不存在时为 None；
+            只快速读取过页数时只有 page_count 和 encrypted
+    """
+    if cache is None:
+        cache = _info_cache
+    if cache is None:
+        return None
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return cache.get(file_path, stat.st_size, stat.st_mtime_ns)
+
+
+def page_count(file_path, fallback=True):
+    """
+    读取PDF文件的页数
+
+    依次尝试：缓存的文档信息；只读取 trailer 和页面树根节点的快速读取；完整解析文件。
+    后两种方式读到的结果都写入缓存。
+
+    Args:
+        file_path: 文件路径
+        fallback: 快速读取失败（文件损坏、已加密）时是否完整解析文件；为 False 时
+            直接抛出 InputFileError
+
+    Returns:
+        int: 页数
+
+    Raises:
+        InputFileError: 文件不存在、无法读取或需要密码
+    """
+    info = cached_document_info(file_path)
+    if info is None:
+        check_input_file(file_path)
+        stat = os.stat(file_path)
+        try:
+            count = quick_page_count(file_path)
+        except (OSError, QuickReadError) as e:
+            if not fallback:
+                raise InputFileError(f"读取文件 {file_path} 时出错：{e}") from e
+            info = document_info(file_path)
+        else:
+            # 快速读取只在文件未加密时成功，结果与完整解析相同
+            if _info_cache is not None:
+                _info_cache.put(
+                    file_path, stat.st_size, stat.st_mtime_ns,
+                    {"page_count": count, "encrypted": False},
+                )
+            return count
+    if info["encrypted"]:
+        raise InputFileError(f"文件已加密：{file_path}")
+    return info["page_count"]
+
+
+def _cache_key(file_path):
+    return os.path.normcase(os.path.abspath(file_path))
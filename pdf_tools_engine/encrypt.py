@@ -0,0 +1,41 @@
+"""
+PDF加密
+"""
+
+import pypdf
+
+from .common import write_pdf
+from .doccache import borrow_reader
+from .errors import PDFToolError
+
+
+def encrypt_pdf(input_file, output_path, password, progress=None):
+    """
+    使用密码加密PDF文件
+
+    Args:
+        input_file: 输入文件路径
+        output_path: 输出文件路径
+        password: 打开密码
+        progress: 进度回调 progress(已处理页数, 总页数)
+
+    Returns:
+        str: 输出文件路径
+    """
+    if not password:
+        raise PDFToolError("请输入密码！")
+
+    with borrow_reader(input_file) as reader:
+        writer = pypdf.PdfWriter()
+
+        # 复制所有页面
+        total_pages = len(reader.pages)
+        for i, page in enumerate(reader.pages):
+            writer.add_page(page)
+            if progress:
+                progress(i + 1, total_pages)
+
+        # 设置密码
+        writer.encrypt(password)
+
+        return write_pdf(writer, output_path)
@@ -0,0 +1,25 @@
+"""
+PDF处理引擎的异常类型
+
+引擎函数不弹出任何对话框，出错时抛出下列异常，由调用方（界面或命令行）决定如何提示。
+"""
+
+
+class PDFToolError(Exception):
+    """引擎异常基类"""
+
+
+class InputFileError(PDFToolError):
+    """输入文件不存在或无法读取"""
+
+
+class PageRangeError(PDFToolError, ValueError):
+    """页码范围或页码位置无效"""
+
+
+class WatermarkError(PDFToolError):
+    """水印参数无效或水印绘制失败"""
+
+
+class OperationCancelled(PDFToolError):
+    """操作被用户取消"""
@@ -0,0 +1,67 @@
+"""
+PDF图片提取
+"""
+
+import os
+
+from .common import check_input_file, remove_files
+from .doccache import borrow_fitz
+from .pages import PageSet
+
+
+def extract_images(input_file, output_dir, range_str="", progress=None):
+    """
+    提取PDF中的图片
+
+    Args:
+        input_file: 输入文件路径
+        output_dir: 保存目录，图片存放在其下的 "<文件名>_images" 子目录
+        range_str: 页面范围，如 "1-3,5"；为空则处理所有页面，超出文档的页码忽略
+        progress: 进度回调 progress(已处理页数, 总页数)
+
+    Returns:
+        dict: 包含 images_dir、page_count、image_count 的结果字典
+    """
+    check_input_file(input_file)
+
+    # 创建图片保存目录
+    pdf_filename = os.path.splitext(os.path.basename(input_file))[0]
+    images_dir = os.path.join(output_dir, f"{pdf_filename}_images")
+
+    written = []
+    with borrow_fitz(input_file) as pdf_document:
+        try:
+            page_numbers = PageSet.parse(range_str, len(pdf_document), clamp=True)
+            os.makedirs(images_dir, exist_ok=True)
+
+            for i, page_num in enumerate(page_numbers):
+                page = pdf_document[page_num - 1]
+
+                for img_index, img in enumerate(page.get_images(full=True)):
+                    xref = img[0]  # 获取图片的xref引用
+                    base_image = pdf_document.extract_image(xref)
+                    if not base_image:
+                        continue
+
+                    ext = base_image["ext"]
+                    image_filename = (
+                        f"page_{page_num:03d}_img_{img_index+1:03d}.{ext}"
+                    )
+                    image_path = os.path.join(images_dir, image_filename)
+                    written.append(image_path)
+                    with open(image_path, "wb") as img_file:
+                        img_file.write(base_image["image"])
+
+                if progress:
+                    progress(i + 1, len(page_numbers))
+        except BaseException:
+            # 出错或取消时删除已提取的图片
+            remove_files(written)
+            raise
+
+    return {
+        "images_dir": images_dir,
+        "page_count": len(page_numbers),
+        "image_count": len(written),
+    }
+
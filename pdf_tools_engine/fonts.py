@@ -0,0 +1,328 @@
+"""
+字体索引
+
+扫描系统字体目录（与 fontconfig 默认目录一致），用 reportlab 解析每个 TrueType 字体的
+名称、字形数和字符覆盖范围，结果缓存在磁盘上的 JSON 文件中。之后只需检查字体文件的大小
+和修改时间，新增或变化的文件才重新解析。水印字体按水印文字的字符覆盖情况选择。
+
+多进程处理时由主进程调用 get_font_index 刷新索引，工作进程用 load_font_index 只读取
+索引文件，不会同时扫描字体目录、写同一个索引文件。
+"""
+
+import bisect
+import json
+import os
+import sys
+
+CHINESE_FONT_NAME = "ChineseFont"
+FALLBACK_FONT_NAME = "Helvetica"
+
+FONT_EXTENSIONS = (".ttf", ".ttc", ".otf")
+
+# 覆盖程度相同时优先使用的字体（按顺序）
+PREFERRED_FONTS = [
+    "simhei.ttf",
+    "simsun.ttc",
+    "msyh.ttc",
+    "simkai.ttf",
+    "simfang.ttf",
+    "pingfang.ttc",
+    "hiragino sans gb.ttc",
+    "wqy-microhei.ttc",
+    "droidsansfallbackfull.ttf",
+    "notosanscjk-regular.ttc",
+]
+
+# 没有水印文字时用来挑选中文字体的字符
+DEFAULT_SAMPLE_TEXT = "中文水印"
+
+# 索引文件格式版本，格式变化时递增以重建索引
+INDEX_VERSION = 2
+
+# 当前进程的字体索引，已注册的字体 {(路径, 子字体序号): 字体名称}，
+# 已选择的字体 {字符集合: 字体名称}
+_font_index = None
+_registered_fonts = {}
+_font_choices = {}
+
+
+def font_directories():
+    """
+    返回当前系统的字体目录（只包含存在的目录）
+
+    Returns:
+        list: 字体目录列表
+    """
+    home = os.path.expanduser("~")
+    if os.name == "nt":
+        windir = os.environ.get("WINDIR", "C:/Windows")
+        dirs = [
+            os.path.join(windir, "Fonts"),
+            os.path.join(
+                os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "Fonts"
+            ),
+        ]
+    elif sys.platform == "darwin":
+        dirs = [
+            "/System/Library/Fonts",
+            "/Library/Fonts",
+            os.path.join(home, "Library", "Fonts"),
+        ]
+    else:
+        data_home = os.environ.get(
+            "XDG_DATA_HOME", os.path.join(home, ".local", "share")
+        )
+        dirs = [
+            "/usr/share/fonts",
+            "/usr/local/share/fonts",
+            os.path.join(data_home, "fonts"),
+            os.path.join(home, ".fonts"),
+        ]
+    result = []
+    for path in dirs:
+        path = os.path.normpath(path)
+        if os.path.isdir(path) and path not in result:
+            result.append(path)
+    return result
+
+
+def font_index_path():
+    """
+    返回字体索引缓存文件路径
+
+    Windows 下在 %LOCALAPPDATA%/PDFTools，其他系统在 $XDG_CACHE_HOME/pdftools
+    （默认 ~/.cache/pdftools）。
+    """
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        cache_dir = os.path.join(base, "PDFTools")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+        cache_dir = os.path.join(base, "pdftools")
+    return os.path.join(cache_dir, "font_index.json")
+
+
+def parse_font_file(font_path):
+    """
+    解析字体文件中的所有字体（.ttc 可能包含多个）
+
+    Args:
+        font_path: 字体文件路径
+
+    Returns:
+        list: 每个字体的信息字典，包含 index、name、family、glyph_count 和字符覆盖
+            范围 ranges
+    """
+    from reportlab.pdfbase.ttfonts import TTFontFile
+
+    faces = []
+    subfont_count = 1
+    index = 0
+    while index < subfont_count:
+        font = TTFontFile(font_path, subfontIndex=index)
+        subfont_count = getattr(font, "numSubfonts", 1)
+        faces.append(
+            {
+                "index": index,
+                "name": _to_str(font.name),
+                "family": _to_str(font.familyName),
+                "glyph_count": len(font.charToGlyph),
+                "ranges": _to_ranges(font.charToGlyph),
+            }
+        )
+        index += 1
+    return faces
+
+
+class FontIndex:
+    """
+    磁盘缓存的字体索引
+
+    索引按字体文件保存：{路径: {"size", "mtime", "faces", "error"}}，无法解析的字体
+    （如 PostScript 轮廓的 .otf）也会记录下来，避免每次启动都重新尝试。
+    """
+
+    def __init__(self, index_path=None):
+        self.index_path = index_path or font_index_path()
+        self.files = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+            self.files = data.get("files", {})
+
+    def save(self):
+        """写入索引文件，写入失败时忽略（下次启动重新扫描）"""
+        temp_path = f"{self.index_path}.{os.getpid()}.part"
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "files": self.files}, f)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            print(f"保存字体索引失败 {self.index_path}: {e}")
+
+    def refresh(self, directories=None):
+        """
+        扫描字体目录，只解析新增或修改过的字体文件，有变化时保存索引
+
+        Args:
+            directories: 字体目录列表，None 表示系统字体目录
+
+        Returns:
+            int: 重新解析的字体文件数
+        """
+        found = {}
+        for directory in directories or font_directories():
+            for root, _, names in os.walk(directory):
+                for name in names:
+                    if name.lower().endswith(FONT_EXTENSIONS):
+                        path = os.path.join(root, name)
+                        try:
+                            stat = os.stat(path)
+                        except OSError:
+                            continue
+                        found[path] = (stat.st_size, stat.st_mtime)
+
+        parsed = 0
+        removed = set(self.files) - set(found)
+        for path in removed:
+            del self.files[path]
+        for path, (size, mtime) in found.items():
+            entry = self.files.get(path)
+            if entry and entry["size"] == size and entry["mtime"] == mtime:
+                continue
+            entry = {"size": size, "mtime": mtime, "faces": []}
+            try:
+                entry["faces"] = parse_font_file(path)
+            except Exception as e:
+                entry["error"] = str(e)
+            self.files[path] = entry
+            parsed += 1
+
+        if parsed or removed:
+            self.save()
+        return parsed
+
+    def best_face(self, text):
+        """
+        选择覆盖 text 中字符最多的字体
+
+        覆盖字符数相同时，优先 PREFERRED_FONTS 中靠前的字体，其次字符数多的字体。
+
+        Returns:
+            tuple: (字体路径, 子字体序号, 字体信息, 覆盖的字符数)，没有可用字体时为 None
+        """
+        chars = {ord(c) for c in text if not c.isspace()}
+        best = None
+        best_key = None
+        for path, entry in self.files.items():
+            base_name = os.path.basename(path).lower()
+            rank = (
+                PREFERRED_FONTS.index(base_name)
+                if base_name in PREFERRED_FONTS
+                else len(PREFERRED_FONTS)
+            )
+            for face in entry["faces"]:
+                covered = sum(1 for code in chars if _covers(face["ranges"], code))
+                key = (-covered, rank, -face["glyph_count"], path, face["index"])
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best = (path, face["index"], face, covered)
+        return best
+
+
+def get_font_index():
+    """返回当前进程的字体索引，第一次调用时加载并刷新"""
+    global _font_index
+    if _font_index is None:
+        _font_index = FontIndex()
+        _font_index.refresh()
+    return _font_index
+
+
+def load_font_index():
+    """
+    返回当前进程的字体索引，第一次调用时只读取索引文件，不扫描字体目录
+
+    用于工作进程的初始化函数，主进程在启动进程池之前已经调用 get_font_index 刷新索引。
+    """
+    global _font_index
+    if _font_index is None:
+        _font_index = FontIndex()
+    return _font_index
+
+
+def register_chinese_fonts(text=""):
+    """
+    按水印文字选择并注册字体，同一组字符在每个进程中只选择一次
+
+    Args:
+        text: 水印文字，为空时选择中文字体
+
+    Returns:
+        str: 可用于 canvas.setFont 的字体名称，没有可用字体时为 Helvetica
+    """
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    chars = frozenset(c for c in text if not c.isspace()) or frozenset(
+        DEFAULT_SAMPLE_TEXT
+    )
+    if chars in _font_choices:
+        return _font_choices[chars]
+
+    font_name = FALLBACK_FONT_NAME
+    best = get_font_index().best_face("".join(chars))
+    if best is not None and best[3] > 0:
+        path, index, face, covered = best
+        font_name = _registered_fonts.get((path, index))
+        if font_name is None:
+            font_name = CHINESE_FONT_NAME
+            if _registered_fonts:
+                font_name += str(len(_registered_fonts))
+            try:
+                pdfmetrics.registerFont(TTFont(font_name, path, subfontIndex=index))
+                _registered_fonts[(path, index)] = font_name
+                print(f"已注册字体: {path} ({face['name']})")
+            except Exception as e:
+                print(f"注册字体失败 {path}: {e}")
+                font_name = FALLBACK_FONT_NAME
+        if covered < len(chars):
+            print(f"字体 {face['name']} 缺少 {len(chars) - covered} 个水印字符")
+    else:
+        print("未找到中文字体，将使用英文字体")
+
+    _font_choices[chars] = font_name
+    return font_name
+
+
+def _to_str(value):
+    """字体名称可能是 bytes"""
+    if isinstance(value, bytes):
+        return value.decode("latin-1")
+    return str(value)
+
+
+def _to_ranges(codes):
+    """把字符编码集合压缩为 [[起始, 结束], ...]（含结束）"""
+    ranges = []
+    for code in sorted(codes):
+        if ranges and code == ranges[-1][1] + 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return ranges
+
+
+def _covers(ranges, code):
+    """字符编码是否在覆盖范围内"""
+    index = bisect.bisect_right(ranges, [code, sys.maxunicode + 1]) - 1
+    return index >= 0 and ranges[index][0] <= code <= ranges[index][1]
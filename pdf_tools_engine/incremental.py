@@ -0,0 +1,221 @@
+"""
+PDF增量更新
+
+不重写原文件，只在原文件内容之后追加新增和修改过的对象、新的交叉引用表和 trailer
+（/Prev 指向原来的交叉引用表）。处理大文件时读写量只与修改的对象数量有关，
+原文件中的数字签名等内容保持不变。
+"""
+
+import os
+import shutil
+
+import pypdf
+from pypdf.generic import DictionaryObject, IndirectObject, NameObject, NumberObject
+
+from .common import check_input_file, remove_files, replace_file
+from .errors import InputFileError
+from .mapped import map_file
+from .rawpdf import (
+    copy_object,
+    find_last_xref,
+    serialize_object,
+    write_trailer,
+    xref_stream,
+)
+
+# 页面树的最大深度，防止 /Kids 循环
+_MAX_TREE_DEPTH = 64
+
+
+class IncrementalUpdate:
+    """
+    对一个PDF文件的增量更新
+
+    用法：
+        with IncrementalUpdate("a.pdf") as update:
+            ref = update.add_object(obj)
+            update.update_object(page.indirect_reference, new_page)
+            update.save("a_new.pdf")
+
+    reader 直接读取文件的内存映射，不把整个文件读入内存。也提供与 rawpdf.StreamWriter
+    相同的 allocate()/write() 接口，可以用 rawpdf.ObjectCopier 把其他文档的页面复制
+    进来。
+    """
+
+    def __init__(self, file_path, label="输入文件"):
+        check_input_file(file_path, label)
+        self.file_path = file_path
+        try:
+            self._file = map_file(file_path)
+        except (OSError, ValueError) as e:
+            raise InputFileError(f"读取文件 {file_path} 时出错：{e}") from e
+        try:
+            self.reader = pypdf.PdfReader(self._file)
+            if self.reader.is_encrypted:
+                raise InputFileError(f"加密的文件不支持增量更新：{file_path}")
+            self.prev_xref, self.xref_is_stream = find_last_xref(self._file)
+        except InputFileError:
+            self._file.close()
+            raise
+        except Exception as e:
+            self._file.close()
+            raise InputFileError(f"读取文件 {file_path} 时出错：{e}") from e
+
+        self.next_number = int(self.reader.trailer["/Size"])
+        self.objects = {}  # 对象编号 -> (代数, 对象)
+        self.shared_streams = {}  # 供 ObjectCopier 去重
+        self._imported = {}  # (来源文档, 对象编号, 代数) -> 新的间接引用
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def add_object(self, obj):
+        """
+        新增对象
+
+        Returns:
+            IndirectObject: 新对象的引用
+        """
+        ref = IndirectObject(self.next_number, 0, self.reader)
+        self.next_number += 1
+        self.objects[ref.idnum] = (0, obj)
+        return ref
+
+    def allocate(self):
+        """分配一个新对象编号，之后用 write() 设置对象内容"""
+        return self.add_object(None)
+
+    def update_object(self, ref, obj):
+        """用 obj 替换原文件中 ref 指向的对象"""
+        self.objects[ref.idnum] = (ref.generation, obj)
+
+    # 与 StreamWriter.write 同名的接口
+    write = update_object
+
+    def find_page(self, page_index):
+        """
+        沿页面树的 /Kids 找到一页，只读取从根节点到该页经过的节点
+
+        不使用 reader.pages（会加载整个页面树），查找少数几页时读取量与文件大小无关。
+
+        Args:
+            page_index: 页码（0基索引）
+
+        Returns:
+            tuple: (页面的间接引用, 所在页面树节点的间接引用)
+
+        Raises:
+            InputFileError: 页码超出范围或页面树无法读取
+        """
+        try:
+            node_ref = self.reader.trailer["/Root"].raw_get("/Pages")
+            remaining = page_index
+            for _ in range(_MAX_TREE_DEPTH):
+                for kid_ref in node_ref.get_object().raw_get("/Kids").get_object():
+                    kid = kid_ref.get_object()
+                    if "/Kids" not in kid:
+                        if remaining == 0 and isinstance(kid_ref, IndirectObject):
+                            return kid_ref, node_ref
+                        remaining -= 1
+                        continue
+                    count = int(kid["/Count"])
+                    if remaining < count:
+                        node_ref = kid_ref
+                        break
+                    remaining -= count
+                else:
+                    break
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise InputFileError(f"无法读取文件 {self.file_path} 的页面树：{e}") from e
+        raise InputFileError(
+            f"文件 {self.file_path} 中找不到第 {page_index + 1} 页"
+        )
+
+    def import_object(self, obj):
+        """
+        复制其他文档中的对象，其中引用的间接对象一并复制并分配新编号
+
+        Args:
+            obj: 其他 PdfReader 中的对象（直接对象或 IndirectObject）
+
+        Returns:
+            复制后的对象，间接对象返回新的 IndirectObject
+        """
+        return copy_object(obj, self._import_ref)
+
+    def _import_ref(self, source_ref):
+        key = (id(source_ref.pdf), source_ref.idnum, source_ref.generation)
+        if key not in self._imported:
+            # 先分配编号再复制内容，对象之间循环引用时不会无限递归
+            ref = self.add_object(None)
+            self._imported[key] = ref
+            self.objects[ref.idnum] = (0, self.import_object(source_ref.get_object()))
+        return self._imported[key]
+
+    def save(self, output_path):
+        """
+        写入更新后的文件
+
+        output_path 与原文件相同时直接追加到原文件末尾（出错时截回原长度），
+        否则复制原文件后追加，完成后再改名。
+
+        Returns:
+            str: 输出文件路径
+        """
+        if os.path.exists(output_path) and os.path.samefile(
+            output_path, self.file_path
+        ):
+            with open(output_path, "r+b") as f:
+                f.seek(0, os.SEEK_END)
+                original_size = f.tell()
+                try:
+                    self._append(f)
+                except BaseException:
+                    f.truncate(original_size)
+                    raise
+            return output_path
+
+        temp_path = output_path + ".part"
+        try:
+            shutil.copyfile(self.file_path, temp_path)
+            with open(temp_path, "r+b") as f:
+                f.seek(0, os.SEEK_END)
+                self._append(f)
+            replace_file(temp_path, output_path)
+        except BaseException:
+            remove_files([temp_path])
+            raise
+        return output_path
+
+    def _append(self, f):
+        """在文件末尾追加对象、交叉引用表和 trailer"""
+        f.write(b"\n")
+        offsets = {}
+        for number in sorted(self.objects):
+            generation, obj = self.objects[number]
+            offsets[number] = (f.tell(), generation)
+            f.write(serialize_object(number, generation, obj))
+
+        trailer = DictionaryObject()
+        for name in ("/Root", "/Info", "/ID"):
+            if name in self.reader.trailer:
+                trailer[NameObject(name)] = self.reader.trailer.raw_get(name)
+        trailer[NameObject("/Prev")] = NumberObject(self.prev_xref)
+
+        if self.xref_is_stream:
+            # 原文件使用交叉引用流时，追加的部分也使用交叉引用流
+            xref_offset = f.tell()
+            number = self.next_number
+            offsets[number] = (xref_offset, 0)
+            trailer[NameObject("/Size")] = NumberObject(number + 1)
+            f.write(serialize_object(number, 0, xref_stream(trailer, offsets)))
+            f.write(f"startxref\n{xref_offset}\n%%EOF\n".encode("ascii"))
+        else:
+            trailer[NameObject("/Size")] = NumberObject(self.next_number)
+            write_trailer(f, trailer, offsets)
@@ -0,0 +1,122 @@
+"""
+PDF插入
+"""
+
+from .common import check_input_file
+from .docinfo import page_count
+from .errors import PageRangeError
+from .pages import PageSet
+from .plan import PagePlan
+
+
+def insert_pdf(target_file, insert_file, output_path, method="position",
+               position=1, insert_range="", progress=None):
+    """
+    在目标PDF中插入另一个PDF的全部或部分页面
+
+    Args:
+        target_file: 目标（被插入的）文件路径
+        insert_file: 要插入的文件路径
+        output_path: 输出文件路径
+        method: 插入方式，position（指定位置）、head（首部）或 tail（尾部）
+        position: 指定位置插入时的页码（1基索引，插入到该页之前）
+        insert_range: 插入文件的页码范围，格式见 pages 模块，为空则全部插入
+        progress: 进度回调 progress(已处理页数, 总页数)
+
+    Returns:
+        str: 输出文件路径
+
+    Raises:
+        PageRangeError: 插入位置或页码范围无效
+    """
+    if method in ("head", "tail"):
+        position = method
+    return insert_multiple(
+        target_file, [(position, insert_file, insert_range)], output_path, progress
+    )
+
+
+def insert_multiple(target_file, insertions, output_path, progress=None):
+    """
+    在目标PDF的多个位置插入页面，只写出一次
+
+    Args:
+        target_file: 目标（被插入的）文件路径
+        insertions: 插入点列表 [(插入位置, 插入文件路径, 页码范围), ...]；插入位置为
+            原目标文件中的页码（1基索引，插入到该页之前），或 head（首部）、
+            tail（尾部）；同一位置的多个插入点按列表顺序排列
+        output_path: 输出文件路径
+        progress: 进度回调 progress(已处理页数, 总页数)
+
+    Returns:
+        str: 输出文件路径
+
+    Raises:
+        PageRangeError: 插入位置或页码范围无效
+    """
+    check_input_file(target_file, "目标文件")
+    for _, insert_file, _ in insertions:
+        check_input_file(insert_file, "要插入的文件")
+    source_totals = [page_count(insert_file) for _, insert_file, _ in insertions]
+    return insert_plan(
+        target_file, page_count(target_file), insertions, source_totals
+    ).execute(output_path, progress=progress)["output_path"]
+
+
+def insert_plan(target_file, target_total_pages, insertions, source_totals):
+    """
+    多点插入的页面组装计划
+
+    Args:
+        target_file: 目标文件路径
+        target_total_pages: 目标文件的页数
+        insertions: 插入点列表，同 insert_multiple
+        source_totals: 各插入点的插入文件的页数
+
+    Returns:
+        PagePlan: 页面组装计划
+
+    Raises:
+        PageRangeError: 没有插入点，或插入位置、页码范围无效
+    """
+    if not insertions:
+        raise PageRangeError("请至少添加一个插入点！")
+    points = []
+    for order, ((position, insert_file, insert_range), total) in enumerate(
+        zip(insertions, source_totals)
+    ):
+        if position in ("head", "tail"):
+            index = insert_index(target_total_pages, position)
+        else:
+            index = insert_index(target_total_pages, "position", position)
+        points.append((index, order, insert_file, PageSet.parse(insert_range, total)))
+    points.sort()
+
+    plan = PagePlan()
+    next_page = 1
+    for index, _, insert_file, insert_pages in points:
+        plan.add(target_file, (next_page, index), label="目标文件")
+        plan.add(insert_file, insert_pages, label="要插入的文件")
+        next_page = index + 1
+    plan.add(target_file, (next_page, target_total_pages), label="目标文件")
+    return plan
+
+
+def insert_index(target_total_pages, method="position", position=1):
+    """
+    计算插入位置
+
+    Returns:
+        int: 插入位置（0基索引，插入到该页之前）
+
+    Raises:
+        PageRangeError: 插入位置超出范围
+    """
+    if method == "head":
+        return 0
+    if method == "tail":
+        return target_total_pages
+    index = int(position) - 1  # 转换为0基索引
+    if index < 0 or index > target_total_pages:
+        raise PageRangeError(f"插入位置超出范围（1-{target_total_pages+1}）！")
+    return index
@@ -0,0 +1,172 @@
+"""
+后台任务执行器
+
+在线程池中运行引擎函数，进度和结果通过线程安全的队列传回。界面线程用 root.after
+定时调用 BackgroundJob.poll() 取回事件，不会阻塞 Tk 主循环。
+
+取消是协作式的：引擎函数每处理一页调用一次 progress 回调，取消后回调抛出
+OperationCancelled，引擎函数会在退出前删除已生成的部分输出。
+
+MapJob 对一组输入分别调用同一个函数（如读取每个文件的页数），每项完成后立即
+返回结果，顺序为完成顺序。
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .errors import OperationCancelled
+
+
+class BackgroundJob:
+    """
+    一个后台任务
+
+    poll() 返回自上次调用以来的事件列表，事件为以下元组之一：
+        ("progress", 已完成数, 总数)
+        ("done", 返回值)
+        ("error", 异常对象)
+        ("cancelled", None)
+    """
+
+    def __init__(self, func, args=(), kwargs=None):
+        self.func = func
+        self.args = args
+        self.kwargs = dict(kwargs or {})
+        self.finished = False
+        self._events = queue.Queue()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """请求取消，任务会在处理下一页前停止"""
+        self._cancel_event.set()
+
+    @property
+    def cancel_requested(self):
+        return self._cancel_event.is_set()
+
+    def report_progress(self, done, total):
+        """传给引擎函数的进度回调，在工作线程中调用"""
+        if self._cancel_event.is_set():
+            raise OperationCancelled("操作已取消")
+        self._events.put(("progress", done, total))
+
+    def run(self):
+        """在工作线程中执行任务"""
+        try:
+            if self._cancel_event.is_set():
+                raise OperationCancelled("操作已取消")
+            result = self.func(*self.args, progress=self.report_progress, **self.kwargs)
+            self._events.put(("done", result))
+        except OperationCancelled:
+            self._events.put(("cancelled", None))
+        except Exception as e:
+            self._events.put(("error", e))
+
+    def poll(self):
+        """取回所有待处理事件，在界面线程中调用"""
+        events = []
+        while True:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] != "progress":
+                self.finished = True
+            events.append(event)
+        return events
+
+
+class MapJob:
+    """
+    对一组输入分别调用同一个函数的后台任务
+
+    poll() 返回自上次调用以来完成的项，事件为以下元组之一：
+        ("result", 序号, 返回值)
+        ("error", 序号, 异常对象)
+    所有项完成后 finished 为 True。
+    """
+
+    def __init__(self, func, items):
+        self.func = func
+        self.items = list(items)
+        self.finished = not self.items
+        self._done_count = 0
+        self._events = queue.Queue()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """取消尚未开始的项，正在处理的项完成后结果被丢弃"""
+        self._cancel_event.set()
+
+    @property
+    def cancel_requested(self):
+        return self._cancel_event.is_set()
+
+    def run_item(self, index):
+        """在工作线程中处理一项"""
+        if self._cancel_event.is_set():
+            return
+        try:
+            self._events.put(("result", index, self.func(self.items[index])))
+        except Exception as e:
+            self._events.put(("error", index, e))
+
+    def poll(self):
+        """取回所有已完成的项，在界面线程中调用；取消后返回空列表"""
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                break
+        self._done_count += len(events)
+        if self._done_count >= len(self.items) or self._cancel_event.is_set():
+            self.finished = True
+        if self._cancel_event.is_set():
+            return []
+        return events
+
+
+class JobExecutor:
+    """基于线程池的后台任务执行器"""
+
+    def __init__(self, max_workers=1):
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="pdf-job"
+        )
+
+    def submit(self, func, *args, **kwargs):
+        """
+        提交任务
+
+        Args:
+            func: 接受 progress 关键字参数的引擎函数
+            *args, **kwargs: 传给 func 的参数
+
+        Returns:
+            BackgroundJob: 任务对象
+        """
+        job = BackgroundJob(func, args, kwargs)
+        self._pool.submit(job.run)
+        return job
+
+    def map(self, func, items):
+        """
+        对 items 中的每一项在线程池中调用 func(项)
+
+        Args:
+            func: 处理一项的函数，不接受 progress 参数
+            items: 输入列表
+
+        Returns:
+            MapJob: 任务对象
+        """
+        job = MapJob(func, items)
+        for index in range(len(job.items)):
+            self._pool.submit(job.run_item, index)
+        return job
+
+    def shutdown(self, cancel_pending=True):
+        """关闭执行器"""
+        self._pool.shutdown(wait=False, cancel_futures=cancel_pending)
@@ -0,0 +1,71 @@
+"""
+内存映射输入
+
+输入文件以只读方式映射到内存，由操作系统按需读入，进程中不保存整个文件的副本：
+pypdf 直接在映射上定位读取，fitz 通过 memoryview 使用映射的内存而不复制。比可用内存
+还大的文件也能打开，只有实际读到的部分才占用（可被系统回收的）页面缓存。
+
+Windows 下被映射的文件不能被替换或删除，写出文件前要调用 release_file 关闭该文件的
+所有映射，之后使用这些映射的读取器不能再读取。
+"""
+
+import mmap
+import os
+import threading
+import weakref
+from io import BytesIO
+
+# 规范化路径 -> 该文件的映射（弱引用，读取器释放后映射自动关闭）
+_maps = {}
+_lock = threading.Lock()
+
+
+def map_file(file_path):
+    """
+    只读映射文件
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        mmap.mmap: 支持 read/seek/tell 的映射对象；空文件返回空的 BytesIO
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return BytesIO()
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    with _lock:
+        _maps.setdefault(_key(file_path), weakref.WeakSet()).add(mapped)
+    return mapped
+
+
+def view_file(file_path):
+    """
+    映射文件并返回只读的 memoryview，用于 fitz 等接受内存缓冲区的库
+
+    用完后先关闭使用它的文档，再调用 memoryview.release()，映射才能关闭。
+    """
+    mapped = map_file(file_path)
+    if isinstance(mapped, BytesIO):
+        return memoryview(b"")
+    return memoryview(mapped)
+
+
+def release_file(file_path):
+    """
+    关闭文件的所有映射
+
+    还有 memoryview 在使用的映射无法关闭，保持不变。
+    """
+    key = _key(file_path)
+    with _lock:
+        maps = list(_maps.pop(key, ()))
+        for mapped in maps:
+            try:
+                mapped.close()
+            except BufferError:
+                _maps.setdefault(key, weakref.WeakSet()).add(mapped)
+
+
+def _key(file_path):
+    return os.path.normcase(os.path.abspath(file_path))
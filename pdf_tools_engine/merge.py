@@ -0,0 +1,233 @@
+"""
+PDF合并
+
+流式合并：按顺序加入每个文件全部页面的页面组装计划（见 plan 模块），每个输入文件
+的页面和它引用的对象复制后立即写入输出文件，处理完一个文件就关闭并释放它，内存占用
+与输入文件的数量和总大小无关。
+
+预读：写出当前文件的同时，在线程池中读取并解析后面的 prefetch 个文件，网络共享盘上
+读取文件的等待时间与写出重叠。预读的文件整个读入内存，内存占用按窗口大小增加。
+
+去重：不同输入文件中内容完全相同的流对象（同一报表程序生成的字体、徽标图片、ICC
+配置等）只写出一次，其他文件引用同一个对象。
+
+追加：append=True 且输出文件已存在时，用增量更新把新页面追加到输出文件末尾，
+读写量只与新页面有关，与已有文件的大小无关。
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from pypdf.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NumberObject,
+)
+
+from .common import check_decrypted, open_reader
+from .errors import InputFileError
+from .incremental import IncrementalUpdate
+from .plan import (
+    ON_ERROR_FAIL,
+    ON_ERROR_SKIP,
+    PagePlan,
+    pages_node,
+    set_inheritable_defaults,
+)
+
+# 默认预读的文件数
+DEFAULT_PREFETCH = 4
+
+
+def merge_pdfs(input_files, output_path, on_error=ON_ERROR_FAIL,
+               prefetch=DEFAULT_PREFETCH, dedup=True, append=False, progress=None):
+    """
+    按顺序合并多个PDF文件
+
+    Args:
+        input_files: 输入文件路径列表
+        output_path: 输出文件路径
+        on_error: 无法读取的输入文件的处理方式，fail（合并前检查，有错误时不开始合并）
+            或 skip（跳过并在结果中列出）
+        prefetch: 预读的文件数，0 表示不预读，按需从文件读取（内存占用最小）
+        dedup: 是否对各文件中相同的字体、图片等流对象去重
+        append: 输出文件已存在时，以增量更新方式把输入文件的页面追加到它的末尾，
+            不重写原有内容
+        progress: 进度回调 progress(已处理文件数, 总文件数)，每页调用一次，
+            已处理文件数按页折算为小数
+
+    Returns:
+        dict: output_path 为输出文件路径，page_count 为输出页数，
+            skipped 为跳过的文件 {文件路径: 错误信息}
+
+    Raises:
+        InputFileError: 未指定输入文件、某个文件无法读取（fail）或没有可合并的页面
+    """
+    if not input_files:
+        raise InputFileError("请先选择要合并的PDF文件！")
+    if on_error not in (ON_ERROR_FAIL, ON_ERROR_SKIP):
+        raise ValueError(f"未知的错误处理方式：{on_error}")
+
+    pool = ThreadPoolExecutor(max_workers=prefetch) if prefetch > 0 else None
+    try:
+        if on_error == ON_ERROR_FAIL:
+            check_merge_inputs(input_files, pool)
+        open_source = _Prefetcher(input_files, pool, prefetch).open
+
+        if append and os.path.exists(output_path):
+            return _append_to_existing(
+                output_path, input_files, open_source, on_error, dedup, progress
+            )
+        return merge_plan(input_files).execute(
+            output_path, open_source, on_error, dedup, progress
+        )
+    finally:
+        if pool is not None:
+            # 出错或取消时不再等待未开始的预读
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def merge_plan(input_files, transform=None):
+    """
+    合并的页面组装计划：按顺序加入每个文件的全部页面
+
+    Returns:
+        PagePlan: 页面组装计划
+    """
+    plan = PagePlan()
+    for file_path in input_files:
+        plan.add(file_path, transform=transform)
+    return plan
+
+
+def _append_to_existing(output_path, input_files, open_source, on_error, dedup,
+                        progress):
+    """
+    以增量更新方式把所有输入文件的页面追加到已有的输出文件
+
+    新页面放在一个新的页面树节点下，该节点加到原页面树根节点的末尾；只追加新页面、
+    新节点、修改后的根节点和新的交叉引用表，原文件内容不变。
+    """
+    with IncrementalUpdate(output_path, "已有的输出文件") as update:
+        root = update.reader.trailer["/Root"]
+        root_pages_ref = root.raw_get("/Pages")
+        if not isinstance(root_pages_ref, IndirectObject):
+            raise InputFileError(f"无法追加到文件：{output_path}")
+        root_pages = root_pages_ref.get_object()
+
+        # 根节点上可继承的属性不能影响新页面
+        plan = merge_plan(input_files, set_inheritable_defaults)
+        compiled = plan.compile(on_error)
+        node_ref = update.allocate()
+        page_refs, skipped = plan.write_pages(
+            update, node_ref, compiled, open_source, on_error, dedup, progress
+        )
+
+        node = pages_node(page_refs)
+        node[NameObject("/Parent")] = root_pages_ref
+        update.write(node_ref, node)
+
+        new_root_pages = DictionaryObject(root_pages)
+        new_root_pages[NameObject("/Kids")] = ArrayObject(
+            list(root_pages["/Kids"]) + [node_ref]
+        )
+        new_root_pages[NameObject("/Count")] = NumberObject(
+            int(root_pages["/Count"]) + len(page_refs)
+        )
+        update.update_object(root_pages_ref, new_root_pages)
+        update.save(output_path)
+        total_pages = int(new_root_pages["/Count"])
+
+    return {
+        "output_path": output_path,
+        "page_count": total_pages,
+        "skipped": skipped,
+    }
+
+
+def check_merge_inputs(input_files, pool=None):
+    """
+    检查所有输入文件都能打开并读取页面
+
+    Args:
+        input_files: 输入文件路径列表
+        pool: 线程池，指定时并发检查多个文件
+
+    Raises:
+        InputFileError: 列出所有无法读取的文件
+    """
+    results = (pool.map if pool is not None else map)(_check_source, input_files)
+    errors = [error for error in results if error]
+    if errors:
+        raise InputFileError("以下文件无法读取：\n" + "\n".join(errors))
+
+
+def _check_source(file_path):
+    """检查一个输入文件，返回错误信息，没有错误时返回 None"""
+    try:
+        reader = _open_source(file_path, load_pages=False)
+        reader.stream.close()
+        return None
+    except InputFileError as e:
+        return str(e)
+
+
+class _Prefetcher:
+    """
+    按合并顺序打开输入文件
+
+    有线程池时始终保持后面 prefetch 个文件在后台读取；同一个文件出现多次时只打开
+    一次（页面组装计划在最后一次用到它之后才关闭）。
+    """
+
+    def __init__(self, input_files, pool, prefetch):
+        self.pool = pool
+        self.prefetch = prefetch
+        self.files = list(dict.fromkeys(input_files))
+        self.positions = {path: index for index, path in enumerate(self.files)}
+        self.futures = {}
+
+    @contextmanager
+    def open(self, file_path):
+        """打开文件，产生已加载页面的 PdfReader，退出时关闭"""
+        if self.pool is None:
+            reader = _open_source(file_path)
+        else:
+            index = self.positions[file_path]
+            for ahead in range(index, min(index + self.prefetch + 1, len(self.files))):
+                if ahead not in self.futures:
+                    self.futures[ahead] = self.pool.submit(
+                        _open_source, self.files[ahead], in_memory=True
+                    )
+            reader = self.futures.pop(index).result()
+        try:
+            yield reader
+        finally:
+            reader.stream.close()
+
+
+def _open_source(file_path, load_pages=True, in_memory=False):
+    """
+    打开输入文件
+
+    默认通过内存映射按需读取；in_memory 为 True 时整个文件读入内存（预读时使用）。
+    load_pages 为 False 时只读取页面树根节点的页数，不加载所有页面，用于快速检查。
+    """
+    reader = open_reader(file_path, preload=in_memory)
+    try:
+        check_decrypted(reader, file_path)
+        if load_pages:
+            len(reader.pages)
+        else:
+            int(reader.trailer["/Root"]["/Pages"]["/Count"])
+    except InputFileError:
+        reader.stream.close()
+        raise
+    except Exception as e:
+        reader.stream.close()
+        raise InputFileError(f"读取文件 {file_path} 时出错：{e}") from e
+    return reader
+
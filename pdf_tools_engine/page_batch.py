@@ -0,0 +1,269 @@
+"""
+批量插入、替换页面
+
+同一个文件的页面批量插入到一个文件夹或一组文件中，或者批量替换它们的页面（如给几百份
+合同加同一张封面、替换同一页法律声明）。插入（替换）文件只解析一次：用到的页面和它们
+引用的所有对象预先读入内存，各目标文件在线程池中同时处理，直接共享这些已解析的对象。
+每个目标文件对应一个输出文件，一个文件失败不影响其他文件；结果中列出每个目标文件的
+输出文件和页数或错误信息，也可以另存为 CSV 汇总表。
+"""
+
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+from pypdf.generic import DictionaryObject, IndirectObject
+
+from .common import batch_output_paths, check_decrypted, list_pdf_files, open_reader
+from .docinfo import page_count
+from .errors import InputFileError, OperationCancelled
+from .insert import insert_plan
+from .pages import PageSet
+from .replace import REPLACE_MODES, build_replace_map, replace_incremental, replace_plan
+
+
+class SharedSource:
+    """
+    只解析一次、在多个线程间共享的来源文件
+
+    用到的页面和它们引用的对象在 load_pages 中全部读入 pypdf 的对象缓存，之后各线程
+    只读取缓存中的对象，不再读取文件。
+    """
+
+    def __init__(self, file_path, label="输入文件"):
+        self.file_path = file_path
+        self.key = os.path.normcase(os.path.abspath(file_path))
+        self.reader = open_reader(file_path, label, preload=True)
+        try:
+            check_decrypted(self.reader, file_path, label)
+            self.page_count = len(self.reader.pages)
+        except InputFileError:
+            raise
+        except Exception as e:
+            raise InputFileError(f"读取文件 {file_path} 时出错：{e}") from e
+
+    def load_pages(self, pages):
+        """
+        读入页面和它们引用的所有对象
+
+        Args:
+            pages: 页码（1基索引）的序列，如 PageSet
+        """
+        seen = set()
+        stack = [
+            value
+            for page_num in pages
+            for name, value in self.reader.pages[page_num - 1].items()
+            if name != "/Parent"
+        ]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, IndirectObject):
+                key = (obj.idnum, obj.generation)
+                if key in seen:
+                    continue
+                seen.add(key)
+                obj = obj.get_object()
+                if isinstance(obj, DictionaryObject) and obj.get("/Type") in (
+                    "/Page",
+                    "/Pages",
+                ):
+                    # 其他页面不会被复制（见 rawpdf.ObjectCopier）
+                    continue
+            if isinstance(obj, DictionaryObject):
+                stack.extend(obj.values())
+            elif isinstance(obj, list):
+                stack.extend(obj)
+
+    def opener(self, target_file):
+        """
+        供 PagePlan 使用的打开函数：来源文件使用共享的读取器，目标文件单独打开
+
+        目标文件就是来源文件时不共享，返回 None（使用默认的打开方式）。
+        """
+        if os.path.normcase(os.path.abspath(target_file)) == self.key:
+            return None
+
+        @contextmanager
+        def open_source(file_path):
+            if os.path.normcase(os.path.abspath(file_path)) == self.key:
+                yield self.reader
+                return
+            reader = open_reader(file_path, "目标文件")
+            try:
+                yield reader
+            finally:
+                reader.stream.close()
+
+        return open_source
+
+
+def insert_into_files(insert_file, inputs, output_dir, method="position",
+                      position=1, insert_range="", suffix="_inserted", workers=None,
+                      summary_path=None, progress=None):
+    """
+    把同一个文件的页面插入到多个目标文件中
+
+    Args:
+        insert_file: 要插入的文件路径
+        inputs: 目标文件夹路径或目标文件路径列表
+        output_dir: 输出文件夹，输出文件名为 原文件名+suffix.pdf
+        method: 插入方式，position（指定位置）、head（首部）或 tail（尾部）
+        position: 指定位置插入时的页码（1基索引，插入到该页之前）
+        insert_range: 插入文件的页码范围，为空则全部插入
+        suffix: 输出文件名后缀
+        workers: 同时处理的目标文件数，默认等于CPU核数；为1时在当前线程内顺序处理
+        summary_path: 结果汇总表（CSV）的保存路径，为 None 时不保存
+        progress: 进度回调 progress(已完成文件数, 总文件数)
+
+    Returns:
+        dict: outputs 为 {目标文件: 输出文件}，page_counts 为 {目标文件: 输出页数}，
+            errors 为 {目标文件: 错误信息}
+
+    Raises:
+        InputFileError: 插入文件无法读取，或没有目标文件
+        PageRangeError: 插入文件的页码范围无效
+    """
+    source = SharedSource(insert_file, "要插入的文件")
+    insert_pages = PageSet.parse(insert_range, source.page_count)
+    if method in ("head", "tail"):
+        position = method
+    insertions = [(position, insert_file, insert_range)]
+
+    def process(target_file, output_path):
+        plan = insert_plan(
+            target_file, page_count(target_file), insertions, [source.page_count]
+        )
+        return plan.execute(output_path, source.opener(target_file))["page_count"]
+
+    return _run_batch(
+        source, insert_pages, process, inputs, output_dir, suffix, workers,
+        summary_path, progress,
+    )
+
+
+def replace_in_files(replace_file, inputs, output_dir, method="single", position=1,
+                     target_range="", source_range="", suffix="_replaced",
+                     mode="rewrite", workers=None, summary_path=None,
+                     progress=None):
+    """
+    用同一个文件的页面替换多个目标文件中的页面
+
+    Args:
+        replace_file: 用来替换的文件路径
+        inputs: 目标文件夹路径或目标文件路径列表
+        output_dir: 输出文件夹，输出文件名为 原文件名+suffix.pdf
+        method、position、target_range、source_range: 同 replace_pdf，
+            target_range 中可以用 last 等相对于各目标文件页数的写法
+        suffix: 输出文件名后缀
+        mode: 输出方式，同 replace_pdf
+        workers: 同时处理的目标文件数，默认等于CPU核数；为1时在当前线程内顺序处理
+        summary_path: 结果汇总表（CSV）的保存路径，为 None 时不保存
+        progress: 进度回调 progress(已完成文件数, 总文件数)
+
+    Returns:
+        dict: 同 insert_into_files
+
+    Raises:
+        InputFileError: 替换文件无法读取，或没有目标文件
+        PageRangeError: 替换文件的页码范围无效
+    """
+    if mode not in REPLACE_MODES:
+        raise ValueError(f"未知的替换输出方式：{mode}")
+    source = SharedSource(replace_file, "替换文件")
+    source_pages = PageSet.parse(source_range, source.page_count)
+
+    def process(target_file, output_path):
+        target_total_pages = page_count(target_file)
+        replace_map = build_replace_map(
+            target_total_pages, source.page_count,
+            method, position, target_range, source_range,
+        )
+        if mode == "incremental":
+            # 只读取共享的替换文件，目标文件由增量更新自己打开
+            replace_incremental(target_file, source.reader, replace_map, output_path)
+            return target_total_pages
+        plan = replace_plan(
+            target_file, replace_file, target_total_pages, replace_map
+        )
+        return plan.execute(output_path, source.opener(target_file))["page_count"]
+
+    return _run_batch(
+        source, source_pages, process, inputs, output_dir, suffix, workers,
+        summary_path, progress,
+    )
+
+
+def _run_batch(source, source_pages, process, inputs, output_dir, suffix,
+               workers, summary_path, progress):
+    """在线程池中对每个目标文件调用 process(目标文件, 输出文件)，它返回输出页数"""
+    jobs = batch_output_paths(list_pdf_files(inputs), output_dir, suffix)
+    source.load_pages(source_pages)
+
+    def run_one(target_file, output_path):
+        # 单个文件失败不影响其他文件，返回 (输出页数, 错误信息)
+        try:
+            return process(target_file, output_path), None
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            return None, str(e)
+
+    outputs = {}
+    page_counts = {}
+    errors = {}
+
+    def record(target_file, outcome):
+        count, error = outcome
+        if error is None:
+            outputs[target_file] = jobs[target_file]
+            page_counts[target_file] = count
+        else:
+            errors[target_file] = error
+        if progress:
+            progress(len(outputs) + len(errors), len(jobs))
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        for target_file, output_path in jobs.items():
+            record(target_file, run_one(target_file, output_path))
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {
+                pool.submit(run_one, target_file, output_path): target_file
+                for target_file, output_path in jobs.items()
+            }
+            for future in as_completed(futures):
+                record(futures[future], future.result())
+        finally:
+            # 出错或取消时不再等待未开始的文件
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    if summary_path:
+        write_summary(summary_path, jobs, page_counts, errors)
+    return {"outputs": outputs, "page_counts": page_counts, "errors": errors}
+
+
+def write_summary(summary_path, jobs, page_counts, errors):
+    """
+    保存结果汇总表，每个目标文件一行
+
+    Args:
+        summary_path: CSV 文件路径
+        jobs: {目标文件: 输出文件}
+        page_counts: {目标文件: 输出页数}
+        errors: {目标文件: 错误信息}
+    """
+    with open(summary_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(["目标文件", "输出文件", "页数", "结果"])
+        for target_file, output_path in jobs.items():
+            if target_file in page_counts:
+                row = [output_path, page_counts[target_file], "成功"]
+            elif target_file in errors:
+                row = ["", "", f"失败：{errors[target_file]}"]
+            else:
+                row = ["", "", "未处理"]
+            writer.writerow([target_file] + row)
@@ -0,0 +1,346 @@
+"""
+页码范围解析
+
+页码集合 PageSet 保存为若干个合并后的区间，而不是逐页展开的列表："1-5000000" 和
+"1-5000000:2" 都只占一个区间。所有操作（拆分、插入、替换、提取图片）都通过 PageSet.parse 解析页码
+范围字符串，格式统一为逗号分隔的若干项：
+
+    5           单个页码
+    1-3         闭区间
+    10-         第10页到最后一页
+    -5          第1页到第5页
+    last        最后一页，也可以用在区间中，如 3-last
+    1-9:2       带步长的区间（1,3,5,7,9），起止可以省略，如 2-:2 表示所有偶数页
+"""
+
+from bisect import bisect_left, bisect_right
+from math import lcm
+
+from .errors import PageRangeError
+
+# 表示最后一页的关键字
+LAST_PAGE = "last"
+
+
+class PageSet:
+    """
+    页码集合（1基索引），由排好序、互不重叠的块组成
+
+    每块是一段页码 [起始页, 结束页] 中按周期 period 重复的若干个偏移：页码
+    起始页 + 偏移 + n * period 都在集合中。连续区间是周期为1的块，"1-9:2" 是周期为2、
+    偏移为 (0,) 的一块，几个带步长的区间重叠时按步长的最小公倍数取周期。占用的内存与
+    区间数（和周期）成正比，与页数无关；判断页码是否在集合中为 O(log 块数)，迭代按
+    页码从小到大逐页生成，不展开成列表。
+    """
+
+    __slots__ = ("_starts", "_ends", "_periods", "_offsets", "_length")
+
+    def __init__(self, intervals=()):
+        """
+        Args:
+            intervals: 闭区间 (起始页, 结束页) 或带步长的区间 (起始页, 结束页, 步长)
+                的序列，可以无序、重叠，起始页大于结束页的区间忽略
+        """
+        runs = []
+        for interval in intervals:
+            start, end = int(interval[0]), int(interval[1])
+            step = int(interval[2]) if len(interval) > 2 else 1
+            if start <= end:
+                runs.append((start, start + (end - start) // step * step, step))
+
+        self._starts, self._ends, self._periods, self._offsets = [], [], [], []
+        # 按所有区间的起止点分段，每段被同一组区间覆盖
+        events = sorted(
+            {run[0] for run in runs} | {run[1] + 1 for run in runs}
+        )
+        runs.sort()
+        active = []
+        next_run = 0
+        for segment_start, next_start in zip(events, events[1:]):
+            active = [run for run in active if run[1] >= segment_start]
+            while next_run < len(runs) and runs[next_run][0] == segment_start:
+                active.append(runs[next_run])
+                next_run += 1
+            if active:
+                self._add_segment(segment_start, next_start - 1, active)
+
+        self._length = sum(
+            (end - start - offset) // period + 1
+            for start, end, period, offsets in self._blocks()
+            for offset in offsets
+        )
+
+    def _add_segment(self, start, end, runs):
+        """加入被 runs 覆盖的一段页码 [start, end]"""
+        if any(step == 1 for _, _, step in runs):
+            period, offsets = 1, [0]
+        else:
+            period = lcm(*(step for _, _, step in runs))
+            # 周期比这一段还长时只保留段内的偏移
+            limit = min(period, end - start + 1)
+            offsets = sorted(
+                {
+                    offset
+                    for run_start, _, step in runs
+                    for offset in range((run_start - start) % step, limit, step)
+                }
+            )
+            if len(offsets) == period:
+                period, offsets = 1, [0]
+        if not offsets:
+            return
+
+        # 起止改为第一页和最后一页，偏移从第一页算起
+        first = offsets[0]
+        offsets = tuple(offset - first for offset in offsets)
+        start += first
+        end = max(
+            start + offset + (end - start - offset) // period * period
+            for offset in offsets
+            if offset <= end - start
+        )
+
+        if self._starts and self._periods[-1] == period:
+            last_start, last_end = self._starts[-1], self._ends[-1]
+            last_offsets = self._offsets[-1]
+            same_phase = sorted(
+                (start - last_start + offset) % period for offset in offsets
+            ) == list(last_offsets)
+            # 上一块的规律延续到这一块，中间没有缺少的页
+            next_page = min(
+                last_start + offset + ((last_end - last_start - offset) // period + 1)
+                * period
+                for offset in last_offsets
+            )
+            if same_phase and next_page >= start:
+                self._ends[-1] = end
+                return
+
+        self._starts.append(start)
+        self._ends.append(end)
+        self._periods.append(period)
+        self._offsets.append(offsets)
+
+    def _blocks(self):
+        return zip(self._starts, self._ends, self._periods, self._offsets)
+
+    @classmethod
+    def all(cls, max_page):
+        """第1页到第 max_page 页"""
+        return cls([(1, max_page)])
+
+    @classmethod
+    def parse(cls, range_str, max_page, clamp=False):
+        """
+        解析页码范围字符串
+
+        Args:
+            range_str: 页码范围字符串，如 "1-3,5"；为空时表示全部页面
+            max_page: 文档总页数
+            clamp: 为 True 时超出文档的部分直接舍去；否则页码超出范围时报错
+
+        Returns:
+            PageSet: 页码集合
+
+        Raises:
+            PageRangeError: 范围格式错误或页码超出范围
+        """
+        if not range_str or not range_str.strip():
+            return cls.all(max_page)
+
+        runs = []
+        for part in range_str.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            start, end, step = _parse_part(part, max_page)
+            if not clamp:
+                for page_num in (start, end):
+                    if page_num < 1 or page_num > max_page:
+                        raise PageRangeError(
+                            f"页码 {page_num} 超出范围（1-{max_page}）！"
+                        )
+            if start > end and start <= max_page:
+                raise PageRangeError(f"起始页大于结束页：{part}")
+            runs.append((_first_page(start, step), min(end, max_page), step))
+        return cls(runs)
+
+    def runs(self):
+        """
+        按页码顺序逐个生成带步长的区间 (起始页, 结束页, 步长)
+
+        只有一个偏移的块整块生成一个区间（连续区间的步长为1），有多个偏移的块按每个
+        周期内连续的页码生成；相邻的连续区间合并，单页的步长为1。
+        """
+        current = None
+        for start, end, period, offsets in self._blocks():
+            if len(offsets) == 1:
+                pieces = [(start, end, period if end > start else 1)]
+            else:
+                pieces = _block_pieces(start, end, period, offsets)
+            for piece in pieces:
+                if (
+                    current is not None
+                    and current[2] == piece[2] == 1
+                    and piece[0] == current[1] + 1
+                ):
+                    current = (current[0], piece[1], 1)
+                    continue
+                if current is not None:
+                    yield current
+                current = piece
+        if current is not None:
+            yield current
+
+    def complement(self, max_page):
+        """第1页到第 max_page 页中不在集合里的页码"""
+        runs = []
+        next_page = 1
+        for start, end, period, offsets in self._blocks():
+            if start > max_page:
+                break
+            runs.append((next_page, start - 1))
+            for offset in range(1, min(period, end - start + 1)):
+                if offset not in offsets:
+                    first = _first_page(start + offset, period)
+                    runs.append((first, min(end, max_page), period))
+            next_page = max(end + 1, 1)
+        runs.append((next_page, max_page))
+        return PageSet(runs)
+
+    def first(self):
+        """最小的页码，集合为空时为 None"""
+        return self._starts[0] if self._starts else None
+
+    def __contains__(self, page_num):
+        position = bisect_right(self._starts, page_num) - 1
+        if position < 0 or page_num > self._ends[position]:
+            return False
+        offsets = self._offsets[position]
+        offset = (page_num - self._starts[position]) % self._periods[position]
+        index = bisect_left(offsets, offset)
+        return index < len(offsets) and offsets[index] == offset
+
+    def __iter__(self):
+        for block in self._blocks():
+            yield from _block_pages(*block)
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return bool(self._starts)
+
+    def __eq__(self, other):
+        if not isinstance(other, PageSet):
+            return NotImplemented
+        if (
+            self._starts == other._starts
+            and self._ends == other._ends
+            and self._periods == other._periods
+            and self._offsets == other._offsets
+        ):
+            return True
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other)
+        )
+
+    def __repr__(self):
+        parts = []
+        for start, end, period, offsets in self._blocks():
+            for offset in offsets:
+                first = start + offset
+                last = first + (end - first) // period * period
+                if first == last:
+                    parts.append(str(first))
+                elif period == 1:
+                    parts.append(f"{first}-{last}")
+                else:
+                    parts.append(f"{first}-{last}:{period}")
+        return f"PageSet({','.join(parts)!r})"
+
+
+def _first_page(start, step):
+    """从 start 开始、步长为 step 的页码中第一个不小于1的页码"""
+    if start < 1:
+        start += (step - start) // step * step
+    return start
+
+
+def _block_pages(start, end, period, offsets):
+    """按顺序生成一块中的页码"""
+    if period == 1:
+        yield from range(start, end + 1)
+        return
+    for base in range(start, end + 1, period):
+        for offset in offsets:
+            if base + offset > end:
+                break
+            yield base + offset
+
+
+def _block_pieces(start, end, period, offsets):
+    """按顺序生成一块中每个周期内连续的页码 (起始页, 结束页, 1)"""
+    groups = []
+    for offset in offsets:
+        if groups and offset == groups[-1][1] + 1:
+            groups[-1][1] = offset
+        else:
+            groups.append([offset, offset])
+    for base in range(start, end + 1, period):
+        for first, last in groups:
+            if base + first > end:
+                break
+            yield base + first, min(base + last, end), 1
+
+
+def parse_page_ranges(range_str, max_page):
+    """
+    解析页码范围字符串，返回页码列表
+
+    会逐页展开，只在确实需要列表时使用，否则用 PageSet.parse。
+
+    Args:
+        range_str: 页码范围字符串，格式见模块说明；为空时表示全部页面
+        max_page: 文档总页数
+
+    Returns:
+        list: 去重并排序后的页码列表（1基索引）
+
+    Raises:
+        PageRangeError: 范围格式错误或页码超出范围
+    """
+    return list(PageSet.parse(range_str, max_page))
+
+
+def _parse_part(part, max_page):
+    """
+    解析逗号分隔的一项
+
+    Returns:
+        tuple: (起始页, 结束页, 步长)，未检查是否超出文档
+    """
+    pages, _, step = part.partition(":")
+    try:
+        step = int(step) if step.strip() else 1
+        if "-" in pages:
+            start, end = pages.split("-")
+            start = _parse_page(start, max_page, default=1)
+            end = _parse_page(end, max_page, default=max_page)
+        else:
+            start = end = _parse_page(pages, max_page)
+    except ValueError:
+        raise PageRangeError(f"无法解析页码范围：{part}")
+    if step < 1:
+        raise PageRangeError(f"步长必须大于0：{part}")
+    return start, end, step
+
+
+def _parse_page(text, max_page, default=None):
+    """解析单个页码，last 为最后一页；text 为空时返回 default"""
+    text = text.strip()
+    if not text and default is not None:
+        return default
+    if text.lower() == LAST_PAGE:
+        return max_page
+    return int(text)
@@ -0,0 +1,111 @@
+"""
+按页分块的多进程处理
+
+把文档的页面分成若干连续的块，每块在独立进程中处理并写入临时文件，最后按原顺序
+拼接成一个输出文件。要求处理函数支持 page_indices 参数（只输出指定页面）。
+
+拼接用页面组装计划（PagePlan）流式写出，各块中相同的流对象（水印的 Form XObject、
+字体、图片）按内容去重，输出文件中只保留一份。
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+
+from .common import open_reader
+from .doccache import borrow_reader
+from .plan import PagePlan
+
+# 每块最少页数，块太小时进程调度和拼接的开销会超过收益
+MIN_CHUNK_PAGES = 20
+
+
+def split_into_chunks(total_pages, workers, min_chunk_pages=MIN_CHUNK_PAGES):
+    """
+    把页码分成连续的块
+
+    每个进程大约分到4块，处理快慢不均时可以互相补位。
+
+    Returns:
+        list: [(起始页, 结束页), ...]，0基索引，不含结束页
+    """
+    chunk_count = max(1, min(workers * 4, total_pages // min_chunk_pages))
+    chunk_size = -(-total_pages // chunk_count)  # 向上取整
+    return [
+        (start, min(start + chunk_size, total_pages))
+        for start in range(0, total_pages, chunk_size)
+    ]
+
+
+def run_page_parallel(func, input_file, output_path, workers, progress=None,
+                      initializer=None, **kwargs):
+    """
+    多进程按页分块执行 func 并按原页序拼接结果
+
+    Args:
+        func: 模块级引擎函数，签名为 func(input_file, output_path, ..., page_indices=...)
+        input_file: 输入文件路径
+        output_path: 输出文件路径
+        workers: 进程数
+        progress: 进度回调 progress(已处理页数, 总页数)，每完成一块调用一次
+        initializer: 工作进程的初始化函数（无参数），None 表示不需要初始化
+        **kwargs: 传给 func 的其他参数
+
+    Returns:
+        str: 输出文件路径
+    """
+    with borrow_reader(input_file) as reader:
+        total_pages = len(reader.pages)
+    chunks = split_into_chunks(total_pages, workers)
+    temp_dir = tempfile.mkdtemp(prefix="pdftools_chunks_")
+
+    try:
+        chunk_paths = [
+            os.path.join(temp_dir, f"chunk_{index:05d}.pdf")
+            for index in range(len(chunks))
+        ]
+        pool = ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)), initializer=initializer
+        )
+        try:
+            futures = [
+                pool.submit(
+                    _process_chunk, func, input_file, chunk_path, start, end, kwargs
+                )
+                for chunk_path, (start, end) in zip(chunk_paths, chunks)
+            ]
+            done_pages = 0
+            for future in as_completed(futures):
+                done_pages += future.result()
+                if progress:
+                    progress(done_pages, total_pages)
+        finally:
+            # 出错或取消时不再等待未开始的块
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        # 按原顺序拼接，相同的流对象只写出一次
+        plan = PagePlan()
+        for chunk_path in chunk_paths:
+            plan.add(chunk_path, label="分块文件")
+        plan.execute(output_path, _open_chunk, dedup=True)
+        return output_path
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@contextmanager
+def _open_chunk(chunk_path):
+    """读入一块的临时文件，不放进文档缓存，用完即可删除"""
+    reader = open_reader(chunk_path, "分块文件", preload=True)
+    try:
+        yield reader
+    finally:
+        reader.stream.close()
+
+
+def _process_chunk(func, input_file, chunk_path, start, end, kwargs):
+    """在工作进程中处理一块页面，返回处理的页数"""
+    func(input_file, chunk_path, page_indices=range(start, end), **kwargs)
+    return end - start
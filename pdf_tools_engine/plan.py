@@ -0,0 +1,366 @@
+"""
+页面组装计划
+
+插入、替换、合并都是把若干个文档中的页面按顺序拼成一个新文档。PagePlan 用一串
+(来源文件, 页码区间, 变换) 描述输出文档的页面：
+
+    plan = PagePlan()
+    plan.add("a.pdf", (1, 3))
+    plan.add("b.pdf")               # b.pdf 的全部页面
+    plan.add("a.pdf", (4, 10))
+    plan.execute("out.pdf")
+
+执行前先编译：合并同一来源中相邻的区间，检查文件是否存在、页码是否超出范围（页数
+从缓存或快速读取得到），参数有误时在写出任何内容之前报错。执行时只写一遍：每个来源
+文件只打开一次，页面和它引用的对象复制后立即写入输出文件（同 merge 的流式写出），
+来源文件在最后一次用到之后就关闭。
+"""
+
+import os
+from contextlib import ExitStack
+from itertools import accumulate
+
+from pypdf.generic import ArrayObject, DictionaryObject, NameObject, NumberObject
+
+from .common import check_decrypted, check_input_file, remove_files, replace_file
+from .doccache import borrow_reader
+from .docinfo import page_count
+from .errors import InputFileError, OperationCancelled, PageRangeError, PDFToolError
+from .rawpdf import ObjectCopier, StreamWriter
+
+# 无法读取的来源文件的处理方式
+ON_ERROR_FAIL = "fail"  # 直接报错
+ON_ERROR_SKIP = "skip"  # 跳过该文件的所有页面，在结果中列出
+
+# 页面缺少 /MediaBox 时使用的默认值（US Letter）
+DEFAULT_MEDIA_BOX = (0, 0, 612, 792)
+
+
+class PageRun:
+    """
+    计划中的一段：来源文件中从 start 到 end、步长为 step 的若干页
+
+    end 为 None 表示到最后一页，执行时打开文件后才确定；步长不为1时 end 是这一段的
+    最后一页。
+    """
+
+    __slots__ = ("source", "start", "end", "transform", "label", "key", "step")
+
+    def __init__(self, source, start=1, end=None, transform=None, label="输入文件",
+                 step=1):
+        self.source = source
+        self.start = start
+        self.end = end
+        self.transform = transform
+        self.label = label
+        self.step = step
+        self.key = os.path.normcase(os.path.abspath(source)) if source else source
+
+    def pages(self):
+        """这一段的页码（end 已确定时）"""
+        return range(self.start, self.end + 1, self.step)
+
+    def __repr__(self):
+        step = f", step={self.step}" if self.step != 1 else ""
+        return f"PageRun({self.source!r}, {self.start}, {self.end}{step})"
+
+
+class PagePlan:
+    """输出文档的页面组装计划"""
+
+    def __init__(self):
+        self.runs = []
+
+    def add(self, source, pages=None, transform=None, label="输入文件"):
+        """
+        在计划末尾加入来源文件的页面
+
+        Args:
+            source: 来源文件路径
+            pages: None 表示全部页面；(起始页, 结束页) 闭区间（1基索引，起始页大于
+                结束页时不加入）；或 PageSet，带步长的区间整段加入，不逐页拆开
+            transform: 页面变换 transform(页面字典)，在复制后的页面写出前调用，可以
+                修改页面（如设置 /Rotate）
+            label: 出错提示中使用的文件描述
+        """
+        if pages is None:
+            self.runs.append(PageRun(source, 1, None, transform, label))
+            return
+        if hasattr(pages, "runs"):
+            runs = pages.runs()
+        else:
+            runs = [(pages[0], pages[1], 1)]
+        for start, end, step in runs:
+            if start <= end:
+                self.runs.append(PageRun(source, start, end, transform, label, step))
+
+    def compile(self, on_error=ON_ERROR_FAIL):
+        """
+        检查计划并合并相邻的段（步长相同且前后衔接），不打开输出文件
+
+        Args:
+            on_error: 来源文件不存在或页码超出范围时的处理方式，fail 或 skip
+
+        Returns:
+            tuple: (段列表, 跳过的文件 {文件路径: 错误信息})
+
+        Raises:
+            InputFileError: 来源文件不存在或无法读取（fail），或没有任何页面
+            PageRangeError: 页码超出来源文件的范围（fail）
+        """
+        if on_error not in (ON_ERROR_FAIL, ON_ERROR_SKIP):
+            raise ValueError(f"未知的错误处理方式：{on_error}")
+
+        counts = {}
+        skipped = {}
+        failed = set()
+        for run in self.runs:
+            if run.key in failed:
+                continue
+            try:
+                check_input_file(run.source, run.label)
+                if run.end is not None:
+                    if run.key not in counts:
+                        counts[run.key] = page_count(run.source)
+                    _check_run(run, counts[run.key])
+            except PDFToolError as e:
+                if on_error == ON_ERROR_FAIL:
+                    raise
+                skipped[run.source] = str(e)
+                failed.add(run.key)
+
+        runs = []
+        for run in self.runs:
+            if run.key in failed:
+                continue
+            last = runs[-1] if runs else None
+            if (
+                last is not None
+                and last.key == run.key
+                and last.transform is run.transform
+                and last.end is not None
+                and last.step == run.step
+                and run.start == last.end + run.step
+            ):
+                last.end = run.end
+            else:
+                runs.append(
+                    PageRun(
+                        run.source, run.start, run.end, run.transform, run.label,
+                        run.step,
+                    )
+                )
+
+        if not runs:
+            raise InputFileError("没有可输出的页面！")
+        return runs, skipped
+
+    def write_pages(self, writer, pages_ref, compiled=None, open_source=None,
+                    on_error=ON_ERROR_FAIL, dedup=True, progress=None):
+        """
+        按计划复制页面到 writer，不写页面树
+
+        Args:
+            writer: rawpdf.StreamWriter 或 incremental.IncrementalUpdate
+            pages_ref: 页面的 /Parent（页面树节点的引用）
+            compiled: compile() 的结果，为 None 时先编译
+            open_source: 打开来源文件的函数 open_source(文件路径)，返回产生
+                pypdf.PdfReader 的上下文管理器；默认借用文档缓存中的读取器
+            on_error: 同 compile
+            dedup: 是否对各文件中相同的字体、图片等流对象去重
+            progress: 进度回调 progress(已处理页数, 总页数)，每页调用一次；计划中有
+                页数未知的段（全部页面）时改为 progress(已处理段数, 总段数)，
+                段内按页折算为小数
+
+        Returns:
+            tuple: (页面引用列表, 跳过的文件 {文件路径: 错误信息})
+        """
+        runs, skipped = compiled if compiled is not None else self.compile(on_error)
+        open_source = open_source or borrow_reader
+        last_use = {run.key: index for index, run in enumerate(runs)}
+        if all(run.end is not None for run in runs):
+            weights = [len(run.pages()) for run in runs]
+        else:
+            weights = [1] * len(runs)
+        done_before = list(accumulate(weights, initial=0))
+
+        page_refs = []
+        sources = {}  # 来源文件 -> _Source
+        try:
+            for index, run in enumerate(runs):
+                if run.source in skipped:
+                    continue
+
+                def run_progress(done, total, index=index):
+                    if progress:
+                        progress(
+                            done_before[index] + weights[index] * done / total,
+                            done_before[-1],
+                        )
+
+                try:
+                    source = sources.get(run.key)
+                    if source is None:
+                        source = sources[run.key] = _Source(
+                            run, runs, open_source, writer, dedup
+                        )
+                    page_refs.extend(source.copy_run(run, pages_ref, run_progress))
+                except OperationCancelled:
+                    raise
+                except Exception as e:
+                    if on_error == ON_ERROR_FAIL:
+                        if isinstance(e, PDFToolError):
+                            raise
+                        raise InputFileError(f"处理文件 {run.source} 时出错：{e}") from e
+                    skipped[run.source] = str(e)
+                if last_use[run.key] == index and run.key in sources:
+                    sources.pop(run.key).close()
+        finally:
+            for source in sources.values():
+                source.close()
+
+        if not page_refs:
+            raise InputFileError("没有可输出的页面！")
+        return page_refs, skipped
+
+    def execute(self, output_path, open_source=None, on_error=ON_ERROR_FAIL,
+                dedup=True, progress=None):
+        """
+        按计划写出新文档
+
+        先编译计划，参数有误时不创建输出文件；写入同目录下的临时文件，完成后再改名。
+
+        Args:
+            output_path: 输出文件路径
+            其他参数同 write_pages
+
+        Returns:
+            dict: output_path 为输出文件路径，page_count 为输出页数，
+                skipped 为跳过的文件 {文件路径: 错误信息}
+        """
+        compiled = self.compile(on_error)
+        temp_path = output_path + ".part"
+        try:
+            with open(temp_path, "wb") as output_file:
+                writer = StreamWriter(output_file)
+                pages_ref = writer.allocate()
+                page_refs, skipped = self.write_pages(
+                    writer, pages_ref, compiled, open_source, on_error, dedup, progress
+                )
+                writer.write(pages_ref, pages_node(page_refs))
+                root_ref = writer.add(
+                    DictionaryObject(
+                        {
+                            NameObject("/Type"): NameObject("/Catalog"),
+                            NameObject("/Pages"): pages_ref,
+                        }
+                    )
+                )
+                writer.finish(root_ref)
+            replace_file(temp_path, output_path)
+        except BaseException:
+            remove_files([temp_path])
+            raise
+
+        return {
+            "output_path": output_path,
+            "page_count": len(page_refs),
+            "skipped": skipped,
+        }
+
+
+def set_inheritable_defaults(page_dict):
+    """
+    显式设置页面缺少的可继承属性，页面放进已有文档的页面树后，树节点上的属性
+    （/Resources、/MediaBox、/CropBox、/Rotate）不会影响它
+
+    来源页面的继承属性在读取时已经展开到页面上，这里只补上默认值：缺少 /MediaBox
+    时为 US Letter，/CropBox 与 /MediaBox 相同。
+    """
+    page_dict.setdefault(NameObject("/Resources"), DictionaryObject())
+    page_dict.setdefault(NameObject("/Rotate"), NumberObject(0))
+    page_dict.setdefault(
+        NameObject("/MediaBox"),
+        ArrayObject(NumberObject(value) for value in DEFAULT_MEDIA_BOX),
+    )
+    page_dict.setdefault(NameObject("/CropBox"), ArrayObject(page_dict["/MediaBox"]))
+
+
+def pages_node(page_refs):
+    """页面树节点"""
+    return DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Pages"),
+            NameObject("/Kids"): ArrayObject(page_refs),
+            NameObject("/Count"): NumberObject(len(page_refs)),
+        }
+    )
+
+
+class _Source:
+    """执行计划时打开的一个来源文件"""
+
+    def __init__(self, run, runs, open_source, writer, dedup):
+        self._stack = ExitStack()
+        try:
+            self.reader = self._stack.enter_context(open_source(run.source))
+            check_decrypted(self.reader, run.source, run.label)
+            total = len(self.reader.pages)
+            own_runs = [other for other in runs if other.key == run.key]
+            for other in own_runs:
+                if other.end is None:
+                    other.end = total
+                _check_run(other, total)
+
+            # 先为计划中用到的页面分配编号，链接、批注中指向这些页面的引用直接对应到
+            # 新页面；同一页面用到多次时，第一次用预留的编号
+            self.copier = ObjectCopier(writer, dedup)
+            self.writer = writer
+            self._reserved = {}
+            for other in own_runs:
+                for page_num in other.pages():
+                    ref = self.reader.pages[page_num - 1].indirect_reference
+                    if ref is not None and page_num not in self._reserved:
+                        self._reserved[page_num] = self.copier.reserve(ref)
+        except BaseException:
+            self._stack.close()
+            raise
+
+    def copy_run(self, run, pages_ref, progress):
+        """
+        复制一段页面
+
+        Returns:
+            list: 输出文件中的页面引用
+        """
+        refs = []
+        pages = run.pages()
+        for page_num in pages:
+            page = self.reader.pages[page_num - 1]
+            ref = self._reserved.pop(page_num, None)
+            if ref is None:
+                ref = self.writer.allocate()
+            page_dict = self.copier.copy(
+                DictionaryObject(
+                    {name: value for name, value in page.items() if name != "/Parent"}
+                )
+            )
+            page_dict[NameObject("/Parent")] = pages_ref
+            if run.transform is not None:
+                run.transform(page_dict)
+            self.writer.write(ref, page_dict)
+            self.copier.flush()
+            refs.append(ref)
+            progress(len(refs), len(pages))
+        return refs
+
+    def close(self):
+        self._stack.close()
+
+
+def _check_run(run, total):
+    if run.start < 1 or run.end > total:
+        page_num = run.start if run.start < 1 else run.end
+        raise PageRangeError(
+            f"{run.label}的页码 {page_num} 超出范围（1-{total}）！"
+        )
@@ -0,0 +1,286 @@
+"""
+快速读取页数
+
+只读取文件末尾的 startxref、交叉引用表（或交叉引用流）中用到的几项、trailer，以及
+/Root 和 /Pages 两个对象，从页面树根节点的 /Count 得到页数，不解析页面树和其他对象。
+每个文件只需几次定位读取，列出大量文件的页数时比完整解析快得多。
+
+交叉引用表按需查找：传统交叉引用表只读取各段的段头，需要某个对象时再直接定位到它的
+那一项；对象在对象流中时读取并解压该对象流。文件结构不符合规范（损坏、修复过）时
+抛出 QuickReadError，由调用方改用完整的解析器。
+"""
+
+import re
+from io import BytesIO
+
+from pypdf.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NumberObject,
+    StreamObject,
+    read_object,
+)
+
+from .rawpdf import find_last_xref
+
+# 对象头 "编号 代数 obj"
+_OBJECT_HEADER = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj")
+
+# PDF中的空白字符
+_WHITESPACE = b" \t\n\r\f\x00"
+
+# 传统交叉引用表每一项的长度（字节）
+_ENTRY_SIZE = 20
+
+# 交叉引用链的最大长度，防止 /Prev 循环
+_MAX_SECTIONS = 1000
+
+
+class QuickReadError(Exception):
+    """文件结构不符合规范，无法快速读取"""
+
+
+class XrefReader:
+    """
+    按需查找交叉引用的只读PDF读取器
+
+    只用于读取少数几个对象：trailer 给出最后一个交叉引用段，查找对象时从最新的段开始，
+    找不到再沿 /Prev 读取更早的段。
+    """
+
+    # 解析对象时遇到格式错误直接报错，不做修复
+    strict = True
+
+    def __init__(self, f):
+        self.file = f
+        try:
+            offset, _ = find_last_xref(f)
+        except Exception as e:
+            raise QuickReadError(str(e)) from e
+        self._sections = []
+        self._next_section = offset
+        self._object_streams = {}
+        self._load_next_section()
+        self.trailer = self._sections[0]["trailer"]
+
+    def get_object(self, ref):
+        """
+        读取对象
+
+        Args:
+            ref: IndirectObject
+
+        Returns:
+            对象，对象不存在（空闲）时为 None
+        """
+        entry = self._find_entry(ref.idnum)
+        if entry is None:
+            return None
+        if entry[0] == "offset":
+            return self._read_object_at(entry[1], ref.idnum)
+        return self._read_compressed(entry[1], entry[2], ref.idnum)
+
+    def resolve(self, obj):
+        """间接引用解析为对象，其他对象原样返回"""
+        if isinstance(obj, IndirectObject):
+            return self.get_object(obj)
+        return obj
+
+    def page_count(self):
+        """
+        页面树根节点的页数
+
+        Raises:
+            QuickReadError: 文件已加密或结构无法识别
+        """
+        if "/Encrypt" in self.trailer:
+            raise QuickReadError("文件已加密")
+        root = self.resolve(self.trailer.get("/Root"))
+        if not isinstance(root, DictionaryObject):
+            raise QuickReadError("找不到 /Root")
+        pages = self.resolve(root.get("/Pages"))
+        if not isinstance(pages, DictionaryObject):
+            raise QuickReadError("找不到 /Pages")
+        count = self.resolve(pages.get("/Count"))
+        if not isinstance(count, NumberObject) or int(count) < 0:
+            raise QuickReadError("页面树根节点没有有效的 /Count")
+        return int(count)
+
+    def _find_entry(self, number):
+        """
+        在交叉引用链中查找对象
+
+        Returns:
+            tuple: ("offset", 偏移量) 或 ("compressed", 对象流编号, 序号)；
+                对象空闲或不存在时为 None
+        """
+        index = 0
+        while True:
+            if index == len(self._sections):
+                if self._next_section is None:
+                    return None
+                self._load_next_section()
+                continue
+            section = self._sections[index]
+            found, entry = section["lookup"](number)
+            if found:
+                return entry
+            index += 1
+
+    def _load_next_section(self):
+        """读取下一个（更早的）交叉引用段，沿 /XRefStm 和 /Prev 找到再之前的段"""
+        if len(self._sections) >= _MAX_SECTIONS:
+            raise QuickReadError("交叉引用链过长")
+        offset = self._next_section
+        self.file.seek(offset)
+        if self.file.read(4) == b"xref":
+            section = self._read_table_section()
+            # 混合型文件：交叉引用表之后还要查找 /XRefStm 指向的交叉引用流
+            xref_stream = section["trailer"].get("/XRefStm")
+            self._sections.append(section)
+            if isinstance(xref_stream, NumberObject):
+                self._sections.append(self._read_stream_section(int(xref_stream)))
+        else:
+            section = self._read_stream_section(offset)
+            self._sections.append(section)
+
+        prev = section["trailer"].get("/Prev")
+        if isinstance(prev, NumberObject) and int(prev) != offset:
+            self._next_section = int(prev)
+        else:
+            self._next_section = None
+
+    def _read_table_section(self):
+        """读取传统交叉引用表的段头和 trailer，不读取各项"""
+        f = self.file
+        subsections = []
+        while True:
+            line = f.readline()
+            if not line.strip():
+                continue
+            if line.lstrip().startswith(b"trailer"):
+                f.seek(f.tell() - len(line) + line.index(b"trailer") + len(b"trailer"))
+                break
+            try:
+                start, count = (int(value) for value in line.split())
+            except ValueError:
+                raise QuickReadError(f"无法识别的交叉引用表：{line[:40]!r}")
+            subsections.append((start, count, f.tell()))
+            f.seek(count * _ENTRY_SIZE, 1)
+
+        trailer = self._read(f)
+        if not isinstance(trailer, DictionaryObject):
+            raise QuickReadError("无法读取 trailer")
+
+        def lookup(number):
+            for start, count, entries_offset in subsections:
+                if start <= number < start + count:
+                    f.seek(entries_offset + (number - start) * _ENTRY_SIZE)
+                    fields = f.read(_ENTRY_SIZE).split()
+                    if len(fields) != 3 or fields[2] not in (b"n", b"f"):
+                        raise QuickReadError("交叉引用表的项长度不正确")
+                    if fields[2] == b"f":
+                        return True, None
+                    return True, ("offset", int(fields[0]))
+            return False, None
+
+        return {"trailer": trailer, "lookup": lookup}
+
+    def _read_stream_section(self, offset):
+        """读取交叉引用流"""
+        stream = self._read_object_at(offset)
+        if not isinstance(stream, StreamObject) or stream.get("/Type") != "/XRef":
+            raise QuickReadError("无法读取交叉引用流")
+        widths = [int(w) for w in stream["/W"]]
+        index = stream.get("/Index", ArrayObject([0, stream["/Size"]]))
+        index = [int(value) for value in index]
+        data = stream.get_data()
+        row_size = sum(widths)
+
+        def field(row, position, width, default):
+            if width == 0:
+                return default
+            return int.from_bytes(data[row + position:row + position + width], "big")
+
+        def lookup(number):
+            row_number = 0
+            for start, count in zip(index[::2], index[1::2]):
+                if start <= number < start + count:
+                    row = (row_number + number - start) * row_size
+                    if row + row_size > len(data):
+                        raise QuickReadError("交叉引用流数据不完整")
+                    entry_type = field(row, 0, widths[0], 1)
+                    second = field(row, widths[0], widths[1], 0)
+                    third = field(row, widths[0] + widths[1], widths[2], 0)
+                    if entry_type == 1:
+                        return True, ("offset", second)
+                    if entry_type == 2:
+                        return True, ("compressed", second, third)
+                    return True, None
+                row_number += count
+            return False, None
+
+        return {"trailer": stream, "lookup": lookup}
+
+    def _read_object_at(self, offset, number=None):
+        """读取文件中 offset 处的间接对象"""
+        f = self.file
+        f.seek(offset)
+        match = _OBJECT_HEADER.match(f.read(64))
+        if match is None or (number is not None and int(match.group(1)) != number):
+            raise QuickReadError(f"偏移量 {offset} 处不是预期的对象")
+        f.seek(offset + match.end())
+        return self._read(f)
+
+    def _read_compressed(self, stream_number, index, number):
+        """读取对象流中的对象"""
+        if stream_number not in self._object_streams:
+            stream = self.get_object(IndirectObject(stream_number, 0, self))
+            if not isinstance(stream, StreamObject):
+                raise QuickReadError(f"对象流 {stream_number} 无法读取")
+            data = stream.get_data()
+            first = int(stream["/First"])
+            header = [int(value) for value in data[:first].split()]
+            self._object_streams[stream_number] = (data, first, header)
+
+        data, first, header = self._object_streams[stream_number]
+        if 2 * index + 1 >= len(header) or header[2 * index] != number:
+            raise QuickReadError(f"对象流 {stream_number} 中找不到对象 {number}")
+        buffer = BytesIO(data)
+        buffer.seek(first + header[2 * index + 1])
+        return self._read(buffer)
+
+    def _read(self, stream):
+        """读取 stream 当前位置（跳过空白后）的对象"""
+        try:
+            while True:
+                char = stream.read(1)
+                if not char:
+                    raise QuickReadError("文件意外结束")
+                if char not in _WHITESPACE:
+                    break
+            stream.seek(-1, 1)
+            return read_object(stream, self)
+        except QuickReadError:
+            raise
+        except Exception as e:
+            raise QuickReadError(str(e)) from e
+
+
+def quick_page_count(file_path):
+    """
+    只读取 trailer 和页面树根节点，得到PDF文件的页数
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        int: 页数
+
+    Raises:
+        OSError: 文件无法打开
+        QuickReadError: 文件已加密或结构无法快速读取，需要用完整的解析器
+    """
+    with open(file_path, "rb") as f:
+        return XrefReader(f).page_count()
@@ -0,0 +1,343 @@
+"""
+底层PDF对象读写
+
+不经过 pypdf.PdfWriter，直接序列化对象、生成交叉引用表。增量更新和流式合并都基于
+这里的函数：对象写出后即可释放，内存占用与文档大小无关。
+"""
+
+import hashlib
+import os
+from array import array
+from io import BytesIO
+
+from pypdf.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NullObject,
+    NumberObject,
+    StreamObject,
+)
+
+from .errors import InputFileError
+
+PDF_HEADER = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n"
+
+# 读取文件末尾多少字节查找 startxref
+_TAIL_SIZE = 2048
+
+
+def find_last_xref(file):
+    """
+    找到文件中最后一个交叉引用表的位置
+
+    Returns:
+        tuple: (偏移量, 是否为交叉引用流)
+    """
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    file.seek(max(0, size - _TAIL_SIZE))
+    tail = file.read()
+    pos = tail.rfind(b"startxref")
+    if pos < 0:
+        raise InputFileError("找不到 startxref，文件可能已损坏")
+    offset = int(tail[pos + len(b"startxref"):].split()[0])
+    file.seek(offset)
+    head = file.read(32).lstrip()
+    return offset, not head.startswith(b"xref")
+
+
+def serialize_object(number, generation, obj):
+    """序列化一个间接对象"""
+    buffer = BytesIO()
+    buffer.write(f"{number} {generation} obj\n".encode("ascii"))
+    if obj is None:
+        obj = NullObject()
+    obj.write_to_stream(buffer)
+    buffer.write(b"\nendobj\n")
+    return buffer.getvalue()
+
+
+def copy_object(obj, map_ref):
+    """
+    复制对象，其中的间接引用用 map_ref(引用) 的返回值替换
+
+    流对象保留原始（编码后的）数据，不解压重新压缩。
+    """
+    if isinstance(obj, IndirectObject):
+        return map_ref(obj)
+    if isinstance(obj, StreamObject):
+        copied = obj.__class__()
+        copied._data = obj._data
+        for name, value in obj.items():
+            copied[name] = copy_object(value, map_ref)
+        return copied
+    if isinstance(obj, DictionaryObject):
+        return DictionaryObject(
+            {name: copy_object(value, map_ref) for name, value in obj.items()}
+        )
+    if isinstance(obj, ArrayObject):
+        return ArrayObject(copy_object(value, map_ref) for value in obj)
+    return obj
+
+
+def xref_subsections(numbers):
+    """把对象编号分成连续的段：[(起始编号, [编号, ...]), ...]"""
+    sections = []
+    for number in sorted(numbers):
+        if sections and number == sections[-1][0] + len(sections[-1][1]):
+            sections[-1][1].append(number)
+        else:
+            sections.append((number, [number]))
+    return sections
+
+
+def xref_table(offsets):
+    """
+    生成传统交叉引用表
+
+    Args:
+        offsets: {对象编号: (偏移量, 代数)}
+    """
+    # 第一段从0号对象（空闲链表头）开始，部分阅读器要求交叉引用表从0开始编号
+    lines = [b"xref\n0 1\n0000000000 65535 f\r\n"]
+    for start, numbers in xref_subsections(offsets):
+        lines.append(f"{start} {len(numbers)}\n".encode("ascii"))
+        for number in numbers:
+            offset, generation = offsets[number]
+            lines.append(f"{offset:010d} {generation:05d} n\r\n".encode("ascii"))
+    return b"".join(lines)
+
+
+def xref_stream(trailer, offsets):
+    """
+    生成交叉引用流对象
+
+    Args:
+        trailer: 写入流字典的 trailer 项（/Size、/Root、/Prev 等）
+        offsets: {对象编号: (偏移量, 代数)}，需包含交叉引用流自身
+    """
+    offset_width = max(4, (max(o for o, _ in offsets.values()).bit_length() + 7) // 8)
+    index = ArrayObject()
+    data = bytearray()
+    for start, numbers in xref_subsections(offsets):
+        index.extend([NumberObject(start), NumberObject(len(numbers))])
+        for number in numbers:
+            offset, generation = offsets[number]
+            data += b"\x01" + offset.to_bytes(offset_width, "big")
+            data += generation.to_bytes(2, "big")
+
+    stream = DecodedStreamObject()
+    stream.set_data(bytes(data))
+    stream.update(trailer)
+    stream.update(
+        {
+            NameObject("/Type"): NameObject("/XRef"),
+            NameObject("/W"): ArrayObject(
+                [NumberObject(1), NumberObject(offset_width), NumberObject(2)]
+            ),
+            NameObject("/Index"): index,
+        }
+    )
+    return stream.flate_encode()
+
+
+def write_trailer(f, trailer, offsets, xref_offset=None):
+    """
+    在文件当前位置写入传统交叉引用表、trailer 和 startxref
+
+    Args:
+        offsets: {对象编号: (偏移量, 代数)}；为 None 时表示交叉引用表已由调用方写入，
+            其起始位置为 xref_offset
+    """
+    if offsets is not None:
+        xref_offset = f.tell()
+        f.write(xref_table(offsets))
+    buffer = BytesIO()
+    trailer.write_to_stream(buffer)
+    f.write(b"trailer\n" + buffer.getvalue() + b"\n")
+    f.write(f"startxref\n{xref_offset}\n%%EOF\n".encode("ascii"))
+
+
+class StreamWriter:
+    """
+    边处理边写出的PDF写入器
+
+    对象在 write() 时立即序列化到文件，只保留每个对象的偏移量（按编号存放在整数数组
+    中，几十万个对象也只占几MB内存）。
+    """
+
+    def __init__(self, f):
+        self.file = f
+        self.offsets = array("q", [-1])  # 下标为对象编号，-1 表示未写出
+        self.shared_streams = {}  # 内容指纹 -> 已写出的流对象引用，供 ObjectCopier 去重
+        f.write(PDF_HEADER)
+
+    @property
+    def next_number(self):
+        return len(self.offsets)
+
+    def allocate(self):
+        """分配一个对象编号，返回其引用"""
+        ref = IndirectObject(len(self.offsets), 0, None)
+        self.offsets.append(-1)
+        return ref
+
+    def write(self, ref, obj):
+        """写出 ref 对应的对象"""
+        self.offsets[ref.idnum] = self.file.tell()
+        self.file.write(serialize_object(ref.idnum, 0, obj))
+
+    def add(self, obj):
+        """分配编号并写出对象，返回其引用"""
+        ref = self.allocate()
+        self.write(ref, obj)
+        return ref
+
+    def finish(self, root_ref):
+        """写入交叉引用表和 trailer"""
+        trailer = DictionaryObject(
+            {
+                NameObject("/Size"): NumberObject(self.next_number),
+                NameObject("/Root"): root_ref,
+            }
+        )
+        # 逐段写出交叉引用表，不在内存中拼出整个表
+        f = self.file
+        xref_offset = f.tell()
+        f.write(b"xref\n0 1\n0000000000 65535 f\r\n")
+        number = 1
+        while number < len(self.offsets):
+            if self.offsets[number] < 0:
+                number += 1
+                continue
+            end = number
+            while end < len(self.offsets) and self.offsets[end] >= 0:
+                end += 1
+            f.write(f"{number} {end - number}\n".encode("ascii"))
+            f.write(
+                b"".join(
+                    f"{self.offsets[n]:010d} 00000 n\r\n".encode("ascii")
+                    for n in range(number, end)
+                )
+            )
+            number = end
+        write_trailer(f, trailer, None, xref_offset)
+
+
+class _NotShareable(Exception):
+    """对象（间接）引用了页面或存在循环引用，不参与去重"""
+
+
+class ObjectCopier:
+    """
+    把一个来源文档中的对象复制到 StreamWriter
+
+    每个来源对象只复制一次；flush() 写出所有已引用但尚未写出的对象，之后即可释放
+    来源文档。页面要先用 reserve() 分配编号，没有预留的页面和页面树节点不复制。
+
+    dedup 为 True 时，流对象（字体、图片、ICC 配置等）按内容指纹去重：内容和引用的
+    所有对象都相同的流只写出一次，之后复制的文档直接引用已写出的对象。指纹在 flush()
+    写出所有待写出的对象之后才加入 writer.shared_streams，复制中途出错时其他文档不会
+    引用没有写出的对象。
+    """
+
+    def __init__(self, writer, dedup=False):
+        self.writer = writer
+        self.dedup = dedup
+        self._refs = {}  # (对象编号, 代数) -> 新引用
+        self._pending = []
+        self._fingerprints = {}  # (对象编号, 代数) -> 内容指纹
+        self._staged = {}  # 本次 flush 前新分配的流：内容指纹 -> 新引用
+
+    def reserve(self, source_ref, ref=None):
+        """
+        预先为来源对象分配编号，由调用方自己写出（如页面对象）
+
+        ref 指定时使用已有的编号，如增量更新中替换原文件的页面对象。
+        """
+        if ref is None:
+            ref = self.writer.allocate()
+        self._refs[(source_ref.idnum, source_ref.generation)] = ref
+        return ref
+
+    def copy(self, obj):
+        """复制对象，其中引用的间接对象加入待写出列表"""
+        return copy_object(obj, self._map_ref)
+
+    def flush(self):
+        """写出所有待写出的对象"""
+        while self._pending:
+            source_ref, ref = self._pending.pop()
+            self.writer.write(ref, self.copy(source_ref.get_object()))
+        self.writer.shared_streams.update(self._staged)
+        self._staged.clear()
+
+    def _map_ref(self, source_ref):
+        key = (source_ref.idnum, source_ref.generation)
+        if key not in self._refs:
+            obj = source_ref.get_object()
+            if isinstance(obj, DictionaryObject) and obj.get("/Type") in (
+                "/Page",
+                "/Pages",
+            ):
+                # 页面只通过 reserve 复制；指向未复制页面的引用（链接目标、批注的 /P
+                # 等）置为 null，不会把整个页面树带进来
+                return NullObject()
+            fingerprint = self._stream_fingerprint(source_ref) if self.dedup else None
+            shared = self.writer.shared_streams.get(fingerprint)
+            if shared is None:
+                shared = self._staged.get(fingerprint)
+            if fingerprint is not None and shared is not None:
+                self._refs[key] = shared
+            else:
+                self._refs[key] = self.writer.allocate()
+                self._pending.append((source_ref, self._refs[key]))
+                if fingerprint is not None:
+                    self._staged[fingerprint] = self._refs[key]
+        return self._refs[key]
+
+    def _stream_fingerprint(self, source_ref):
+        """返回流对象的内容指纹，不是流对象或不能去重时返回 None"""
+        if not isinstance(source_ref.get_object(), StreamObject):
+            return None
+        try:
+            return self._fingerprint(source_ref, set())
+        except _NotShareable:
+            return None
+
+    def _fingerprint(self, obj, visiting):
+        """计算对象内容的哈希，间接引用按所指对象的内容计算"""
+        if isinstance(obj, IndirectObject):
+            key = (obj.idnum, obj.generation)
+            if key not in self._fingerprints:
+                if key in visiting:
+                    raise _NotShareable()
+                visiting.add(key)
+                self._fingerprints[key] = self._fingerprint(obj.get_object(), visiting)
+                visiting.discard(key)
+            return self._fingerprints[key]
+
+        digest = hashlib.sha256()
+        if isinstance(obj, DictionaryObject):
+            if obj.get("/Type") in ("/Page", "/Pages"):
+                raise _NotShareable()
+            if isinstance(obj, StreamObject):
+                digest.update(b"S%d:" % len(obj._data))
+                digest.update(obj._data)
+            digest.update(b"D")
+            for name in sorted(obj):
+                digest.update(name.encode("utf-8"))
+                digest.update(self._fingerprint(obj.raw_get(name), visiting))
+        elif isinstance(obj, ArrayObject):
+            digest.update(b"A")
+            for value in obj:
+                digest.update(self._fingerprint(value, visiting))
+        else:
+            buffer = BytesIO()
+            (obj if obj is not None else NullObject()).write_to_stream(buffer)
+            digest.update(type(obj).__name__.encode("ascii"))
+            digest.update(buffer.getvalue())
+        return digest.digest()
@@ -0,0 +1,175 @@
+"""
+PDF页面替换
+
+默认按页面组装计划重写整个文档（见 plan 模块）。incremental 方式用增量更新只替换
+需要替换的页面：被替换页面的对象编号不变，原文件内容保留，只在文件末尾追加新的页面
+字典、它们引用的对象和新的交叉引用表；页面树中指向这些页面的项自然指向新的页面。
+读写量只与替换的页面有关，原页面的内容仍留在文件中（不再被引用）。
+"""
+
+from pypdf.generic import DictionaryObject, NameObject
+
+from .common import check_input_file
+from .doccache import borrow_reader
+from .docinfo import page_count
+from .errors import PageRangeError
+from .incremental import IncrementalUpdate
+from .pages import PageSet
+from .plan import PagePlan, set_inheritable_defaults
+from .rawpdf import ObjectCopier
+
+# 输出方式：rewrite（重写整个文档）或 incremental（增量更新）
+REPLACE_MODES = ("rewrite", "incremental")
+
+
+def replace_pdf(target_file, replace_file, output_path, method="single",
+                position=1, target_range="", source_range="", mode="rewrite",
+                progress=None):
+    """
+    用另一个PDF的页面替换目标PDF中的页面
+
+    Args:
+        target_file: 目标（被替换页面的）文件路径
+        replace_file: 用来替换的文件路径
+        output_path: 输出文件路径
+        method: 替换方式，single（单个页面）或 multi（多个页面）
+        position: 替换单个页面时被替换的页码（1基索引）
+        target_range: 替换多个页面时被替换的页码范围
+        source_range: 替换文件的页码范围，为空则使用全部页面
+        mode: 输出方式，rewrite（重写整个文档）或 incremental（增量更新，只追加
+            替换的页面，适合替换大文件中的少数页面；目标文件不能加密）
+        progress: 进度回调 progress(已处理页数, 总页数)
+
+    Returns:
+        str: 输出文件路径
+
+    Raises:
+        PageRangeError: 页码无效或替换页数不匹配
+    """
+    if mode not in REPLACE_MODES:
+        raise ValueError(f"未知的替换输出方式：{mode}")
+    check_input_file(target_file, "目标文件")
+    check_input_file(replace_file, "替换文件")
+    target_total_pages = page_count(target_file)
+    replace_map = build_replace_map(
+        target_total_pages, page_count(replace_file),
+        method, position, target_range, source_range,
+    )
+    if mode == "incremental":
+        with borrow_reader(replace_file, "替换文件") as replace_reader:
+            return replace_incremental(
+                target_file, replace_reader, replace_map, output_path, progress
+            )
+
+    plan = replace_plan(target_file, replace_file, target_total_pages, replace_map)
+    return plan.execute(output_path, progress=progress)["output_path"]
+
+
+def replace_plan(target_file, replace_file, target_total_pages, replace_map):
+    """
+    替换的页面组装计划
+
+    Args:
+        target_file: 目标文件路径
+        replace_file: 替换文件路径
+        target_total_pages: 目标文件的页数
+        replace_map: build_replace_map 的结果
+
+    Returns:
+        PagePlan: 页面组装计划，相邻的未替换页面和替换页面分别合并成段
+    """
+    plan = PagePlan()
+    next_page = 1
+    for page_num in sorted(replace_map):
+        plan.add(target_file, (next_page, page_num - 1), label="目标文件")
+        source_page = replace_map[page_num]
+        plan.add(replace_file, (source_page, source_page), label="替换文件")
+        next_page = page_num + 1
+    plan.add(target_file, (next_page, target_total_pages), label="目标文件")
+    return plan
+
+
+def replace_incremental(target_file, replace_reader, replace_map, output_path,
+                        progress=None):
+    """
+    以增量更新方式替换页面
+
+    output_path 与目标文件相同时直接追加到目标文件末尾。
+
+    Args:
+        target_file: 目标文件路径
+        replace_reader: 替换文件的 pypdf.PdfReader，只读取不修改
+        replace_map: build_replace_map 的结果
+        output_path: 输出文件路径
+        progress: 进度回调 progress(已处理页数, 总页数)
+
+    Returns:
+        str: 输出文件路径
+
+    Raises:
+        InputFileError: 目标文件已加密或无法读取
+    """
+    with IncrementalUpdate(target_file, "目标文件") as update:
+        replacements = []
+        reserved = set()
+        copier = ObjectCopier(update)
+        for target_num, source_num in sorted(replace_map.items()):
+            # 只查找被替换的页面，不加载目标文件的整个页面树
+            target_ref, parent_ref = update.find_page(target_num - 1)
+            source_page = replace_reader.pages[source_num - 1]
+            replacements.append((target_ref, parent_ref, source_page))
+            # 替换页面之间的链接指向替换后的页面；同一页面用到多次时指向第一次
+            source_ref = source_page.indirect_reference
+            if source_ref is not None and source_num not in reserved:
+                reserved.add(source_num)
+                copier.reserve(source_ref, target_ref)
+
+        for index, (target_ref, parent_ref, source_page) in enumerate(replacements):
+            page_dict = copier.copy(
+                DictionaryObject(
+                    {
+                        name: value
+                        for name, value in source_page.items()
+                        if name not in ("/Parent", "/StructParents")
+                    }
+                )
+            )
+            page_dict[NameObject("/Parent")] = parent_ref
+            set_inheritable_defaults(page_dict)
+            update.update_object(target_ref, page_dict)
+            copier.flush()
+            if progress:
+                progress(index + 1, len(replacements))
+
+        return update.save(output_path)
+
+
+def build_replace_map(target_total_pages, replace_total_pages, method="single",
+                      position=1, target_range="", source_range=""):
+    """
+    计算替换映射
+
+    Returns:
+        dict: {被替换页码: 替换页码}，均为1基索引
+
+    Raises:
+        PageRangeError: 页码无效或替换页数不匹配
+    """
+    source_pages = PageSet.parse(source_range, replace_total_pages)
+
+    if method == "single":
+        replace_position = int(position)
+        if replace_position < 1 or replace_position > target_total_pages:
+            raise PageRangeError(f"替换位置超出范围（1-{target_total_pages}）！")
+        if len(source_pages) != 1:
+            raise PageRangeError("替换单个页面时，替换文件只能指定一个页面！")
+        return {replace_position: source_pages.first()}
+
+    if not target_range or not target_range.strip():
+        raise PageRangeError("请输入被替换的页码范围！")
+    target_pages = PageSet.parse(target_range, target_total_pages)
+    if len(target_pages) != len(source_pages):
+        raise PageRangeError(
+            f"被替换页数({len(target_pages)})与替换页数({len(source_pages)})不匹配！"
+        )
+    return dict(zip(target_pages, source_pages))
@@ -0,0 +1,86 @@
+"""
+PDF拆分
+"""
+
+import os
+
+import pypdf
+
+from .common import remove_files, write_pdf
+from .doccache import borrow_reader
+from .errors import PageRangeError
+from .pages import PageSet
+
+
+def split_pdf(input_file, output_dir, name_prefix, method="single",
+              pages_per_file=2, range_str="", progress=None):
+    """
+    拆分PDF文件
+
+    Args:
+        input_file: 输入文件路径
+        output_dir: 输出目录
+        name_prefix: 输出文件名前缀（按范围拆分时即为完整文件名，不含后缀）
+        method: 拆分方式，single（单页）、pages（按页数）或 range（按范围）
+        pages_per_file: 按页数拆分时每个文件的页数
+        range_str: 按范围拆分时的页码范围，如 "1-3,5"
+        progress: 进度回调 progress(已处理页数, 总页数)
+
+    Returns:
+        list: 生成的文件路径列表
+
+    Raises:
+        PageRangeError: 拆分参数无效
+    """
+    with borrow_reader(input_file) as reader:
+        total_pages = len(reader.pages)
+
+        if method == "single":
+            return _split_by_pages(reader, output_dir, name_prefix, 1, "page", progress)
+        if method == "pages":
+            if pages_per_file < 1:
+                raise PageRangeError("每个文件的页数必须大于0！")
+            return _split_by_pages(
+                reader, output_dir, name_prefix, pages_per_file, "part", progress
+            )
+        if method == "range":
+            if not range_str or not range_str.strip():
+                raise PageRangeError("请输入页码范围！")
+            page_numbers = PageSet.parse(range_str, total_pages)
+            writer = pypdf.PdfWriter()
+            for i, page_num in enumerate(page_numbers):
+                writer.add_page(reader.pages[page_num - 1])
+                if progress:
+                    progress(i + 1, len(page_numbers))
+            output_path = os.path.join(output_dir, f"{name_prefix}.pdf")
+            return [write_pdf(writer, output_path)]
+
+        raise ValueError(f"未知的拆分方式：{method}")
+
+
+def _split_by_pages(reader, output_dir, name_prefix, pages_per_file, suffix,
+                    progress=None):
+    """按固定页数拆分，文件名形如 前缀_page_1.pdf 或 前缀_part_1.pdf"""
+    total_pages = len(reader.pages)
+    outputs = []
+
+    try:
+        for file_index, start in enumerate(range(0, total_pages, pages_per_file), 1):
+            end = min(start + pages_per_file, total_pages)
+            writer = pypdf.PdfWriter()
+            for i in range(start, end):
+                writer.add_page(reader.pages[i])
+
+            output_path = os.path.join(
+                output_dir, f"{name_prefix}_{suffix}_{file_index}.pdf"
+            )
+            outputs.append(write_pdf(writer, output_path))
+
+            if progress:
+                progress(end, total_pages)
+    except BaseException:
+        # 出错或取消时删除已生成的部分文件
+        remove_files(outputs)
+        raise
+
+    return outputs
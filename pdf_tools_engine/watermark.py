@@ -0,0 +1,731 @@
+"""
+PDF水印
+
+文字水印和图片水印都先用 reportlab 绘制一页水印PDF，再合并到原页面上。
+
+水印样式 style：
+    repeat   平铺，逐个绘制每个水印，内容大小随页面面积增长
+    pattern  平铺图案，单个水印只定义一次为PDF平铺图案并填充整页，内容大小固定
+    single   单个水印
+"""
+
+import math
+import os
+from collections import OrderedDict
+from io import BytesIO
+
+import pypdf
+from PIL import Image
+from pypdf.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    FloatObject,
+    IndirectObject,
+    NameObject,
+    NumberObject,
+)
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen import canvas
+
+from .common import check_input_file, open_reader, write_pdf
+from .errors import WatermarkError
+from .fonts import get_font_index, load_font_index, register_chinese_fonts
+from .incremental import IncrementalUpdate
+from .parallel import run_page_parallel
+
+# 文字水印默认颜色（灰色）和不透明度
+TEXT_COLOR = (0.5, 0.5, 0.5)
+TEXT_ALPHA = 0.2
+
+
+class OverlayCache:
+    """
+    水印页缓存
+
+    水印页只取决于页面尺寸和水印参数，相同键的水印页只绘制、解析一次，之后直接复用
+    解析好的 PageObject。键由调用方构造，需包含页面尺寸、文字或图片、字体、字号、
+    颜色、透明度、旋转角度等所有影响绘制结果的参数。
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._pages = OrderedDict()
+
+    def get(self, key, render):
+        """
+        获取水印页，不存在时调用 render() 生成
+
+        Args:
+            key: 缓存键
+            render: 无参函数，返回水印PDF的字节内容
+
+        Returns:
+            pypdf.PageObject: 水印页
+        """
+        page = self._pages.get(key)
+        if page is not None:
+            self.hits += 1
+            self._pages.move_to_end(key)
+            return page
+
+        self.misses += 1
+        page = pypdf.PdfReader(BytesIO(render())).pages[0]
+        self._pages[key] = page
+        if len(self._pages) > self.max_entries:
+            self._pages.popitem(last=False)
+        return page
+
+
+def _page_size(page):
+    """返回用作缓存键的页面尺寸"""
+    return float(page.mediabox.width), float(page.mediabox.height)
+
+
+class MergeStamper:
+    """逐页合并方式盖水印：把水印页内容复制到每个页面的内容流中"""
+
+    def __init__(self, writer):
+        self.writer = writer
+
+    def stamp(self, page, watermark_page, key):
+        """给页面加水印并添加到输出文档"""
+        page.merge_page(watermark_page)
+        self.writer.add_page(page)
+
+
+class XObjectStamper:
+    """
+    共享 Form XObject 方式盖水印
+
+    每种水印页只作为 Form XObject 写入输出文件一次，各页面只在内容流末尾追加一个
+    很小的 "q ... Do Q" 引用，避免每页复制一份水印内容和图片。
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+        self._forms = {}  # 缓存键 -> (资源名称, XObject引用)
+        self._tails = {}  # (资源名称, x, y) -> 追加在页面末尾的内容流引用
+        self._head = None  # 所有页面共用的 "q" 内容流引用
+
+    def stamp(self, page, watermark_page, key):
+        """给页面加水印并添加到输出文档"""
+        writer_page = self._output_page(page)
+        name, form_ref = self._form(watermark_page, key)
+
+        # 资源字典可能被多个页面共用，复制一份再添加水印引用
+        resources = writer_page.get("/Resources")
+        resources = (
+            DictionaryObject(resources.get_object())
+            if resources is not None
+            else DictionaryObject()
+        )
+        xobjects = resources.get("/XObject")
+        xobjects = (
+            DictionaryObject(xobjects.get_object())
+            if xobjects is not None
+            else DictionaryObject()
+        )
+        # 页面中已有同名资源（如之前加过的水印）时换一个名称
+        while xobjects.get(name, form_ref) != form_ref:
+            name += "_"
+        xobjects[NameObject(name)] = form_ref
+        resources[NameObject("/XObject")] = xobjects
+        writer_page[NameObject("/Resources")] = resources
+
+        # 原内容流前后分别加 q 和 Q，再追加水印引用
+        contents = ArrayObject([self._head_ref()])
+        original = writer_page.get("/Contents")
+        if original is not None:
+            resolved = original.get_object()
+            if isinstance(resolved, ArrayObject):
+                contents.extend(resolved)
+            elif isinstance(original, IndirectObject):
+                contents.append(original)
+            else:
+                contents.append(self._add_object(resolved))
+        x, y = float(page.mediabox.left), float(page.mediabox.bottom)
+        contents.append(self._tail_ref(name, x, y))
+        writer_page[NameObject("/Contents")] = contents
+        return writer_page
+
+    def _output_page(self, page):
+        """返回输出文档中对应的页面"""
+        return self.writer.add_page(page)
+
+    def _add_object(self, obj):
+        return self.writer._add_object(obj)
+
+    def _import(self, obj):
+        """把水印页中的对象复制到输出文档"""
+        return obj.clone(self.writer)
+
+    def _form(self, watermark_page, key):
+        """返回水印页对应的 (资源名称, Form XObject引用)，首次使用时写入输出文档"""
+        if key not in self._forms:
+            form = DecodedStreamObject()
+            form.set_data(watermark_page.get_contents().get_data())
+            form.update(
+                {
+                    NameObject("/Type"): NameObject("/XObject"),
+                    NameObject("/Subtype"): NameObject("/Form"),
+                    NameObject("/BBox"): ArrayObject(watermark_page.mediabox),
+                    NameObject("/Resources"): self._import(
+                        watermark_page.raw_get("/Resources")
+                    ),
+                }
+            )
+            form_ref = self._add_object(form.flate_encode())
+            self._forms[key] = (f"/PdfToolsWm{len(self._forms)}", form_ref)
+        return self._forms[key]
+
+    def _head_ref(self):
+        if self._head is None:
+            self._head = self._add_content(b"q\n")
+        return self._head
+
+    def _tail_ref(self, name, x, y):
+        tail_key = (name, x, y)
+        if tail_key not in self._tails:
+            self._tails[tail_key] = self._add_content(
+                f"\nQ\nq 1 0 0 1 {x:g} {y:g} cm {name} Do Q\n".encode("ascii")
+            )
+        return self._tails[tail_key]
+
+    def _add_content(self, data):
+        stream = DecodedStreamObject()
+        stream.set_data(data)
+        return self._add_object(stream)
+
+
+class IncrementalStamper(XObjectStamper):
+    """
+    增量更新方式盖水印
+
+    与共享 Form XObject 方式相同，但不重写整个文档：只把水印 XObject、新的内容流和
+    修改后的页面字典追加到原文件末尾。
+    """
+
+    def _output_page(self, page):
+        # 复制页面字典，写出时替换原文件中的页面对象
+        writer_page = DictionaryObject(page)
+        self.writer.update_object(page.indirect_reference, writer_page)
+        return writer_page
+
+    def _add_object(self, obj):
+        return self.writer.add_object(obj)
+
+    def _import(self, obj):
+        return self.writer.import_object(obj)
+
+
+# 输出模式 -> 盖水印方式
+STAMPERS = {
+    "merge": MergeStamper,
+    "xobject": XObjectStamper,
+    "incremental": IncrementalStamper,
+}
+
+
+def _stamp_document(input_file, output_path, mode, page_indices, overlay_for,
+                    progress):
+    """
+    按输出模式给文档的页面加水印并写入输出文件
+
+    Args:
+        overlay_for: overlay_for(page) 返回 (水印页, 缓存键)
+        其他参数同 add_text_watermark
+
+    Returns:
+        str: 输出文件路径
+    """
+    if mode not in STAMPERS:
+        raise WatermarkError(f"未知的水印输出模式：{mode}")
+
+    if mode == "incremental":
+        output = IncrementalUpdate(input_file)
+        reader = output.reader
+    else:
+        reader = open_reader(input_file)
+        output = pypdf.PdfWriter()
+
+    try:
+        stamper = STAMPERS[mode](output)
+        if page_indices is None:
+            page_indices = range(len(reader.pages))
+        total_pages = len(page_indices)
+
+        for page_idx, page_index in enumerate(page_indices):
+            page = reader.pages[page_index]
+            watermark_page, key = overlay_for(page)
+            stamper.stamp(page, watermark_page, key)
+
+            if progress:
+                progress(page_idx + 1, total_pages)
+
+        if mode == "incremental":
+            return output.save(output_path)
+        return write_pdf(output, output_path)
+    finally:
+        if mode == "incremental":
+            output.close()
+
+
+def add_text_watermark(input_file, output_path, text, font_size=30,
+                       style="repeat", position="center", color=TEXT_COLOR,
+                       alpha=TEXT_ALPHA, rotation=None, mode="merge",
+                       overlay_cache=None, workers=1, page_indices=None,
+                       progress=None):
+    """
+    添加文字水印
+
+    Args:
+        input_file: 输入文件路径
+        output_path: 输出文件路径
+        text: 水印文字
+        font_size: 字体大小
+        style: repeat（平铺）、pattern（平铺图案）或 single（单个）
+        position: 单个水印的位置，如 center、top_left
+        color: 文字颜色 (r, g, b)，取值 0-1
+        alpha: 文字不透明度（0-1）
+        rotation: 旋转角度，None 表示平铺30度、单个45度
+        mode: 输出模式，merge（逐页合并）、xobject（共享 Form XObject，文件更小）
+            或 incremental（增量更新，只在原文件末尾追加，不使用多进程）
+        overlay_cache: 水印页缓存，None 表示只在本次调用内缓存
+        workers: 进程数，大于1时按页分块在多个进程中并行处理
+        page_indices: 只处理并输出这些页（0基索引），None 表示全部页面；
+            incremental 模式下只给这些页加水印，其他页面原样保留
+        progress: 进度回调 progress(已处理页数, 总页数)
+
+    Returns:
+        str: 输出文件路径
+    """
+    if not text:
+        raise WatermarkError("请输入水印文字！")
+    font_size = int(font_size)
+    if font_size <= 0:
+        raise WatermarkError("字体大小必须大于0！")
+    if rotation is None:
+        rotation = 45 if style == "single" else 30
+
+    if workers > 1 and page_indices is None and mode != "incremental":
+        # 字体索引在主进程中刷新一次、字体注册一次，工作进程只读取索引
+        get_font_index()
+        register_chinese_fonts(text)
+        return run_page_parallel(
+            add_text_watermark, input_file, output_path, workers, progress,
+            initializer=load_font_index, text=text, font_size=font_size,
+            style=style, position=position, color=color, alpha=alpha,
+            rotation=rotation, mode=mode,
+        )
+
+    font_name = register_chinese_fonts(text)
+    overlay_cache = overlay_cache if overlay_cache is not None else OverlayCache()
+    color = tuple(color)
+
+    def overlay_for(page):
+        width, height = _page_size(page)
+        key = (
+            "text", width, height, text, font_name, font_size, color, alpha,
+            rotation, style, position,
+        )
+        watermark_page = overlay_cache.get(
+            key,
+            lambda: render_text_overlay(
+                width, height, text, font_name, font_size, style, position,
+                color, alpha, rotation,
+            ),
+        )
+        return watermark_page, key
+
+    return _stamp_document(
+        input_file, output_path, mode, page_indices, overlay_for, progress
+    )
+
+
+def render_text_overlay(width, height, text, font_name, font_size,
+                        style="repeat", position="center", color=TEXT_COLOR,
+                        alpha=TEXT_ALPHA, rotation=30):
+    """
+    绘制一页文字水印
+
+    Returns:
+        bytes: 水印PDF内容
+    """
+    if style == "pattern":
+        # 图案单元：文字宽度加150、字号加100，与平铺水印间距一致
+        x_step = pdfmetrics.stringWidth(text, font_name, font_size) + 150
+        y_step = font_size + 100
+        tile = BytesIO()
+        tile_can = canvas.Canvas(tile, pagesize=(x_step, y_step))
+        tile_can.setFont(font_name, font_size)
+        tile_can.setFillColorRGB(*color, alpha=alpha)
+        tile_can.drawString(0, font_size * 0.25, text)
+        tile_can.save()
+        return render_pattern_overlay(
+            width, height, tile.getvalue(), x_step, y_step, rotation
+        )
+
+    packet = BytesIO()
+    can = canvas.Canvas(packet, pagesize=(width, height))
+    can.setFont(font_name, font_size)
+
+    # 设置颜色和透明度
+    can.setFillColorRGB(*color, alpha=alpha)
+
+    if style == "repeat":
+        draw_tiled_text_watermark(can, text, width, height, font_size, rotation)
+    else:
+        draw_single_text_watermark(
+            can, text, position, width, height, font_size, rotation
+        )
+
+    can.save()
+    return packet.getvalue()
+
+
+def add_image_watermark(input_file, output_path, image_path, opacity=0.2,
+                        scale_percent=50, rotation_angle=0, style="repeat",
+                        position="center", mode="merge", overlay_cache=None,
+                        image=None, workers=1, page_indices=None, progress=None):
+    """
+    添加图片水印
+
+    Args:
+        input_file: 输入文件路径
+        output_path: 输出文件路径
+        image_path: 水印图片路径
+        opacity: 不透明度（0-1）
+        scale_percent: 图片缩放百分比
+        rotation_angle: 旋转角度
+        style: repeat（平铺）、pattern（平铺图案）或 single（单个）
+        position: 单个水印的位置，如 center、top_left
+        mode: 输出模式，merge（逐页合并）、xobject（共享 Form XObject，文件更小）
+            或 incremental（增量更新，只在原文件末尾追加，不使用多进程）
+        overlay_cache: 水印页缓存，None 表示只在本次调用内缓存
+        image: 已用 prepare_watermark_image 处理好的图片，None 表示从 image_path 读取
+        workers: 进程数，大于1时按页分块在多个进程中并行处理
+        page_indices: 只处理并输出这些页（0基索引），None 表示全部页面；
+            incremental 模式下只给这些页加水印，其他页面原样保留
+        progress: 进度回调 progress(已处理页数, 总页数)
+
+    Returns:
+        str: 输出文件路径
+    """
+    if not image_path or not os.path.exists(image_path):
+        raise WatermarkError("请选择有效的水印图片！")
+
+    if workers > 1 and page_indices is None and mode != "incremental":
+        return run_page_parallel(
+            add_image_watermark, input_file, output_path, workers, progress,
+            image_path=image_path, opacity=opacity, scale_percent=scale_percent,
+            rotation_angle=rotation_angle, style=style, position=position,
+            mode=mode, image=image,
+        )
+
+    overlay_cache = overlay_cache if overlay_cache is not None else OverlayCache()
+    image_key = (
+        os.path.abspath(image_path), os.path.getmtime(image_path), scale_percent
+    )
+    image_reader = None
+
+    def render(width, height):
+        nonlocal image, image_reader
+        if image_reader is None:
+            # 直接使用内存中的图片，不写临时文件，多进程同时运行时互不干扰
+            if image is None:
+                image = prepare_watermark_image(image_path, scale_percent)
+            image_reader = ImageReader(image)
+        return render_image_overlay(
+            width, height, image_reader, opacity, rotation_angle, style, position
+        )
+
+    def overlay_for(page):
+        width, height = _page_size(page)
+        key = (
+            "image", width, height, image_key, opacity, rotation_angle,
+            style, position,
+        )
+        return overlay_cache.get(key, lambda: render(width, height)), key
+
+    return _stamp_document(
+        input_file, output_path, mode, page_indices, overlay_for, progress
+    )
+
+
+def render_image_overlay(width, height, image_reader, opacity=0.2,
+                         rotation_angle=0, style="repeat", position="center"):
+    """
+    绘制一页图片水印
+
+    Returns:
+        bytes: 水印PDF内容
+    """
+    img_width, img_height = image_reader.getSize()
+
+    if style == "pattern":
+        # 图案单元：图片尺寸加20%边距，与平铺水印间距一致
+        x_step = max(1, int(img_width * 1.2))
+        y_step = max(1, int(img_height * 1.2))
+        tile = BytesIO()
+        tile_can = canvas.Canvas(tile, pagesize=(x_step, y_step))
+        tile_can.setFillAlpha(opacity)
+        tile_can.drawImage(
+            image_reader, 0, 0, width=img_width, height=img_height, mask="auto"
+        )
+        tile_can.save()
+        return render_pattern_overlay(
+            width, height, tile.getvalue(), x_step, y_step, rotation_angle
+        )
+
+    packet = BytesIO()
+    can = canvas.Canvas(packet, pagesize=(width, height))
+
+    # 设置透明度
+    can.setFillAlpha(opacity)
+
+    if style == "repeat":
+        draw_tiled_image_watermark(
+            can, image_reader, width, height, img_width, img_height, rotation_angle
+        )
+    else:
+        draw_single_image_watermark(
+            can, image_reader, position, width, height, img_width, img_height,
+            rotation_angle,
+        )
+
+    can.save()
+    return packet.getvalue()
+
+
+def render_pattern_overlay(width, height, tile, x_step, y_step, rotation=0):
+    """
+    绘制一页用平铺图案填充的水印
+
+    tile 是单个图案单元的PDF（页面尺寸即单元尺寸）。单元内容只在图案中定义一次，
+    水印页的内容流只有一条填充整页矩形的指令，长度与页面大小无关。旋转通过图案
+    矩阵实现，整个平铺网格一起旋转。
+
+    Args:
+        width, height: 页面尺寸
+        tile: 图案单元PDF的字节内容
+        x_step, y_step: 图案单元的横向、纵向间距
+        rotation: 旋转角度
+
+    Returns:
+        bytes: 水印PDF内容
+    """
+    tile_page = pypdf.PdfReader(BytesIO(tile)).pages[0]
+    writer = pypdf.PdfWriter()
+    page = writer.add_blank_page(width, height)
+
+    radians = math.radians(rotation)
+    cos, sin = round(math.cos(radians), 6), round(math.sin(radians), 6)
+    pattern = DecodedStreamObject()
+    pattern.set_data(tile_page.get_contents().get_data())
+    pattern.update(
+        {
+            NameObject("/Type"): NameObject("/Pattern"),
+            NameObject("/PatternType"): NumberObject(1),
+            NameObject("/PaintType"): NumberObject(1),  # 单元自带颜色
+            NameObject("/TilingType"): NumberObject(1),
+            NameObject("/BBox"): ArrayObject(
+                [FloatObject(v) for v in (0, 0, x_step, y_step)]
+            ),
+            NameObject("/XStep"): FloatObject(x_step),
+            NameObject("/YStep"): FloatObject(y_step),
+            NameObject("/Matrix"): ArrayObject(
+                [FloatObject(v) for v in (cos, sin, -sin, cos, 0, 0)]
+            ),
+            NameObject("/Resources"): tile_page["/Resources"]
+            .get_object()
+            .clone(writer),
+        }
+    )
+    pattern_ref = writer._add_object(pattern.flate_encode())
+
+    page[NameObject("/Resources")] = DictionaryObject(
+        {
+            NameObject("/Pattern"): DictionaryObject(
+                {NameObject("/PdfToolsP0"): pattern_ref}
+            )
+        }
+    )
+    content = DecodedStreamObject()
+    content.set_data(
+        f"q /Pattern cs /PdfToolsP0 scn 0 0 {width:g} {height:g} re f Q\n".encode(
+            "ascii"
+        )
+    )
+    page[NameObject("/Contents")] = writer._add_object(content)
+
+    packet = BytesIO()
+    writer.write(packet)
+    return packet.getvalue()
+
+
+def prepare_watermark_image(image_path, scale_percent=50):
+    """
+    读取水印图片，去除透明通道并按比例缩放
+
+    Args:
+        image_path: 图片路径
+        scale_percent: 缩放百分比
+
+    Returns:
+        PIL.Image.Image: 处理后的RGB图片
+    """
+    check_input_file(image_path, "水印图片")
+    try:
+        img = Image.open(image_path)
+        img.load()
+    except Exception as e:
+        raise WatermarkError(f"无法读取水印图片：{e}") from e
+
+    # 如果是RGBA模式，转换为RGB
+    if img.mode in ("RGBA", "LA", "P"):
+        if img.mode == "P":
+            img = img.convert("RGBA")
+
+        # 创建白色背景
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        if img.mode == "RGBA":
+            background.paste(img, mask=img.split()[-1])
+        else:  # LA
+            background.paste(img, mask=img.split()[0])
+        img = background
+
+    # 调整图片大小
+    if scale_percent != 100:
+        scale_factor = scale_percent / 100.0
+        new_width = max(1, int(img.width * scale_factor))
+        new_height = max(1, int(img.height * scale_factor))
+        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+
+    return img
+
+
+def draw_tiled_image_watermark(can, image_reader, page_width, page_height,
+                               img_width, img_height, rotation_angle=0):
+    """绘制平铺图片水印"""
+    # 计算间距（图片宽度+20%的边距）
+    x_spacing = max(1, int(img_width * 1.2))
+    y_spacing = max(1, int(img_height * 1.2))
+
+    for i in range(-x_spacing, int(page_width) + x_spacing, x_spacing):
+        for j in range(-y_spacing, int(page_height) + y_spacing, y_spacing):
+            can.saveState()
+
+            # 移动到中心位置
+            center_x = i + img_width / 2
+            center_y = j + img_height / 2
+
+            # 应用旋转
+            if rotation_angle != 0:
+                can.translate(center_x, center_y)
+                can.rotate(rotation_angle)
+                can.translate(-center_x, -center_y)
+
+            # 绘制图片
+            can.drawImage(
+                image_reader, i, j, width=img_width, height=img_height, mask="auto"
+            )
+
+            can.restoreState()
+
+
+def draw_single_image_watermark(can, image_reader, position, page_width,
+                                page_height, img_width, img_height,
+                                rotation_angle=0):
+    """绘制单个图片水印"""
+    # 根据位置计算坐标
+    if position == "top_left":
+        x = page_width * 0.05
+        y = page_height - img_height - page_height * 0.05
+    elif position == "top_right":
+        x = page_width - img_width - page_width * 0.05
+        y = page_height - img_height - page_height * 0.05
+    elif position == "bottom_left":
+        x = page_width * 0.05
+        y = page_height * 0.05
+    elif position == "bottom_right":
+        x = page_width - img_width - page_width * 0.05
+        y = page_height * 0.05
+    else:  # 默认居中
+        x = (page_width - img_width) / 2
+        y = (page_height - img_height) / 2
+
+    can.saveState()
+
+    # 如果需要旋转
+    if rotation_angle != 0:
+        # 移动到图片中心
+        center_x = x + img_width / 2
+        center_y = y + img_height / 2
+
+        can.translate(center_x, center_y)
+        can.rotate(rotation_angle)
+        can.translate(-center_x, -center_y)
+
+    # 绘制图片
+    can.drawImage(image_reader, x, y, width=img_width, height=img_height, mask="auto")
+
+    can.restoreState()
+
+
+def draw_tiled_text_watermark(can, text, page_width, page_height, font_size,
+                              rotation=30):
+    """绘制平铺文字水印，颜色和透明度沿用画布当前的填充设置"""
+    # 计算间距
+    text_width = can.stringWidth(text, can._fontname, can._fontsize)
+    x_spacing = int(text_width + 150)
+    y_spacing = int(font_size + 100)
+
+    # 绘制网格
+    for i in range(-x_spacing, int(page_width) + x_spacing, x_spacing):
+        for j in range(-y_spacing, int(page_height) + y_spacing, y_spacing):
+            can.saveState()
+            can.translate(i, j)
+            can.rotate(rotation)
+            can.drawString(0, 0, text)
+
+            can.restoreState()
+
+
+def draw_single_text_watermark(can, text, position, page_width, page_height,
+                               font_size, rotation=45):
+    """绘制单个文字水印"""
+    # 位置映射
+    positions = {
+        "center": (page_width / 2, page_height / 2, True),
+        "top_left": (page_width * 0.2, page_height * 0.8, False),
+        "top_right": (page_width * 0.8, page_height * 0.8, False),
+        "bottom_left": (page_width * 0.2, page_height * 0.2, False),
+        "bottom_right": (page_width * 0.8, page_height * 0.2, False),
+    }
+
+    x, y, centered = positions.get(position, (page_width / 2, page_height / 2, True))
+
+    can.saveState()
+    can.translate(x, y)
+    can.rotate(rotation)
+
+    # 文字居中
+    text_width = can.stringWidth(text, can._fontname, can._fontsize)
+    x_offset = -text_width / 2 if centered else 0
+
+    # 可选：添加边框
+    can.setStrokeColorRGB(0.3, 0.3, 0.3, alpha=0.1)
+    can.setLineWidth(0.5)
+    can.rect(
+        x_offset - 5, -font_size / 2 - 5, text_width + 10, font_size + 10,
+        stroke=1, fill=0,
+    )
+
+    # 绘制文字
+    can.drawString(x_offset, 0, text)
+
+    can.restoreState()
@@ -0,0 +1,129 @@
+"""
+批量添加水印
+
+同一个水印批量加到一个文件夹或一组文件上。字体在主进程中选择并注册一次、图片只解码
+缩放一次，水印页缓存在同一进程处理的所有文档间共享；多个文档在不同进程中同时处理，
+每个输入文件对应一个输出文件。
+
+fork 启动的工作进程直接继承主进程注册的字体；spawn 启动（Windows）时 reportlab 的
+字体对象无法传给子进程，每个工作进程按索引重新解析选中的那一个字体文件。
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .common import batch_output_paths, list_pdf_files
+from .errors import OperationCancelled, WatermarkError
+from .fonts import get_font_index, load_font_index, register_chinese_fonts
+from .watermark import (
+    OverlayCache,
+    add_image_watermark,
+    add_text_watermark,
+    prepare_watermark_image,
+)
+
+# 当前工作进程的水印函数、参数和水印页缓存，由 _init_worker 设置
+_worker_func = None
+_worker_options = None
+_worker_cache = None
+
+
+def watermark_files(inputs, output_dir, watermark_type="text",
+                    suffix="_watermarked", workers=None, progress=None, **options):
+    """
+    批量添加水印
+
+    Args:
+        inputs: 文件夹路径或PDF文件路径列表
+        output_dir: 输出文件夹，输出文件名为 原文件名+suffix.pdf
+        watermark_type: text（文字水印）或 image（图片水印）
+        suffix: 输出文件名后缀
+        workers: 同时处理的文档数，默认等于CPU核数；为1时在当前进程内顺序处理
+        progress: 进度回调 progress(已完成文件数, 总文件数)
+        **options: 传给 add_text_watermark 或 add_image_watermark 的水印参数
+
+    Returns:
+        dict: outputs 为 {输入文件: 输出文件}，errors 为 {输入文件: 错误信息}
+    """
+    if watermark_type == "text":
+        func = add_text_watermark
+        if not options.get("text"):
+            raise WatermarkError("请输入水印文字！")
+    elif watermark_type == "image":
+        func = add_image_watermark
+        image_path = options.get("image_path")
+        if not image_path or not os.path.exists(image_path):
+            raise WatermarkError("请选择有效的水印图片！")
+        # 图片在主进程中只处理一次，工作进程直接使用处理好的图片
+        options["image"] = prepare_watermark_image(
+            image_path, options.get("scale_percent", 50)
+        )
+    else:
+        raise WatermarkError(f"未知的水印类型：{watermark_type}")
+
+    jobs = batch_output_paths(list_pdf_files(inputs), output_dir, suffix)
+    if func is add_text_watermark:
+        # 字体索引在主进程中刷新一次、字体注册一次，工作进程只读取索引
+        get_font_index()
+        register_chinese_fonts(options["text"])
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    outputs = {}
+    errors = {}
+
+    def record(input_file, error):
+        if error is None:
+            outputs[input_file] = jobs[input_file]
+        else:
+            errors[input_file] = error
+        if progress:
+            progress(len(outputs) + len(errors), len(jobs))
+
+    if workers == 1:
+        _init_worker(func, options)
+        for input_file, output_path in jobs.items():
+            record(input_file, _watermark_one(input_file, output_path))
+        return {"outputs": outputs, "errors": errors}
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(func, options)
+    )
+    try:
+        futures = {
+            pool.submit(_watermark_one, input_file, output_path): input_file
+            for input_file, output_path in jobs.items()
+        }
+        for future in as_completed(futures):
+            record(futures[future], future.result())
+    finally:
+        # 出错或取消时不再等待未开始的文件
+        pool.shutdown(wait=True, cancel_futures=True)
+    return {"outputs": outputs, "errors": errors}
+
+
+def _init_worker(func, options):
+    """初始化工作进程：注册字体，创建本进程共享的水印页缓存"""
+    global _worker_func, _worker_options, _worker_cache
+    if func is add_text_watermark:
+        load_font_index()
+        register_chinese_fonts(options["text"])
+    _worker_func = func
+    _worker_options = options
+    _worker_cache = OverlayCache()
+
+
+def _watermark_one(input_file, output_path):
+    """
+    给一个文件添加水印，单个文件失败不影响其他文件
+
+    Returns:
+        str: 错误信息，成功时为 None
+    """
+    try:
+        _worker_func(
+            input_file, output_path, overlay_cache=_worker_cache, **_worker_options
+        )
+        return None
+    except OperationCancelled:
+        raise
+    except Exception as e:
+        return str(e)
@@ -0,0 +1,358 @@
+import tkinter as tk
+from tkinter import ttk
+import tkinter.font as tkfont
+import os
+from array import array
+
+# 页数数组中的特殊值
+COUNT_UNKNOWN = -1  # 尚未读取
+COUNT_LOADING = -2  # 正在后台读取
+COUNT_ERROR = -3  # 读取失败，错误信息在 errors 中
+
+# 页数列宽度（像素）
+PAGE_COLUMN_WIDTH = 90
+
+
+class VirtualFileList(ttk.Frame):
+    """
+    虚拟化的文件列表，用于合并页面
+
+    只绘制当前可见的几行，几万个文件也能流畅滚动。数据保存在紧凑的数组中：
+    paths 为文件路径，counts 为页数（array，下标与 paths 对应），order 为当前排列顺序，
+    view 为筛选后显示的行（都是 paths 的下标）。排序、筛选和移动只重排下标数组。
+
+    页数按需读取：某一行第一次显示时才通过 count_loader 在后台读取。
+    """
+
+    def __init__(self, parent, count_loader, font=None, height=6):
+        """
+        Args:
+            parent: 父级框架
+            count_loader: 读取页数的函数 count_loader(路径列表, 回调)，回调为
+                回调(序号, 页数, 错误)；返回可以 cancel() 的任务对象
+            font: 列表字体
+            height: 初始显示的行数
+        """
+        super().__init__(parent)
+        self.count_loader = count_loader
+        if font:
+            self.font = tkfont.Font(font=font)
+        else:
+            self.font = tkfont.nametofont("TkDefaultFont")
+        self.row_height = self.font.metrics("linespace") + 4
+
+        self.paths = []
+        self.names = []
+        self.counts = array("l")
+        self.errors = {}
+        self.order = array("l")
+        self.view = array("l")
+        self.selection = set()
+        self.filter_text = ""
+        self.sort_key = None
+        self.top = 0  # 第一行可见行在 view 中的位置
+        self._anchor = None
+        self._jobs = []
+        self._redraw_pending = False
+
+        # 表头：点击按该列排序
+        header = ttk.Frame(self)
+        header.pack(fill=tk.X)
+        self.count_header = ttk.Button(
+            header, text="页数", width=8, command=lambda: self.sort_by("count")
+        )
+        self.count_header.pack(side=tk.LEFT)
+        self.name_header = ttk.Button(
+            header, text="文件名", command=lambda: self.sort_by("name")
+        )
+        self.name_header.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        body = ttk.Frame(self)
+        body.pack(fill=tk.BOTH, expand=True)
+        self.canvas = tk.Canvas(
+            body,
+            height=height * self.row_height,
+            background="white",
+            highlightthickness=1,
+            highlightbackground="#a0a0a0",
+            takefocus=1,
+        )
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self.yview)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.canvas.bind("<Configure>", lambda event: self.redraw())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Shift-Button-1>", self._on_shift_click)
+        self.canvas.bind("<Control-Button-1>", self._on_control_click)
+        self.canvas.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-4>", lambda event: self.yview("scroll", -3, "units"))
+        self.canvas.bind("<Button-5>", lambda event: self.yview("scroll", 3, "units"))
+        self.canvas.bind("<Delete>", lambda event: self.remove_selected())
+
+    def __len__(self):
+        return len(self.paths)
+
+    def set_files(self, files):
+        """替换列表中的所有文件"""
+        for job in self._jobs:
+            job.cancel()
+        self._jobs = []
+        self.paths = list(files)
+        self.names = [os.path.basename(path) for path in self.paths]
+        self.counts = array("l", [COUNT_UNKNOWN]) * len(self.paths)
+        self.errors = {}
+        self.order = array("l", range(len(self.paths)))
+        self.selection = set()
+        self.sort_key = None
+        self._anchor = None
+        self.top = 0
+        self._update_headers()
+        self._apply_filter()
+
+    def get_files(self):
+        """按当前顺序返回所有文件（包括被筛选隐藏的文件）"""
+        return [self.paths[index] for index in self.order]
+
+    def set_filter(self, text):
+        """只显示文件名包含 text 的文件（不区分大小写），text 为空时显示全部"""
+        self.filter_text = text.strip().lower()
+        self.top = 0
+        self._apply_filter()
+
+    def sort_by(self, key):
+        """
+        按列排序，再次点击同一列时倒序
+
+        Args:
+            key: name（文件名）或 count（页数，未读取的排在最后）
+        """
+        reverse = self.sort_key == (key, False)
+        if key == "name":
+            names = self.names
+            ordered = sorted(self.order, key=lambda index: names[index].lower())
+        else:
+            counts = self.counts
+            ordered = sorted(
+                self.order,
+                key=lambda index: (counts[index] < 0, counts[index]),
+            )
+        if reverse:
+            ordered.reverse()
+        self.order = array("l", ordered)
+        self.sort_key = (key, reverse)
+        self._update_headers()
+        self._apply_filter()
+
+    def move_selected(self, step):
+        """
+        把选中的文件整体上移（step 为负）或下移一位
+
+        筛选时在显示的行之间移动。
+        """
+        if not self.selection:
+            return
+        rows = list(self.view)
+        positions = range(len(rows)) if step < 0 else range(len(rows) - 1, -1, -1)
+        for position in positions:
+            neighbour = position + step
+            if (
+                rows[position] in self.selection
+                and 0 <= neighbour < len(rows)
+                and rows[neighbour] not in self.selection
+            ):
+                rows[position], rows[neighbour] = rows[neighbour], rows[position]
+
+        # 把新的显示顺序写回完整顺序中被显示的那些位置
+        shown = set(rows)
+        slots = iter(rows)
+        self.order = array(
+            "l", [next(slots) if index in shown else index for index in self.order]
+        )
+        self.sort_key = None
+        self._update_headers()
+        self._apply_filter(keep_top=True)
+        self._scroll_to_selection()
+
+    def remove_selected(self):
+        """从列表中移除选中的文件"""
+        if not self.selection:
+            return
+        keep = [index for index in self.order if index not in self.selection]
+        # 重新编号，保持数组紧凑
+        paths = [self.paths[index] for index in keep]
+        names = [self.names[index] for index in keep]
+        counts = array("l", (self.counts[index] for index in keep))
+        errors = {
+            new: self.errors[old] for new, old in enumerate(keep) if old in self.errors
+        }
+        # 正在读取的页数会按旧下标回调，移除后不再使用这些结果
+        for job in self._jobs:
+            job.cancel()
+        self._jobs = []
+        self.paths, self.names, self.counts, self.errors = paths, names, counts, errors
+        for index, count in enumerate(self.counts):
+            if count == COUNT_LOADING:
+                self.counts[index] = COUNT_UNKNOWN
+        self.order = array("l", range(len(self.paths)))
+        self.selection = set()
+        self._anchor = None
+        self._apply_filter(keep_top=True)
+
+    def yview(self, *args):
+        """滚动条接口"""
+        rows = self._visible_rows()
+        if args and args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.view))
+        elif args and args[0] == "scroll":
+            amount = int(args[1])
+            self.top += amount * (max(1, rows - 1) if args[2] == "pages" else 1)
+        self.top = max(0, min(self.top, len(self.view) - rows))
+        self.redraw()
+
+    def redraw(self):
+        """重新绘制可见的行，并为第一次显示的行读取页数"""
+        canvas = self.canvas
+        canvas.delete("row")
+        width = canvas.winfo_width()
+        rows = self._visible_rows()
+        self.top = max(0, min(self.top, len(self.view) - rows))
+        visible = self.view[self.top:self.top + rows + 1]
+
+        to_load = []
+        for row, index in enumerate(visible):
+            y = row * self.row_height
+            if index in self.selection:
+                canvas.create_rectangle(
+                    0, y, width, y + self.row_height,
+                    fill="#cce4f7", outline="", tags="row",
+                )
+            count = self.counts[index]
+            name = self.names[index]
+            if count >= 0:
+                count_text = f"{count}页"
+            elif count == COUNT_ERROR:
+                count_text = "无法读取"
+                name = f"{name} ({self.errors[index]})"
+            else:
+                count_text = "读取中..."
+                if count == COUNT_UNKNOWN:
+                    to_load.append(index)
+            text_y = y + self.row_height // 2
+            canvas.create_text(
+                6, text_y, text=count_text, anchor=tk.W, font=self.font, tags="row"
+            )
+            canvas.create_text(
+                PAGE_COLUMN_WIDTH, text_y, text=name, anchor=tk.W,
+                font=self.font, tags="row",
+            )
+
+        if self.view:
+            total = len(self.view)
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        if to_load:
+            self._load_counts(to_load)
+
+    def _load_counts(self, indexes):
+        """在后台读取这些文件的页数"""
+        for index in indexes:
+            self.counts[index] = COUNT_LOADING
+        paths = self.paths
+
+        def on_count(position, count, error):
+            # 列表已被替换时 paths 不再是当前列表，丢弃结果
+            if paths is not self.paths:
+                return
+            index = indexes[position]
+            if error is None:
+                self.counts[index] = count
+            else:
+                self.counts[index] = COUNT_ERROR
+                self.errors[index] = str(error)
+            self._schedule_redraw()
+
+        job = self.count_loader([paths[index] for index in indexes], on_count)
+        self._jobs = [running for running in self._jobs if not running.finished]
+        self._jobs.append(job)
+
+    def _schedule_redraw(self):
+        """同一批回调只重绘一次"""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw_idle)
+
+    def _redraw_idle(self):
+        self._redraw_pending = False
+        self.redraw()
+
+    def _visible_rows(self):
+        height = self.canvas.winfo_height()
+        if height <= 1:
+            height = int(self.canvas.cget("height"))
+        return max(1, height // self.row_height)
+
+    def _apply_filter(self, keep_top=False):
+        if self.filter_text:
+            text = self.filter_text
+            names = self.names
+            self.view = array(
+                "l", (index for index in self.order if text in names[index].lower())
+            )
+        else:
+            self.view = array("l", self.order)
+        if not keep_top:
+            self.top = 0
+        self.redraw()
+
+    def _update_headers(self):
+        marks = {"count": "", "name": ""}
+        if self.sort_key is not None:
+            key, reverse = self.sort_key
+            marks[key] = " ▼" if reverse else " ▲"
+        self.count_header.config(text="页数" + marks["count"])
+        self.name_header.config(text="文件名" + marks["name"])
+
+    def _scroll_to_selection(self):
+        """滚动到第一个选中的行"""
+        rows = self._visible_rows()
+        for position, index in enumerate(self.view):
+            if index in self.selection:
+                if position < self.top or position >= self.top + rows:
+                    self.top = max(0, position - rows // 2)
+                    self.redraw()
+                return
+
+    def _row_at(self, event):
+        position = self.top + event.y // self.row_height
+        if 0 <= position < len(self.view):
+            return position
+        return None
+
+    def _on_click(self, event):
+        self.canvas.focus_set()
+        position = self._row_at(event)
+        self.selection = set() if position is None else {self.view[position]}
+        self._anchor = position
+        self.redraw()
+
+    def _on_shift_click(self, event):
+        position = self._row_at(event)
+        if position is None:
+            return
+        anchor = self._anchor if self._anchor is not None else position
+        low, high = sorted((anchor, position))
+        self.selection = set(self.view[low:high + 1])
+        self.redraw()
+
+    def _on_control_click(self, event):
+        position = self._row_at(event)
+        if position is None:
+            return
+        self.selection ^= {self.view[position]}
+        self._anchor = position
+        self.redraw()
+
+    def _on_mouse_wheel(self, event):
+        self.yview("scroll", -3 if event.delta > 0 else 3, "units")
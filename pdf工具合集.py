@@ -1,17 +1,18 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
+import multiprocessing
+import sys
 import configparser
 from datetime import datetime
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
-from io import BytesIO
-import pypdf
-from PIL import Image
-import fitz
 import pdf_tools_ico
+# 导入PDF处理引擎
+import pdf_tools_engine as engine
+from pdf_tools_engine import PDFToolError
 # 导入通用设置管理器
 from pdf_tools_common import CommonSettingsManager
+# 导入合并页面的文件列表
+from pdf_tools_filelist import VirtualFileList
 import tempfile
 
 class PDFToolApp:
@@ -49,9 +50,6 @@ class PDFToolApp:
         # 配置根窗口的默认字体
         self.root.option_add("*Font", self.default_font)
 
-        # 存储选中的文件路径
-        self.selected_files = []
-
         # 获取实际的桌面路径
         self.desktop_path = self.get_desktop_path()
 
@@ -59,9 +57,27 @@ class PDFToolApp:
         self.config_file = "config.ini"
         self.load_config()
 
+        # 文档信息（页数等）缓存在 config.ini 旁边，文件没有变化时不再重复解析
+        engine.set_document_info_cache(
+            engine.DocumentInfoCache(
+                os.path.join(
+                    os.path.dirname(os.path.abspath(self.config_file)),
+                    engine.DEFAULT_CACHE_NAME,
+                )
+            )
+        )
+        # 已打开的文档在各页面和各次操作间复用，文件变化后自动重新打开
+        engine.set_document_cache(engine.DocumentCache())
+
         # 创建通用设置管理器
         self.settings_manager = CommonSettingsManager(self)
 
+        # 后台任务执行器，耗时操作不在界面线程中运行
+        self.job_executor = engine.JobExecutor()
+        # 读取页数等文件信息的线程池，与耗时操作分开，选择文件时不用排队
+        self.info_executor = engine.JobExecutor(max_workers=4)
+        self.page_count_jobs = {}
+
         # 创建样式以设置标签在左侧
         style = ttk.Style()
         style.configure(
@@ -169,19 +185,53 @@ class PDFToolApp:
         )
         select_btn.pack(pady=10)
 
-        # 创建文件列表显示区域
-        list_frame = ttk.Frame(self.merge_frame)
-        list_frame.pack(pady=5, padx=20, fill=tk.BOTH, expand=True)
+        # 创建文件列表显示区域：只绘制可见的行，页数在显示时才读取
+        self.merge_file_list = VirtualFileList(
+            self.merge_frame, self.load_page_counts, font=self.default_font
+        )
+        self.merge_file_list.pack(pady=5, padx=20, fill=tk.BOTH, expand=True)
 
-        # 创建列表框和滚动条
-        self.file_listbox = tk.Listbox(list_frame, height=6)
-        scrollbar = ttk.Scrollbar(
-            list_frame, orient=tk.VERTICAL, command=self.file_listbox.yview
+        # 筛选和调整顺序
+        list_tools = ttk.Frame(self.merge_frame)
+        list_tools.pack(fill=tk.X, padx=20)
+        ttk.Label(list_tools, text="筛选：").pack(side=tk.LEFT)
+        self.merge_filter_var = tk.StringVar()
+        self.merge_filter_var.trace_add(
+            "write",
+            lambda *args: self.merge_file_list.set_filter(self.merge_filter_var.get()),
         )
-        self.file_listbox.configure(yscrollcommand=scrollbar.set)
+        ttk.Entry(list_tools, textvariable=self.merge_filter_var, width=20).pack(
+            side=tk.LEFT
+        )
+        ttk.Button(
+            list_tools, text="移除", command=self.merge_file_list.remove_selected
+        ).pack(side=tk.RIGHT)
+        ttk.Button(
+            list_tools,
+            text="下移",
+            command=lambda: self.merge_file_list.move_selected(1),
+        ).pack(side=tk.RIGHT)
+        ttk.Button(
+            list_tools,
+            text="上移",
+            command=lambda: self.merge_file_list.move_selected(-1),
+        ).pack(side=tk.RIGHT)
+
+        # 无法读取的文件：跳过继续合并，或开始前检查并停止
+        self.merge_skip_errors_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            self.merge_frame,
+            text="跳过无法读取的文件（不勾选时，有文件无法读取则不开始合并）",
+            variable=self.merge_skip_errors_var,
+        ).pack(anchor=tk.W, padx=20)
 
-        self.file_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # 输出文件已存在时追加页面，不重写原有内容
+        self.merge_append_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            self.merge_frame,
+            text="输出文件已存在时追加到文件末尾（增量更新，适合不断增长的大文件）",
+            variable=self.merge_append_var,
+        ).pack(anchor=tk.W, padx=20)
 
         # 创建存储位置设置
         self.merge_storage_widgets = self.settings_manager.create_storage_settings(
@@ -257,31 +307,72 @@ class PDFToolApp:
         )
 
         if files:
-            # 清空之前的文件列表
-            self.file_listbox.delete(0, tk.END)
-            self.selected_files.clear()
-
-            # 添加新选择的文件
-            for file_path in files:
-                self.selected_files.append(file_path)
-                # 只显示文件名，不显示完整路径
-                try:
-                    # 获取PDF页数
-                    reader = pypdf.PdfReader(file_path)
-                    page_count = len(reader.pages)
-                    file_name = f"{page_count}页 -> {os.path.basename(file_path)} "
-                except Exception as e:
-                    # 如果无法读取页数，只显示文件名
-                    file_name = f"{os.path.basename(file_path)} (无法读取页数)"
-                self.file_listbox.insert(tk.END, file_name)
+            # 替换之前的文件列表
+            self.merge_file_list.set_files(files)
 
             # 更新状态信息
-            print(f"已选择 {len(self.selected_files)} 个文件")
+            print(f"已选择 {len(self.merge_file_list)} 个文件")
+
+    @staticmethod
+    def page_count_label(file_path, count=None, error=None):
+        """选中文件后显示的文本：页数和文件名"""
+        name = os.path.basename(file_path)
+        if error is not None:
+            return f"{name} (无法读取页数：{error})"
+        if count is None:
+            return f"读取中... -> {name}"
+        return f"{count}页 -> {name}"
+
+    def load_page_counts(self, files, on_count, key=None):
+        """
+        在后台读取文件页数，按读完的顺序在界面线程中调用 on_count(序号, 页数, 错误)
+
+        读取成功时错误为 None，失败时页数为 None。
+
+        Args:
+            files: 文件路径列表
+            on_count: 回调函数
+            key: 调用方标识，同一标识再次调用时取消上一次未完成的读取
+
+        Returns:
+            MapJob: 任务对象
+        """
+        if key is not None:
+            previous = self.page_count_jobs.get(key)
+            if previous is not None:
+                previous.cancel()
+        job = self.info_executor.map(engine.page_count, files)
+        if key is not None:
+            self.page_count_jobs[key] = job
+
+        def poll():
+            for kind, index, payload in job.poll():
+                if kind == "result":
+                    on_count(index, payload, None)
+                else:
+                    on_count(index, None, payload)
+            if not job.finished:
+                self.root.after(50, poll)
+
+        self.root.after(50, poll)
+        return job
+
+    def show_selected_file(self, file_path, file_var):
+        """在只读输入框中显示选中的文件，页数在后台读取后补上"""
+        file_var.set(self.page_count_label(file_path))
+        self.load_page_counts(
+            [file_path],
+            lambda index, count, error: file_var.set(
+                self.page_count_label(file_path, count, error)
+            ),
+            key=str(file_var),
+        )
 
     def merge_pdfs(self):
         """合并PDF文件"""
         # 检查是否有选择文件
-        if not self.selected_files:
+        input_files = self.merge_file_list.get_files()
+        if not input_files:
             messagebox.showwarning("警告", "请先选择要合并的PDF文件！")
             return
 
@@ -311,40 +402,127 @@ class PDFToolApp:
         output_path = os.path.join(save_directory, filename + ".pdf")
 
         # 检查文件是否已存在
-        if os.path.exists(output_path):
+        append = self.merge_append_var.get()
+        if os.path.exists(output_path) and not append:
             result = messagebox.askyesno(
                 "文件已存在", f"文件 {filename}.pdf 已存在，是否覆盖？"
             )
             if not result:
                 return
 
+        def on_success(result):
+            message = f"PDF文件合并完成！\n保存位置：{output_path}"
+            if result["skipped"]:
+                skipped = "\n".join(
+                    f"{os.path.basename(path)}：{error}"
+                    for path, error in result["skipped"].items()
+                )
+                message += f"\n\n跳过 {len(result['skipped'])} 个文件：\n{skipped}"
+            messagebox.showinfo("成功", message)
+
+        self.run_in_background(
+            "正在合并PDF...",
+            engine.merge_pdfs,
+            (input_files, output_path),
+            {
+                "on_error": "skip" if self.merge_skip_errors_var.get() else "fail",
+                "append": append,
+            },
+            on_success=on_success,
+            error_message="合并PDF文件时出错",
+        )
+
+    def check_pages_before_start(self, check, *files):
+        """
+        开始处理前检查页码参数，出错时立即提示
+
+        页数从缓存或快速读取得到；读取不到页数（文件损坏、已加密）时跳过检查，
+        由后台任务读取文件后检查。
+
+        Args:
+            check: 检查函数 check(各文件页数...)，页码无效时抛出 PageRangeError
+            *files: 文件路径
+
+        Returns:
+            bool: 可以开始处理时为 True
+        """
         try:
-            # 创建PDF写入器
-            pdf_writer = pypdf.PdfWriter()
-
-            # 逐个读取并合并PDF文件
-            for file_path in self.selected_files:
-                try:
-                    with open(file_path, "rb") as pdf_file:
-                        pdf_reader = pypdf.PdfReader(pdf_file)
-                        # 将每一页添加到写入器中
-                        for page_num in range(len(pdf_reader.pages)):
-                            page = pdf_reader.pages[page_num]
-                            pdf_writer.add_page(page)
-                except Exception as e:
-                    messagebox.showerror(
-                        "错误", f"读取文件 {file_path} 时出错：{str(e)}"
-                    )
-                    return
-
-            # 写入合并后的PDF文件
-            with open(output_path, "wb") as output_file:
-                pdf_writer.write(output_file)
+            counts = [engine.page_count(path, fallback=False) for path in files]
+        except PDFToolError:
+            return True
+        try:
+            check(*counts)
+        except PDFToolError as e:
+            messagebox.showerror("错误", str(e))
+            return False
+        return True
+
+    def run_in_background(self, title, func, args=(), kwargs=None,
+                          on_success=None, error_message="处理PDF文件时发生错误"):
+        """
+        在后台线程执行耗时操作，显示进度窗口和取消按钮
+
+        Args:
+            title: 进度窗口标题
+            func: 引擎函数，需接受 progress 关键字参数
+            args: 位置参数
+            kwargs: 关键字参数
+            on_success: 成功后在界面线程中调用的回调 on_success(返回值)
+            error_message: 非预期异常的提示前缀
+        """
+        job = self.job_executor.submit(func, *args, **(kwargs or {}))
+
+        # 进度窗口
+        progress_window = tk.Toplevel(self.root)
+        progress_window.title(title)
+        progress_window.geometry("300x130")
+        progress_window.transient(self.root)
+        progress_window.grab_set()
+
+        status_var = tk.StringVar(value="正在处理，请稍候...")
+        tk.Label(progress_window, textvariable=status_var).pack(pady=10)
+        progress_var = tk.DoubleVar()
+        progress_bar = ttk.Progressbar(
+            progress_window, variable=progress_var, maximum=100
+        )
+        progress_bar.pack(pady=5, padx=20, fill=tk.X)
+
+        def cancel():
+            job.cancel()
+            status_var.set("正在取消...")
+            cancel_btn.config(state=tk.DISABLED)
+
+        cancel_btn = ttk.Button(progress_window, text="取消", command=cancel)
+        cancel_btn.pack(pady=5)
+        progress_window.protocol("WM_DELETE_WINDOW", cancel)
+
+        def poll():
+            for event in job.poll():
+                kind, payload = event[0], event[1]
+                if kind == "progress":
+                    done, total = event[1], event[2]
+                    if total:
+                        progress_var.set(done / total * 100)
+                        if not job.cancel_requested:
+                            status_var.set(f"正在处理... {done / total:.0%}")
+                    continue
+
+                progress_window.destroy()
+                if kind == "done":
+                    if on_success:
+                        on_success(payload)
+                elif kind == "cancelled":
+                    messagebox.showinfo("提示", "操作已取消，未完成的输出文件已删除。")
+                elif isinstance(payload, PDFToolError):
+                    messagebox.showerror("错误", str(payload))
+                else:
+                    messagebox.showerror("错误", f"{error_message}：{str(payload)}")
+                return
 
-            messagebox.showinfo("成功", f"PDF文件合并完成！\n保存位置：{output_path}")
+            self.root.after(100, poll)
 
-        except Exception as e:
-            messagebox.showerror("错误", f"合并PDF文件时出错：{str(e)}")
+        self.root.after(100, poll)
+        return job
 
     def setup_split_page(self):
         """设置拆分页面的内容"""
@@ -480,10 +658,8 @@ class PDFToolApp:
         )
 
         if file:
-            reader = pypdf.PdfReader(file)
-            page_count = len(reader.pages)
             self.filename_a = file
-            self.split_file_var.set(f"{page_count}页 -> {os.path.basename(file)}")
+            self.show_selected_file(file, self.split_file_var)
 
     def on_split_method_change(self, *args):
         """拆分方式改变时的处理"""
@@ -536,139 +712,45 @@ class PDFToolApp:
                 messagebox.showerror("错误", "请选择有效的保存路径！")
                 return
 
-            # 获取输入文件名（不含扩展名）
-            input_filename = os.path.splitext(os.path.basename(input_file))[0]
-
-            # 读取PDF文件
-            with open(input_file, "rb") as f:
-                reader = pypdf.PdfReader(f)
-                total_pages = len(reader.pages)
-
-                # 根据拆分方式执行拆分
-                method = self.split_method_var.get()
-
-                if method == "single":
-                    # 单页拆分
-                    self._split_single_page(reader, save_directory, input_filename)
-                elif method == "pages":
-                    # 按页数拆分
-                    pages_per_file = int(self.pages_per_file_var.get())
-                    self._split_by_pages(
-                        reader, save_directory, input_filename, pages_per_file
-                    )
-                elif method == "range":
-                    # 按范围拆分
-                    range_str = self.range_var.get()
-                    if not range_str:
-                        messagebox.showerror("错误", "请输入页码范围！")
-                        return
-                    self._split_by_range(
-                        reader, save_directory, input_filename, range_str
-                    )
+            # 根据拆分方式执行拆分
+            method = self.split_method_var.get()
+            range_str = self.range_var.get()
+            if method == "range" and not range_str:
+                messagebox.showerror("错误", "请输入页码范围！")
+                return
+            if method == "range" and not self.check_pages_before_start(
+                lambda total: engine.PageSet.parse(range_str, total), input_file
+            ):
+                return
 
-            messagebox.showinfo("成功", f"PDF拆分完成！\n保存位置：{save_directory}")
+            self.run_in_background(
+                "正在拆分PDF...",
+                engine.split_pdf,
+                (input_file, save_directory, self._split_name_prefix(method)),
+                {
+                    "method": method,
+                    "pages_per_file": int(self.pages_per_file_var.get()),
+                    "range_str": range_str,
+                },
+                on_success=lambda result: messagebox.showinfo(
+                    "成功", f"PDF拆分完成！\n保存位置：{save_directory}"
+                ),
+                error_message="拆分PDF时发生错误",
+            )
 
         except Exception as e:
             messagebox.showerror("错误", f"拆分PDF时发生错误：{str(e)}")
 
-    def _split_single_page(self, reader, save_directory, input_filename):
-        """单页拆分"""
-        total_pages = len(reader.pages)
-        for i in range(total_pages):
-            writer = pypdf.PdfWriter()
-            writer.add_page(reader.pages[i])
-
-            # 生成文件名
-            if self.split_filename_widgets["filename_var"].get() == "default":
-                output_filename = (
-                    f"{datetime.now().strftime('%Y%m%d%H%M%S')}_page_{i+1}.pdf"
-                )
-            else:
-                custom_name = self.split_filename_widgets["entry"].get()
-                if custom_name:
-                    output_filename = f"{custom_name}_page_{i+1}.pdf"
-                else:
-                    output_filename = (
-                        f"{datetime.now().strftime('%Y%m%d%H%M%S')}_page_{i+1}.pdf"
-                    )
-
-            output_path = os.path.join(save_directory, output_filename)
-            with open(output_path, "wb") as output_file:
-                writer.write(output_file)
-
-    def _split_by_pages(self, reader, save_directory, input_filename, pages_per_file):
-        """按页数拆分"""
-        total_pages = len(reader.pages)
-        file_index = 1
+    def _split_name_prefix(self, method):
+        """生成拆分输出文件名前缀"""
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        custom_name = ""
+        if self.split_filename_widgets["filename_var"].get() != "default":
+            custom_name = self.split_filename_widgets["entry"].get()
 
-        for start in range(0, total_pages, pages_per_file):
-            end = min(start + pages_per_file, total_pages)
-            writer = pypdf.PdfWriter()
-
-            # 添加指定范围的页面
-            for i in range(start, end):
-                writer.add_page(reader.pages[i])
-
-            # 生成文件名
-            if self.split_filename_widgets["filename_var"].get() == "default":
-                output_filename = (
-                    f"{datetime.now().strftime('%Y%m%d%H%M%S')}_part_{file_index}.pdf"
-                )
-            else:
-                custom_name = self.split_filename_widgets["entry"].get()
-                if custom_name:
-                    output_filename = f"{custom_name}_part_{file_index}.pdf"
-                else:
-                    output_filename = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_part_{file_index}.pdf"
-
-            output_path = os.path.join(save_directory, output_filename)
-            with open(output_path, "wb") as output_file:
-                writer.write(output_file)
-
-            file_index += 1
-
-    def _split_by_range(self, reader, save_directory, input_filename, range_str):
-        """按范围拆分"""
-        try:
-            ranges = range_str.split(",")
-            page_numbers = []
-
-            for r in ranges:
-                if "-" in r:
-                    start, end = map(int, r.split("-"))
-                    page_numbers.extend(range(start, end + 1))
-                else:
-                    page_numbers.append(int(r))
-
-            # 去重并排序
-            page_numbers = sorted(set(page_numbers))
-
-            # 生成文件名
-            if self.split_filename_widgets["filename_var"].get() == "default":
-                output_filename = (
-                    f"{datetime.now().strftime('%Y%m%d%H%M%S')}_custom_range.pdf"
-                )
-            else:
-                custom_name = self.split_filename_widgets["entry"].get()
-                if custom_name:
-                    output_filename = f"{custom_name}.pdf"
-                else:
-                    output_filename = (
-                        f"{datetime.now().strftime('%Y%m%d%H%M%S')}_custom_range.pdf"
-                    )
-
-            output_path = os.path.join(save_directory, output_filename)
-            writer = pypdf.PdfWriter()
-
-            # 添加指定页码的页面
-            for page_num in page_numbers:
-                writer.add_page(reader.pages[page_num - 1])
-
-            with open(output_path, "wb") as output_file:
-                writer.write(output_file)
-
-        except Exception as e:
-            messagebox.showerror("错误", f"解析页码范围时发生错误：{str(e)}")
+        if method == "range":
+            return custom_name or f"{timestamp}_custom_range"
+        return custom_name or timestamp
 
     def setup_watermark_page(self):
         """设置加水印页面的内容"""
@@ -793,6 +875,56 @@ class PDFToolApp:
         # 绑定水印类型变化事件
         self.watermark_type_var.trace("w", self.on_watermark_type_change)
 
+        # 输出方式
+        output_mode_frame = ttk.LabelFrame(main_frame, text="输出方式")
+        output_mode_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.watermark_mode_var = tk.StringVar(value="merge")
+        mode_buttons_frame = ttk.Frame(output_mode_frame)
+        mode_buttons_frame.pack(fill=tk.X, padx=10, pady=5)
+
+        ttk.Radiobutton(
+            mode_buttons_frame,
+            text="逐页合并",
+            variable=self.watermark_mode_var,
+            value="merge",
+        ).pack(side=tk.LEFT, padx=10)
+
+        ttk.Radiobutton(
+            mode_buttons_frame,
+            text="共享水印对象（文件更小）",
+            variable=self.watermark_mode_var,
+            value="xobject",
+        ).pack(side=tk.LEFT, padx=10)
+
+        ttk.Radiobutton(
+            mode_buttons_frame,
+            text="增量更新（大文件更快，保留签名）",
+            variable=self.watermark_mode_var,
+            value="incremental",
+        ).pack(side=tk.LEFT, padx=10)
+
+        # 平铺图案：大幅面页面上内容大小固定
+        self.watermark_pattern_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            output_mode_frame,
+            text="使用平铺图案（适合A0等大幅面页面）",
+            variable=self.watermark_pattern_var,
+        ).pack(anchor=tk.W, padx=10, pady=(0, 5))
+
+        # 并行进程数：页数很多时按页分块多进程处理
+        workers_frame = ttk.Frame(output_mode_frame)
+        workers_frame.pack(fill=tk.X, padx=10, pady=(0, 5))
+        ttk.Label(workers_frame, text="并行进程数:").pack(side=tk.LEFT)
+        self.watermark_workers_var = tk.StringVar(value="1")
+        ttk.Spinbox(
+            workers_frame,
+            from_=1,
+            to=os.cpu_count() or 1,
+            width=5,
+            textvariable=self.watermark_workers_var,
+        ).pack(side=tk.LEFT, padx=5)
+
         # 创建存储位置设置
         self.watermark_storage_widgets = self.settings_manager.create_storage_settings(
             main_frame,
@@ -828,6 +960,12 @@ class PDFToolApp:
         )
         watermark_btn.pack(pady=5)
 
+        ttk.Button(
+            self.watermark_filename_widgets["frame"],
+            text="批量添加水印（选择文件夹）",
+            command=self.process_watermark_folder,
+        ).pack(pady=5)
+
     def select_watermark_file(self):
         """选择要添加水印的PDF文件"""
         file = filedialog.askopenfilename(
@@ -835,10 +973,8 @@ class PDFToolApp:
         )
 
         if file:
-            reader = pypdf.PdfReader(file)
-            page_count = len(reader.pages)
             self.filename_a = file
-            self.watermark_file_var.set(f"{page_count}页 -> {os.path.basename(file)} ")
+            self.show_selected_file(file, self.watermark_file_var)
 
     def select_watermark_image(self):
         """选择水印图片"""
@@ -901,11 +1037,8 @@ class PDFToolApp:
                 messagebox.showerror("错误", "请选择有效的保存路径！")
                 return
 
-            # 生成文件名
-            input_filename = os.path.splitext(os.path.basename(input_file))[0]
-
             def get_default_name():
-                return f"{input_filename}_watermarked"
+                return f"{datetime.now().strftime('%Y%m%d%H%M%S')}_watermarked"
 
             filename = self.settings_manager.get_filename(
                 self.watermark_filename_widgets["filename_var"],
@@ -913,7 +1046,7 @@ class PDFToolApp:
                 get_default_name,
             )
             if not filename:
-                filename = f"{input_filename}_watermarked"
+                filename = get_default_name()
 
             output_path = os.path.join(save_directory, filename + ".pdf")
 
@@ -925,53 +1058,23 @@ class PDFToolApp:
                     return
 
             # 获取水印参数
-            watermark_type = self.watermark_type_var.get()
-
-            # 显示进度
-            progress_window = tk.Toplevel(self.root)
-            progress_window.title("正在添加水印...")
-            progress_window.geometry("300x100")
-            progress_window.transient(self.root)
-            progress_window.grab_set()
-
-            tk.Label(progress_window, text="正在处理水印，请稍候...").pack(pady=10)
-            progress_var = tk.DoubleVar()
-            progress_bar = ttk.Progressbar(
-                progress_window, variable=progress_var, maximum=100
-            )
-            progress_bar.pack(pady=10, padx=20, fill=tk.X)
-            progress_window.update()
-
-            if watermark_type == "text":
-                # 文字水印
-                self._add_enhanced_text_watermark(
-                    input_file, output_path, progress_var, progress_window
-                )
-            else:
-                # 图片水印
-                self._add_enhanced_image_watermark(
-                    input_file, output_path, progress_var, progress_window
-                )
-
-            progress_window.destroy()
+            watermark_func, watermark_kwargs = self._watermark_params()
 
-            # 完成后询问是否打开文件
-            result = messagebox.askyesno(
-                "成功", f"PDF水印添加完成！\n保存位置：{output_path}\n\n是否打开文件？"
+            def on_success(result):
+                # 完成后询问是否打开文件
+                if messagebox.askyesno(
+                    "成功",
+                    f"PDF水印添加完成！\n保存位置：{output_path}\n\n是否打开文件？",
+                ):
+                    self.open_file(output_path)
+
+            self.run_in_background(
+                "正在添加水印...",
+                watermark_func,
+                (input_file, output_path),
+                watermark_kwargs,
+                on_success=on_success,
             )
-            if result:
-                import subprocess
-
-                try:
-                    if os.name == "nt":  # Windows
-                        os.startfile(output_path)
-                    elif os.name == "posix":  # macOS or Linux
-                        if sys.platform == "darwin":  # macOS
-                            subprocess.call(("open", output_path))
-                        else:  # Linux
-                            subprocess.call(("xdg-open", output_path))
-                except Exception as e:
-                    print(f"打开文件失败: {e}")
 
         except Exception as e:
             messagebox.showerror("错误", f"处理PDF文件时发生错误：{str(e)}")
@@ -979,420 +1082,99 @@ class PDFToolApp:
 
             traceback.print_exc()
 
-    def _add_enhanced_text_watermark(
-        self, input_file, output_file, progress_var=None, progress_window=None
-    ):
-        # 读取PDF
-        reader = pypdf.PdfReader(input_file)
-        total_pages = len(reader.pages)
-        writer = pypdf.PdfWriter()
-
-        # 注册字体
-        self._register_chinese_fonts()
-
-        # 获取参数
-        text = self.watermark_text_var.get()
-        font_size = int(self.watermark_font_size_var.get())
-        position = "center"
-        watermark_style = "repeat"  # self.watermark_type_var.get()  # single 或 repeat
-
-        for page_idx, page in enumerate(reader.pages):
-            # 更新进度
-            if progress_var and progress_window:
-                progress = (page_idx + 1) / total_pages * 100
-                progress_var.set(progress)
-                progress_window.update()
-
-            # 页面尺寸
-            width = page.mediabox.width
-            height = page.mediabox.height
-
-            # 创建水印
-            packet = BytesIO()
-            can = canvas.Canvas(packet, pagesize=(width, height))
-
-            # 设置字体
-            can.setFont(
-                (
-                    "ChineseFont"
-                    if hasattr(self, "_chinese_font_registered")
-                    and self._chinese_font_registered
-                    else "Helvetica"
-                ),
-                font_size,
+    def process_watermark_folder(self):
+        """给文件夹中的所有PDF文件添加相同的水印"""
+        input_dir = filedialog.askdirectory(title="选择包含PDF文件的文件夹")
+        if not input_dir:
+            return
+
+        try:
+            save_directory = self.settings_manager.get_save_directory(
+                self.watermark_storage_widgets["location_var"],
+                self.watermark_storage_widgets["folder_path_var"],
             )
+            if not save_directory:
+                messagebox.showerror("错误", "请选择有效的保存路径！")
+                return
 
-            # 设置颜色和透明度
-            can.setFillColorRGB(0.2, 0.2, 0.2)  # 深灰色
-            can.setFillAlpha(0.2)  # 20%透明度
+            # 并行进程数用于同时处理多个文件
+            _, watermark_kwargs = self._watermark_params()
+            workers = watermark_kwargs.pop("workers")
 
-            if watermark_style == "repeat":
-                # 平铺水印
-                self._draw_enhanced_tiled_watermark(can, text, width, height, font_size)
-            else:
-                # 单个水印
-                self._draw_enhanced_single_watermark(
-                    can, text, position, width, height, font_size
+            def on_success(result):
+                message = (
+                    f"批量添加水印完成！\n成功 {len(result['outputs'])} 个文件"
+                    f"\n保存位置：{save_directory}"
                 )
-
-            can.save()
-            packet.seek(0)
-
-            # 合并
-            watermark = pypdf.PdfReader(packet)
-            page.merge_page(watermark.pages[0])
-            writer.add_page(page)
-
-        # 保存
-        with open(output_file, "wb") as f:
-            writer.write(f)
-
-    def _add_enhanced_image_watermark(
-        self, input_file, output_file, progress_var=None, progress_window=None
-    ):
-        # 读取PDF
-        reader = pypdf.PdfReader(input_file)
-        total_pages = len(reader.pages)
-        writer = pypdf.PdfWriter()
-
-        # 获取图片路径
-        image_path = self.watermark_image_var.get()
-        if not image_path or not os.path.exists(image_path):
-            messagebox.showerror("错误", "请选择有效的水印图片！")
-            return False
-
-        try:
-            # 获取水印参数
-            opacity = int(self.watermark_opacity_var.get()) / 100.0
-            position = "center"
-            watermark_style = (
-                "repeat"  # self.watermark_type_var.get()  # single 或 repeat
+                if result["errors"]:
+                    failed = "\n".join(
+                        f"{os.path.basename(path)}：{error}"
+                        for path, error in result["errors"].items()
+                    )
+                    message += f"\n\n失败 {len(result['errors'])} 个文件：\n{failed}"
+                messagebox.showinfo("完成", message)
+
+            self.run_in_background(
+                "正在批量添加水印...",
+                engine.watermark_files,
+                (input_dir, save_directory, self.watermark_type_var.get()),
+                dict(watermark_kwargs, workers=workers),
+                on_success=on_success,
             )
 
-            # 处理图片
-            img = Image.open(image_path)
+        except Exception as e:
+            messagebox.showerror("错误", f"处理PDF文件时发生错误：{str(e)}")
 
-            # 获取图片缩放比例
-            scale_percent = (
+    def _watermark_params(self):
+        """
+        读取水印设置
+
+        Returns:
+            tuple: (引擎水印函数, 除输入输出路径外的关键字参数)
+        """
+        style = "pattern" if self.watermark_pattern_var.get() else "repeat"
+        if self.watermark_type_var.get() == "text":
+            # 文字水印
+            return engine.add_text_watermark, {
+                "text": self.watermark_text_var.get(),
+                "font_size": int(self.watermark_font_size_var.get()),
+                "style": style,
+                "mode": self.watermark_mode_var.get(),
+                "workers": int(self.watermark_workers_var.get()),
+            }
+
+        # 图片水印
+        return engine.add_image_watermark, {
+            "image_path": self.watermark_image_var.get(),
+            "style": style,
+            "mode": self.watermark_mode_var.get(),
+            "workers": int(self.watermark_workers_var.get()),
+            "opacity": int(self.watermark_opacity_var.get()) / 100.0,
+            "scale_percent": (
                 int(self.watermark_scale_var.get())
                 if hasattr(self, "watermark_scale_var")
                 else 50
-            )
-            scale_factor = scale_percent / 100.0
-
-            # 如果是RGBA模式，转换为RGB
-            if img.mode in ("RGBA", "LA", "P"):
-                if img.mode == "P":
-                    img = img.convert("RGBA")
-
-                # 创建白色背景
-                background = Image.new("RGB", img.size, (255, 255, 255))
-                if img.mode == "RGBA":
-                    background.paste(img, mask=img.split()[-1])
-                else:  # LA
-                    background.paste(img, mask=img.split()[0])
-                img = background
-
-            # 调整图片大小
-            if scale_percent != 100:
-                new_width = int(img.width * scale_factor)
-                new_height = int(img.height * scale_factor)
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-            # 保存为临时文件
-            temp_img_path = "temp_watermark.png"
-            img.save(temp_img_path, "PNG")
-
-            # 获取旋转角度
-            rotation_angle = (
+            ),
+            "rotation_angle": (
                 int(self.watermark_rotation_var.get())
                 if hasattr(self, "watermark_rotation_var")
                 else 0
-            )
-
-            for page_idx, page in enumerate(reader.pages):
-                # 更新进度
-                if progress_var and progress_window:
-                    progress = (page_idx + 1) / total_pages * 100
-                    progress_var.set(progress)
-                    progress_window.update()
-
-                # 页面尺寸
-                width = page.mediabox.width
-                height = page.mediabox.height
-
-                # 创建水印PDF
-                packet = BytesIO()
-                can = canvas.Canvas(packet, pagesize=(width, height))
-
-                # 读取图片
-                try:
-                    image_reader = ImageReader(temp_img_path)
-                    img_width, img_height = image_reader.getSize()
-
-                    # 设置透明度
-                    can.setFillAlpha(opacity)
-
-                    if watermark_style == "repeat":
-                        # 平铺图片水印
-                        self._draw_tiled_image_watermark(
-                            can,
-                            image_reader,
-                            width,
-                            height,
-                            img_width,
-                            img_height,
-                            rotation_angle,
-                        )
-                    else:
-                        # 单个图片水印
-                        self._draw_single_image_watermark(
-                            can,
-                            image_reader,
-                            position,
-                            width,
-                            height,
-                            img_width,
-                            img_height,
-                            rotation_angle,
-                        )
-
-                except Exception as e:
-                    print(f"绘制图片水印失败: {e}")
-                    # 如果图片水印失败，回退到文字提示
-                    can.setFont("Helvetica", 12)
-                    can.setFillAlpha(0.5)
-                    can.drawString(50, 50, "水印图片加载失败")
-
-                can.save()
-                packet.seek(0)
-
-                # 合并水印
-                watermark_reader = pypdf.PdfReader(packet)
-                watermark_page = watermark_reader.pages[0]
-
-                # 合并到原页面
-                page.merge_page(watermark_page)
-                writer.add_page(page)
-
-            # 保存结果
-            with open(output_file, "wb") as f:
-                writer.write(f)
-
-            return True
-
-        except Exception as e:
-            messagebox.showerror("错误", f"添加图片水印失败：{str(e)}")
-            import traceback
-
-            traceback.print_exc()
-            return False
-
-        finally:
-            # 清理临时文件
-            try:
-                if os.path.exists(temp_img_path):
-                    os.remove(temp_img_path)
-            except:
-                pass
-
-    def _draw_tiled_image_watermark(
-        self,
-        canvas,
-        image_reader,
-        page_width,
-        page_height,
-        img_width,
-        img_height,
-        rotation_angle=0,
-    ):
-        """绘制平铺图片水印"""
-        # 计算间距（图片宽度+20%的边距）
-        x_spacing = int(img_width * 1.2)
-        y_spacing = int(img_height * 1.2)
-
-        for i in range(-x_spacing, int(page_width) + x_spacing, x_spacing):
-            for j in range(-y_spacing, int(page_height) + y_spacing, y_spacing):
-                canvas.saveState()
-
-                # 移动到中心位置
-                center_x = i + img_width / 2
-                center_y = j + img_height / 2
-
-                # 应用旋转
-                if rotation_angle != 0:
-                    canvas.translate(center_x, center_y)
-                    canvas.rotate(rotation_angle)
-                    canvas.translate(-center_x, -center_y)
-
-                # 绘制图片
-                canvas.drawImage(
-                    image_reader, i, j, width=img_width, height=img_height, mask="auto"
-                )
-
-                canvas.restoreState()
-
-    def _draw_single_image_watermark(
-        self,
-        canvas,
-        image_reader,
-        position,
-        page_width,
-        page_height,
-        img_width,
-        img_height,
-        rotation_angle=0,
-    ):
-        """绘制单个图片水印"""
-        # 根据位置计算坐标
-        if position == "center":
-            x = (page_width - img_width) / 2
-            y = (page_height - img_height) / 2
-        elif position == "top_left":
-            x = page_width * 0.05
-            y = page_height - img_height - page_height * 0.05
-        elif position == "top_right":
-            x = page_width - img_width - page_width * 0.05
-            y = page_height - img_height - page_height * 0.05
-        elif position == "bottom_left":
-            x = page_width * 0.05
-            y = page_height * 0.05
-        elif position == "bottom_right":
-            x = page_width - img_width - page_width * 0.05
-            y = page_height * 0.05
-        else:  # 默认居中
-            x = (page_width - img_width) / 2
-            y = (page_height - img_height) / 2
-
-        canvas.saveState()
-
-        # 如果需要旋转
-        if rotation_angle != 0:
-            # 移动到图片中心
-            center_x = x + img_width / 2
-            center_y = y + img_height / 2
-
-            canvas.translate(center_x, center_y)
-            canvas.rotate(rotation_angle)
-            canvas.translate(-center_x, -center_y)
-
-        # 绘制图片
-        canvas.drawImage(
-            image_reader, x, y, width=img_width, height=img_height, mask="auto"
-        )
-
-        canvas.restoreState()
-
-    def _register_chinese_fonts(self):
-        """注册中文字体"""
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont
-
-        if hasattr(self, "_chinese_font_registered") and self._chinese_font_registered:
-            return
-
-        # 字体搜索路径
-        font_search_paths = [
-            (
-                "C:/Windows/Fonts/",
-                ["simhei.ttf", "simsun.ttc", "msyh.ttc", "simkai.ttf", "simfang.ttf"],
             ),
-            ("/System/Library/Fonts/", ["PingFang.ttc", "Hiragino Sans GB.ttc"]),
-            (
-                "/usr/share/fonts/truetype/",
-                ["wqy-microhei.ttc", "droid/DroidSansFallbackFull.ttf"],
-            ),
-        ]
-
-        for base_path, font_files in font_search_paths:
-            for font_file in font_files:
-                font_path = os.path.join(base_path, font_file)
-                if os.path.exists(font_path):
-                    try:
-                        pdfmetrics.registerFont(TTFont("ChineseFont", font_path))
-                        self._chinese_font_registered = True
-                        print(f"已注册字体: {font_path}")
-                        return
-                    except Exception as e:
-                        print(f"注册字体失败 {font_path}: {e}")
-
-        # 如果没有找到中文字体
-        self._chinese_font_registered = False
-        print("未找到中文字体，将使用英文字体")
-
-    def _draw_enhanced_tiled_watermark(
-        self, canvas, text, page_width, page_height, font_size
-    ):
-        """增强版平铺水印"""
-        # 计算间距
-        text_width = canvas.stringWidth(text, canvas._fontname, canvas._fontsize)
-        x_spacing = text_width + 150
-        y_spacing = font_size + 100
-
-        # 绘制网格
-        for i in range(
-            -int(x_spacing), int(page_width) + int(x_spacing), int(x_spacing)
-        ):
-            for j in range(
-                -int(y_spacing), int(page_height) + int(y_spacing), int(y_spacing)
-            ):
-                canvas.saveState()
-                canvas.translate(i, j)
-                canvas.rotate(30)  # 角度可调
-
-                # 可选：添加阴影效果
-                canvas.setFillColorRGB(0.1, 0.1, 0.1, alpha=0.1)
-                # canvas.drawString(2, -2, text)  # 阴影
-
-                canvas.setFillColorRGB(0.5, 0.5, 0.5, alpha=0.2)
-                canvas.drawString(0, 0, text)  # 主文字
-
-                canvas.restoreState()
-
-    def _draw_enhanced_single_watermark(
-        self, canvas, text, position, page_width, page_height, font_size
-    ):
-        """增强版单个水印"""
-        # 位置映射
-        positions = {
-            "center": (page_width / 2, page_height / 2, 45, True),
-            "top_left": (page_width * 0.2, page_height * 0.8, 45, False),
-            "top_right": (page_width * 0.8, page_height * 0.8, 45, False),
-            "bottom_left": (page_width * 0.2, page_height * 0.2, 45, False),
-            "bottom_right": (page_width * 0.8, page_height * 0.2, 45, False),
         }
 
-        x, y, rotation, centered = positions.get(
-            position, (page_width / 2, page_height / 2, 45, True)
-        )
-
-        canvas.saveState()
-        canvas.translate(x, y)
-        canvas.rotate(rotation)
-
-        # 文字居中
-        if centered:
-            text_width = canvas.stringWidth(text, canvas._fontname, canvas._fontsize)
-            x_offset = -text_width / 2
-        else:
-            x_offset = 0
-
-        # 可选：添加边框
-        canvas.setStrokeColorRGB(0.3, 0.3, 0.3, alpha=0.1)
-        canvas.setLineWidth(0.5)
-        canvas.rect(
-            x_offset - 5,
-            -font_size / 2 - 5,
-            text_width + 10,
-            font_size + 10,
-            stroke=1,
-            fill=0,
-        )
-
-        # 绘制文字
-        canvas.drawString(x_offset, 0, text)
+    def open_file(self, file_path):
+        """用系统默认程序打开文件"""
+        import subprocess
 
-        canvas.restoreState()
+        try:
+            if os.name == "nt":  # Windows
+                os.startfile(file_path)
+            elif sys.platform == "darwin":  # macOS
+                subprocess.call(("open", file_path))
+            else:  # Linux
+                subprocess.call(("xdg-open", file_path))
+        except Exception as e:
+            print(f"打开文件失败: {e}")
 
     def setup_insert_page(self):
         """设置插入页面的内容"""
@@ -1503,6 +1285,30 @@ class PDFToolApp:
             fill=tk.X, pady=5
         )
 
+        # 多点插入：把上面的设置依次加入列表，开始插入时一次写出所有插入点
+        points_frame = ttk.LabelFrame(
+            main_frame, text="多个插入点（列表为空时按上面的设置插入）"
+        )
+        points_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.insert_points = []
+        self.insert_points_listbox = tk.Listbox(points_frame, height=4)
+        self.insert_points_listbox.pack(
+            side=tk.LEFT, fill=tk.X, expand=True, padx=10, pady=5
+        )
+
+        points_buttons = ttk.Frame(points_frame)
+        points_buttons.pack(side=tk.LEFT, padx=(0, 10), pady=5)
+        ttk.Button(
+            points_buttons, text="添加插入点", command=self.add_insert_point
+        ).pack(fill=tk.X)
+        ttk.Button(
+            points_buttons, text="移除", command=self.remove_insert_point
+        ).pack(fill=tk.X, pady=2)
+        ttk.Button(
+            points_buttons, text="清空", command=self.clear_insert_points
+        ).pack(fill=tk.X)
+
         # 默认隐藏位置设置（因为默认是position，所以显示）
         # self.position_frame.pack_forget()
 
@@ -1542,6 +1348,12 @@ class PDFToolApp:
         )
         insert_btn.pack(pady=5)
 
+        ttk.Button(
+            self.insert_filename_widgets["frame"],
+            text="批量插入到多个文件（选择文件夹）",
+            command=self.insert_pdf_folder,
+        ).pack(pady=5)
+
     def select_target_file(self):
         """选择被插PDF文件"""
         file = filedialog.askopenfilename(
@@ -1550,10 +1362,8 @@ class PDFToolApp:
         )
 
         if file:
-            reader = pypdf.PdfReader(file)
-            page_count = len(reader.pages)
             self.filename_a = file
-            self.target_file_var.set(f"{page_count}页 -> {os.path.basename(file)}")
+            self.show_selected_file(file, self.target_file_var)
 
     def select_insert_file(self):
         """选择要插入的PDF文件"""
@@ -1563,10 +1373,46 @@ class PDFToolApp:
         )
 
         if file:
-            reader = pypdf.PdfReader(file)
-            page_count = len(reader.pages)
             self.filename_b = file
-            self.insert_file_var.set(f"{page_count}页 -> {os.path.basename(file)}")
+            self.show_selected_file(file, self.insert_file_var)
+
+    def add_insert_point(self):
+        """把当前选择的插入文件、插入位置和页码范围加入插入点列表"""
+        insert_file = getattr(self, "filename_b", None)
+        if not insert_file:
+            messagebox.showwarning("警告", "请先选择要插入的PDF文件！")
+            return
+
+        method = self.insert_method_var.get()
+        if method == "position":
+            try:
+                position = int(self.insert_position_var.get())
+            except ValueError:
+                messagebox.showerror("错误", "请输入有效的插入位置！")
+                return
+            position_text = f"第 {position} 页之前"
+        else:
+            position = method
+            position_text = "首部" if method == "head" else "尾部"
+
+        insert_range = self.insert_range_var.get().strip()
+        self.insert_points.append((position, insert_file, insert_range))
+        self.insert_points_listbox.insert(
+            tk.END,
+            f"{position_text}：{os.path.basename(insert_file)}"
+            f"（{insert_range or '全部页面'}）",
+        )
+
+    def remove_insert_point(self):
+        """移除选中的插入点"""
+        for index in reversed(self.insert_points_listbox.curselection()):
+            self.insert_points_listbox.delete(index)
+            del self.insert_points[index]
+
+    def clear_insert_points(self):
+        """清空插入点列表"""
+        self.insert_points_listbox.delete(0, tk.END)
+        self.insert_points = []
 
     def on_insert_method_change(self, *args):
         """插入方式改变时的处理"""
@@ -1592,148 +1438,18 @@ class PDFToolApp:
         self.config.set("MergeSettings", "filename_option", current_value)
         self.save_config()
 
-    def _add_pages_from_reader(self, writer, reader, range_str):
-        """根据页码范围添加页面到writer"""
-        total_pages = len(reader.pages)
-
-        if not range_str:
-            # 如果没有指定范围，则添加所有页面
-            for i in range(total_pages):
-                writer.add_page(reader.pages[i])
-        else:
-            # 解析范围字符串，例如："1-3,5"
-            ranges = []
-            for part in range_str.split(","):
-                part = part.strip()
-                if "-" in part:
-                    start, end = map(int, part.split("-"))
-                    ranges.extend(range(start - 1, end))  # 转换为0基索引
-                else:
-                    ranges.append(int(part) - 1)  # 转换为0基索引
-
-            # 去重并排序
-            ranges = sorted(list(set(ranges)))
-
-            # 检查范围有效性
-            for page_num in ranges:
-                if page_num < 0 or page_num >= total_pages:
-                    raise ValueError(f"页码 {page_num+1} 超出范围（1-{total_pages}）！")
-
-            # 添加指定页面
-            for page_index in ranges:
-                writer.add_page(reader.pages[page_index])
-
-    def process_watermark_enhanced(self):
-        """增强版水印功能 - 支持更多选项"""
-        # 检查是否选择了文件
-        input_file = getattr(self, "filename_a", None)
-        if not input_file:
-            messagebox.showwarning("警告", "请先选择PDF文件！")
-            return
-
-        if not os.path.exists(input_file):
-            messagebox.showerror("错误", "选择的文件不存在！")
-            return
-
-        try:
-            # 确定保存路径
-            save_directory = self.settings_manager.get_save_directory(
-                self.watermark_storage_widgets["location_var"],
-                self.watermark_storage_widgets["folder_path_var"],
-            )
-            if not save_directory:
-                messagebox.showerror("错误", "请选择有效的保存路径！")
-                return
-
-            # 生成文件名
-            input_filename = os.path.splitext(os.path.basename(input_file))[0]
-
-            def get_default_name():
-                return f"{datetime.now().strftime('%Y%m%d%H%M%S')}_watermarked"
-
-            filename = self.settings_manager.get_filename(
-                self.watermark_filename_widgets["filename_var"],
-                self.watermark_filename_widgets["entry"],
-                get_default_name,
-            )
-            if not filename:
-                filename = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_watermarked"
-
-            output_path = os.path.join(save_directory, filename + ".pdf")
-
-            # 检查文件是否已存在
-            if os.path.exists(output_path):
-                if not messagebox.askyesno(
-                    "文件已存在", f"文件 {filename}.pdf 已存在，是否覆盖？"
-                ):
-                    return
-
-            # 获取水印参数
-            watermark_type = self.watermark_type_var.get()
-
-            # 显示进度
-            progress_window = tk.Toplevel(self.root)
-            progress_window.title("正在添加水印...")
-            progress_window.geometry("300x100")
-            progress_window.transient(self.root)
-            progress_window.grab_set()
-
-            tk.Label(progress_window, text="正在处理水印，请稍候...").pack(pady=10)
-            progress_var = tk.DoubleVar()
-            progress_bar = ttk.Progressbar(
-                progress_window, variable=progress_var, maximum=100
-            )
-            progress_bar.pack(pady=10, padx=20, fill=tk.X)
-            progress_window.update()
-
-            if watermark_type == "text":
-                # 文字水印
-                self._add_enhanced_text_watermark(
-                    input_file, output_path, progress_var, progress_window
-                )
-            else:
-                # 图片水印
-                self._add_enhanced_image_watermark(
-                    input_file, output_path, progress_var, progress_window
-                )
-
-            progress_window.destroy()
-
-            # 完成后询问是否打开文件
-            result = messagebox.askyesno(
-                "成功", f"PDF水印添加完成！\n保存位置：{output_path}\n\n是否打开文件？"
-            )
-            if result:
-                import subprocess
-
-                try:
-                    if os.name == "nt":  # Windows
-                        os.startfile(output_path)
-                    elif os.name == "posix":  # macOS or Linux
-                        if sys.platform == "darwin":  # macOS
-                            subprocess.call(("open", output_path))
-                        else:  # Linux
-                            subprocess.call(("xdg-open", output_path))
-                except Exception as e:
-                    print(f"打开文件失败: {e}")
-
-        except Exception as e:
-            messagebox.showerror("错误", f"处理PDF文件时发生错误：{str(e)}")
-            import traceback
-
-            traceback.print_exc()
-
     def insert_pdf(self):
         """插入PDF文件"""
         # 检查是否选择了文件
         target_file = getattr(self, "filename_a", None)
         insert_file = getattr(self, "filename_b", None)
+        insert_points = list(self.insert_points)
 
         if not target_file:
             messagebox.showwarning("警告", "请先选择目标PDF文件！")
             return
 
-        if not insert_file:
+        if not insert_file and not insert_points:
             messagebox.showwarning("警告", "请先选择要插入的PDF文件！")
             return
 
@@ -1741,9 +1457,10 @@ class PDFToolApp:
             messagebox.showerror("错误", "目标文件不存在！")
             return
 
-        if not os.path.exists(insert_file):
-            messagebox.showerror("错误", "要插入的文件不存在！")
-            return
+        for source in [point[1] for point in insert_points] or [insert_file]:
+            if not os.path.exists(source):
+                messagebox.showerror("错误", f"要插入的文件不存在：{source}")
+                return
 
         try:
             # 确定保存路径
@@ -1755,9 +1472,6 @@ class PDFToolApp:
                 messagebox.showerror("错误", "请选择有效的保存路径！")
                 return
 
-            # 获取目标文件名（不含扩展名）
-            target_filename = os.path.splitext(os.path.basename(target_file))[0]
-
             # 生成文件名
             def get_default_name():
                 return f"{datetime.now().strftime('%Y%m%d%H%M%S')}_inserted"
@@ -1780,66 +1494,159 @@ class PDFToolApp:
                 if not result:
                     return
 
-            # 读取目标PDF文件
-            target_reader = pypdf.PdfReader(target_file)
-            target_total_pages = len(target_reader.pages)
+            if insert_points:
+                self.insert_multiple(target_file, insert_points, output_path)
+                return
 
-            # 读取要插入的PDF文件
-            insert_reader = pypdf.PdfReader(insert_file)
-            insert_total_pages = len(insert_reader.pages)
+            options = {
+                "method": self.insert_method_var.get(),
+                "position": int(self.insert_position_var.get()),
+                "insert_range": self.insert_range_var.get(),
+            }
+            if not self.check_pages_before_start(
+                lambda target_total, insert_total: (
+                    engine.insert_index(
+                        target_total, options["method"], options["position"]
+                    ),
+                    engine.PageSet.parse(options["insert_range"], insert_total),
+                ),
+                target_file,
+                insert_file,
+            ):
+                return
 
-            # 创建PDF写入器
-            writer = pypdf.PdfWriter()
+            self.run_in_background(
+                "正在插入PDF...",
+                engine.insert_pdf,
+                (target_file, insert_file, output_path),
+                options,
+                on_success=lambda result: messagebox.showinfo(
+                    "成功", f"PDF插入完成！\n保存位置：{output_path}"
+                ),
+                error_message="插入PDF时发生错误",
+            )
 
-            # 根据插入方式执行插入操作
-            method = self.insert_method_var.get()
+        except Exception as e:
+            messagebox.showerror("错误", f"插入PDF时发生错误：{str(e)}")
 
-            if method == "head":
-                # 在文档首部插入
-                self._add_pages_from_reader(
-                    writer, insert_reader, self.insert_range_var.get()
-                )
-                self._add_pages_from_reader(
-                    writer, target_reader, ""
-                )  # 添加所有目标页面
-            elif method == "tail":
-                # 在文档尾部插入
-                self._add_pages_from_reader(
-                    writer, target_reader, ""
-                )  # 添加所有目标页面
-                self._add_pages_from_reader(
-                    writer, insert_reader, self.insert_range_var.get()
-                )
-            else:  # position
-                # 在指定位置插入
-                position = int(self.insert_position_var.get()) - 1  # 转换为0基索引
-                if position < 0 or position > target_total_pages:
-                    messagebox.showerror(
-                        "错误", f"插入位置超出范围（1-{target_total_pages+1}）！"
-                    )
-                    return
+    def insert_multiple(self, target_file, insert_points, output_path):
+        """按插入点列表插入，所有插入点一次写出"""
+        sources = [insert_file for _, insert_file, _ in insert_points]
+        if not self.check_pages_before_start(
+            lambda target_total, *source_totals: engine.insert_plan(
+                target_file, target_total, insert_points, source_totals
+            ),
+            target_file,
+            *sources,
+        ):
+            return
 
-                # 先添加目标文件中位置之前的部分
-                for i in range(position):
-                    writer.add_page(target_reader.pages[i])
+        self.run_in_background(
+            "正在插入PDF...",
+            engine.insert_multiple,
+            (target_file, insert_points, output_path),
+            on_success=lambda result: messagebox.showinfo(
+                "成功",
+                f"PDF插入完成，共 {len(insert_points)} 个插入点！\n"
+                f"保存位置：{output_path}",
+            ),
+            error_message="插入PDF时发生错误",
+        )
 
-                # 添加要插入的页面
-                self._add_pages_from_reader(
-                    writer, insert_reader, self.insert_range_var.get()
-                )
+    def insert_pdf_folder(self):
+        """把选中的插入文件插入到文件夹中的所有PDF文件"""
+        insert_file = getattr(self, "filename_b", None)
+        if not insert_file or not os.path.exists(insert_file):
+            messagebox.showwarning("警告", "请先选择要插入的PDF文件！")
+            return
 
-                # 添加目标文件中位置之后的部分
-                for i in range(position, target_total_pages):
-                    writer.add_page(target_reader.pages[i])
+        try:
+            options = {
+                "method": self.insert_method_var.get(),
+                "position": int(self.insert_position_var.get()),
+                "insert_range": self.insert_range_var.get(),
+            }
+        except ValueError:
+            messagebox.showerror("错误", "请输入有效的插入位置！")
+            return
+        self.run_page_batch(
+            "插入", engine.insert_into_files, insert_file,
+            self.insert_storage_widgets, options,
+        )
 
-            # 写入文件
-            with open(output_path, "wb") as output_file:
-                writer.write(output_file)
+    def replace_pdf_folder(self):
+        """用选中的替换文件替换文件夹中所有PDF文件的页面"""
+        replace_file = getattr(self, "filename_b", None)
+        if not replace_file or not os.path.exists(replace_file):
+            messagebox.showwarning("警告", "请先选择用来替换的PDF文件！")
+            return
 
-            messagebox.showinfo("成功", f"PDF插入完成！\n保存位置：{output_path}")
+        try:
+            options = {
+                "method": self.replace_method_var.get(),
+                "position": int(self.replace_position_var.get()),
+                "target_range": self.replace_range_var.get(),
+                "source_range": self.replace_source_range_var.get(),
+            }
+        except ValueError:
+            messagebox.showerror("错误", "请输入有效的替换位置！")
+            return
+        options["mode"] = self.replace_output_mode()
+        self.run_page_batch(
+            "替换", engine.replace_in_files, replace_file,
+            self.replace_storage_widgets, options,
+        )
+
+    def run_page_batch(self, action, func, source_file, storage_widgets, options):
+        """
+        选择目标文件夹，批量插入或替换页面，结果汇总表保存在输出文件夹中
+
+        Args:
+            action: 操作名称（插入、替换），用于提示
+            func: engine.insert_into_files 或 engine.replace_in_files
+            source_file: 插入（替换）文件路径
+            storage_widgets: 存储位置设置控件
+            options: 插入（替换）参数
+        """
+        input_dir = filedialog.askdirectory(title="选择包含目标PDF文件的文件夹")
+        if not input_dir:
+            return
 
-        except Exception as e:
-            messagebox.showerror("错误", f"插入PDF时发生错误：{str(e)}")
+        save_directory = self.settings_manager.get_save_directory(
+            storage_widgets["location_var"], storage_widgets["folder_path_var"]
+        )
+        if not save_directory:
+            messagebox.showerror("错误", "请选择有效的保存路径！")
+            return
+        summary_path = os.path.join(
+            save_directory, f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{action}结果.csv"
+        )
+
+        def on_success(result):
+            message = (
+                f"批量{action}完成！\n成功 {len(result['outputs'])} 个文件"
+                f"\n保存位置：{save_directory}\n结果汇总：{summary_path}"
+            )
+            if result["errors"]:
+                failed = "\n".join(
+                    f"{os.path.basename(path)}：{error}"
+                    for path, error in result["errors"].items()
+                )
+                message += f"\n\n失败 {len(result['errors'])} 个文件：\n{failed}"
+            messagebox.showinfo("完成", message)
+
+        self.run_in_background(
+            f"正在批量{action}...",
+            func,
+            (source_file, input_dir, save_directory),
+            dict(options, summary_path=summary_path),
+            on_success=on_success,
+            error_message=f"批量{action}时发生错误",
+        )
+
+    def replace_output_mode(self):
+        """替换的输出方式：增量更新或重写整个文件"""
+        return "incremental" if self.replace_incremental_var.get() else "rewrite"
 
     def replace_pdf(self):
         """替换PDF文件中的页面"""
@@ -1873,9 +1680,6 @@ class PDFToolApp:
                 messagebox.showerror("错误", "请选择有效的保存路径！")
                 return
 
-            # 获取目标文件名（不含扩展名）
-            target_filename = os.path.splitext(os.path.basename(target_file))[0]
-
             # 生成文件名
             if self.replace_filename_widgets["filename_var"].get() == "default":
                 output_filename = (
@@ -1900,174 +1704,34 @@ class PDFToolApp:
                 if not result:
                     return
 
-            # 读取目标PDF文件
-            target_reader = pypdf.PdfReader(target_file)
-            target_total_pages = len(target_reader.pages)
-
-            # 读取替换PDF文件
-            replace_reader = pypdf.PdfReader(replace_file)
-            replace_total_pages = len(replace_reader.pages)
-
-            # 创建PDF写入器
-            writer = pypdf.PdfWriter()
-
-            # 根据替换方式执行替换操作
-            method = self.replace_method_var.get()
-
-            if method == "single":
-                # 替换单个页面
-                replace_position = int(self.replace_position_var.get())  # 1基索引
-
-                # 检查替换位置有效性
-                if replace_position < 1 or replace_position > target_total_pages:
-                    messagebox.showerror(
-                        "错误", f"替换位置超出范围（1-{target_total_pages}）！"
-                    )
-                    return
-
-                # 解析替换源范围
-                source_ranges = self._parse_page_ranges(
-                    self.replace_source_range_var.get(), replace_total_pages
-                )
-
-                # 检查替换页数是否匹配
-                if len(source_ranges) != 1:
-                    messagebox.showerror(
-                        "错误", "替换单个页面时，替换文件只能指定一个页面！"
-                    )
-                    return
-
-                # 添加目标文件中替换位置之前的部分
-                for i in range(replace_position - 1):
-                    writer.add_page(target_reader.pages[i])
-
-                # 添加替换文件中指定的页面
-                source_page_index = source_ranges[0] - 1  # 转换为0基索引
-                writer.add_page(replace_reader.pages[source_page_index])
-
-                # 添加目标文件中替换位置之后的部分
-                for i in range(replace_position, target_total_pages):
-                    writer.add_page(target_reader.pages[i])
-
-            else:  # multi
-                # 替换多个页面
-                range_str = self.replace_range_var.get()
-                if not range_str:
-                    messagebox.showerror("错误", "请输入被替换的页码范围！")
-                    return
-
-                # 解析被替换的页码范围
-                target_ranges = self._parse_page_ranges(range_str, target_total_pages)
-
-                # 解析替换源范围
-                source_ranges = self._parse_page_ranges(
-                    self.replace_source_range_var.get(), replace_total_pages
-                )
-
-                # 检查替换页数是否匹配
-                if len(target_ranges) != len(source_ranges):
-                    messagebox.showerror(
-                        "错误",
-                        f"被替换页数({len(target_ranges)})与替换页数({len(source_ranges)})不匹配！",
-                    )
-                    return
-
-                # 构建替换映射 {被替换页码: 替换页码索引}
-                replace_map = dict(
-                    zip(target_ranges, [p - 1 for p in source_ranges])
-                )  # 替换页码转为0基索引
-
-                # 逐页处理
-                for i in range(target_total_pages):
-                    page_num = i + 1  # 1基索引
-                    if page_num in replace_map:
-                        # 使用替换文件中的页面
-                        source_page_index = replace_map[page_num]
-                        writer.add_page(replace_reader.pages[source_page_index])
-                    else:
-                        # 使用原始目标文件中的页面
-                        writer.add_page(target_reader.pages[i])
-
-            # 写入文件
-            with open(output_path, "wb") as output_file:
-                writer.write(output_file)
-
-            messagebox.showinfo("成功", f"PDF页面替换完成！\n保存位置：{output_path}")
-
-        except Exception as e:
-            messagebox.showerror("错误", f"替换PDF页面时发生错误：{str(e)}")
-
-    def process_encrypt(self):
-        """处理加密操作"""
-        # 检查是否选择了文件
-        input_file = getattr(self, "filename_a", None)
-        if not input_file:
-            messagebox.showwarning("警告", "请先选择PDF文件！")
-            return
-
-        if not os.path.exists(input_file):
-            messagebox.showerror("错误", "选择的文件不存在！")
-            return
-
-        password = self.encrypt_password_var.get()
-        if not password:
-            messagebox.showwarning("警告", "请输入密码！")
-            return
-
-        try:
-            # 确定保存路径
-            save_directory = self.settings_manager.get_save_directory(
-                self.encrypt_storage_widgets["location_var"],
-                self.encrypt_storage_widgets["folder_path_var"],
-            )
-            if not save_directory:
-                messagebox.showerror("错误", "请选择有效的保存路径！")
+            options = {
+                "method": self.replace_method_var.get(),
+                "position": int(self.replace_position_var.get()),
+                "target_range": self.replace_range_var.get(),
+                "source_range": self.replace_source_range_var.get(),
+            }
+            if not self.check_pages_before_start(
+                lambda target_total, replace_total: engine.build_replace_map(
+                    target_total, replace_total, **options
+                ),
+                target_file,
+                replace_file,
+            ):
                 return
 
-            # 获取输入文件名（不含扩展名）
-            input_filename = os.path.splitext(os.path.basename(input_file))[0]
-
-            # 生成文件名
-            def get_default_name():
-                return f"{datetime.now().strftime('%Y%m%d%H%M%S')}_encrypted"
-
-            filename = self.settings_manager.get_filename(
-                self.encrypt_filename_widgets["filename_var"],
-                self.encrypt_filename_widgets["entry"],
-                get_default_name,
+            self.run_in_background(
+                "正在替换页面...",
+                engine.replace_pdf,
+                (target_file, replace_file, output_path),
+                dict(options, mode=self.replace_output_mode()),
+                on_success=lambda result: messagebox.showinfo(
+                    "成功", f"PDF页面替换完成！\n保存位置：{output_path}"
+                ),
+                error_message="替换PDF页面时发生错误",
             )
-            if not filename:
-                filename = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_encrypted"
-
-            output_path = os.path.join(save_directory, filename + ".pdf")
-
-            # 检查文件是否已存在
-            if os.path.exists(output_path):
-                result = messagebox.askyesno(
-                    "文件已存在", f"文件 {filename}.pdf 已存在，是否覆盖？"
-                )
-                if not result:
-                    return
-
-            # 读取PDF文件并加密
-            reader = pypdf.PdfReader(input_file)
-            writer = pypdf.PdfWriter()
-
-            # 复制所有页面
-            for page in reader.pages:
-                writer.add_page(page)
-
-            # 设置密码
-            writer.encrypt(password)
-
-            # 写入文件
-            with open(output_path, "wb") as output_file:
-                writer.write(output_file)
-
-            messagebox.showinfo("成功", f"PDF文件加密完成！\n保存位置：{output_path}")
 
         except Exception as e:
-            messagebox.showerror("错误", f"处理PDF文件时发生错误：{str(e)}")
+            messagebox.showerror("错误", f"替换PDF页面时发生错误：{str(e)}")
 
     def setup_replace_page(self):
         """设置替换页面的内容"""
@@ -2185,6 +1849,14 @@ class PDFToolApp:
             fill=tk.X, pady=5
         )
 
+        # 增量更新：只追加替换的页面，不重写整个文件
+        self.replace_incremental_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            replace_method_frame,
+            text="增量更新（只追加替换的页面，大文件更快）",
+            variable=self.replace_incremental_var,
+        ).pack(anchor=tk.W, padx=30, pady=(0, 5))
+
         # 绑定替换方式变化事件
         self.replace_method_var.trace("w", self.on_replace_method_change)
 
@@ -2221,6 +1893,12 @@ class PDFToolApp:
         )
         replace_btn.pack(pady=5)
 
+        ttk.Button(
+            self.replace_filename_widgets["frame"],
+            text="批量替换多个文件（选择文件夹）",
+            command=self.replace_pdf_folder,
+        ).pack(pady=5)
+
     def select_replace_target_file(self):
         """选择被替换PDF文件"""
         file = filedialog.askopenfilename(
@@ -2229,12 +1907,8 @@ class PDFToolApp:
         )
 
         if file:
-            reader = pypdf.PdfReader(file)
-            page_count = len(reader.pages)
             self.filename_a = file
-            self.replace_target_file_var.set(
-                f"{page_count}页 -> {os.path.basename(file)}"
-            )
+            self.show_selected_file(file, self.replace_target_file_var)
 
     def select_replace_file(self):
         """选择用来替换的PDF文件"""
@@ -2244,10 +1918,8 @@ class PDFToolApp:
         )
 
         if file:
-            reader = pypdf.PdfReader(file)
-            page_count = len(reader.pages)
             self.filename_b = file
-            self.replace_file_var.set(f"{page_count}页 -> {os.path.basename(file)}")
+            self.show_selected_file(file, self.replace_file_var)
 
     def on_replace_method_change(self, *args):
         """替换方式改变时的处理"""
@@ -2275,29 +1947,6 @@ class PDFToolApp:
         self.config.set("MergeSettings", "filename_option", current_value)
         self.save_config()
 
-    # remove this method as it's now handled by settings_manager
-
-    def _parse_page_ranges(self, range_str, max_page):
-        """解析页码范围字符串，返回页码列表"""
-        if not range_str:
-            return list(range(1, max_page + 1))
-
-        ranges = []
-        for part in range_str.split(","):
-            part = part.strip()
-            if "-" in part:
-                start, end = map(int, part.split("-"))
-                ranges.extend(range(start, end + 1))
-            else:
-                ranges.append(int(part))
-
-        # 验证页码范围
-        for page_num in ranges:
-            if page_num < 1 or page_num > max_page:
-                raise ValueError(f"页码 {page_num} 超出范围（1-{max_page}）！")
-
-        return sorted(list(set(ranges)))
-
     def setup_extract_image_page(self):
         """设置图片提取页面的内容"""
         # 添加标题
@@ -2394,12 +2043,8 @@ class PDFToolApp:
         )
 
         if file:
-            reader = pypdf.PdfReader(file)
-            page_count = len(reader.pages)
             self.filename_a = file
-            self.extract_image_file_var.set(
-                f"{page_count}页 -> {os.path.basename(file)} "
-            )
+            self.show_selected_file(file, self.extract_image_file_var)
 
     def toggle_page_range(self):
         """切换页面范围输入框的显示状态"""
@@ -2437,106 +2082,39 @@ class PDFToolApp:
                 messagebox.showerror("错误", "请选择有效的保存路径！")
                 return
 
-            # 创建图片保存目录
-            pdf_filename = os.path.splitext(os.path.basename(input_file))[0]
-            images_dir = os.path.join(save_directory, f"{pdf_filename}_images")
-            os.makedirs(images_dir, exist_ok=True)
-
             # 获取要处理的页面范围
-            pdf_document = fitz.open(input_file)  # 打开PDF文件
-            total_pages = len(pdf_document)
-
-            if self.extract_all_pages_var.get():
-                # 提取所有页面
-                page_numbers = list(range(total_pages))
-            else:
-                # 解析页面范围
+            range_str = ""
+            if not self.extract_all_pages_var.get():
                 range_str = self.extract_page_range_var.get()
                 if not range_str:
                     messagebox.showwarning("警告", "请输入页面范围！")
-                    pdf_document.close()
                     return
 
-                page_numbers = []
-                for part in range_str.split(","):
-                    part = part.strip()
-                    if "-" in part:
-                        start, end = map(int, part.split("-"))
-                        # 转换为0基索引，并确保范围有效
-                        start = max(0, start - 1)
-                        end = min(total_pages, end)
-                        page_numbers.extend(range(start, end))
-                    else:
-                        page_num = int(part) - 1
-                        if 0 <= page_num < total_pages:
-                            page_numbers.append(page_num)
-
-                # 检查页面范围有效性
-                for page_num in page_numbers:
-                    if page_num < 0 or page_num >= total_pages:
-                        pdf_document.close()
-                        messagebox.showerror(
-                            "错误", f"页码 {page_num+1} 超出范围（1-{total_pages}）！"
-                        )
-                        return
-
-            # 提取图片
-            image_count = 0
-            processed_pages = len(page_numbers)
-
-            for i, page_num in enumerate(page_numbers):
-                page = pdf_document[page_num]
-
-                # 获取页面的图片列表
-                image_list = page.get_images(full=True)
-
-                for img_index, img in enumerate(image_list):
-                    xref = img[0]  # 获取图片的xref引用
-
-                    # 提取图片
-                    base_image = pdf_document.extract_image(xref)
-                    if base_image:
-                        image_bytes = base_image["image"]
-                        image_ext = base_image["ext"]
-
-                        # 生成图片文件名
-                        image_filename = (
-                            f"page_{page_num+1:03d}_img_{img_index+1:03d}.{image_ext}"
-                        )
-                        image_path = os.path.join(images_dir, image_filename)
-
-                        # 保存图片
-                        with open(image_path, "wb") as img_file:
-                            img_file.write(image_bytes)
-
-                        image_count += 1
-
-                # 可选：显示进度
-                if processed_pages > 10:  # 如果页面较多，显示进度
-                    if i % 5 == 0 or i == processed_pages - 1:
-                        print(f"正在处理第 {i+1}/{processed_pages} 页...")
-
-            pdf_document.close()
-
-            # 显示结果
-            if image_count > 0:
-                messagebox.showinfo(
-                    "完成",
-                    f"✅ 图片提取完成！\n"
-                    f"• 共处理 {len(page_numbers)} 页\n"
-                    f"• 提取 {image_count} 张图片\n"
-                    f"• 保存路径：{images_dir}",
-                )
-            else:
-                messagebox.showinfo(
-                    "提示",
-                    f"处理完成，但在指定页面中未找到图片。\n"
-                    f"处理了 {len(page_numbers)} 页，未找到图片。",
-                )
+            def on_success(result):
+                # 显示结果
+                if result["image_count"] > 0:
+                    messagebox.showinfo(
+                        "完成",
+                        f"✅ 图片提取完成！\n"
+                        f"• 共处理 {result['page_count']} 页\n"
+                        f"• 提取 {result['image_count']} 张图片\n"
+                        f"• 保存路径：{result['images_dir']}",
+                    )
+                else:
+                    messagebox.showinfo(
+                        "提示",
+                        f"处理完成，但在指定页面中未找到图片。\n"
+                        f"处理了 {result['page_count']} 页，未找到图片。",
+                    )
+
+            self.run_in_background(
+                "正在提取图片...",
+                engine.extract_images,
+                (input_file, save_directory, range_str),
+                on_success=on_success,
+            )
 
         except Exception as e:
-            if "pdf_document" in locals():
-                pdf_document.close()
             messagebox.showerror("错误", f"处理PDF文件时发生错误：{str(e)}")
 
     def setup_encrypt_page(self):
@@ -2621,10 +2199,8 @@ class PDFToolApp:
         )
 
         if file:
-            reader = pypdf.PdfReader(file)
-            page_count = len(reader.pages)
             self.filename_a = file
-            self.encrypt_file_var.set(f"{page_count}页 -> {os.path.basename(file)}")
+            self.show_selected_file(file, self.encrypt_file_var)
 
     def on_encrypt_save_location_change(self, *args):
         """加密存储位置选项改变时的处理"""
@@ -2692,28 +2268,29 @@ class PDFToolApp:
                 if not result:
                     return
 
-            # 读取PDF文件并加密
-            reader = pypdf.PdfReader(input_file)
-            writer = pypdf.PdfWriter()
-
-            # 复制所有页面
-            for page in reader.pages:
-                writer.add_page(page)
-
-            # 设置密码
-            writer.encrypt(password)
-
-            # 写入文件
-            with open(output_path, "wb") as output_file:
-                writer.write(output_file)
-
-            messagebox.showinfo("成功", f"PDF文件加密完成！\n保存位置：{output_path}")
+            self.run_in_background(
+                "正在加密PDF...",
+                engine.encrypt_pdf,
+                (input_file, output_path, password),
+                on_success=lambda result: messagebox.showinfo(
+                    "成功", f"PDF文件加密完成！\n保存位置：{output_path}"
+                ),
+            )
 
         except Exception as e:
             messagebox.showerror("错误", f"处理PDF文件时发生错误：{str(e)}")
 
 
 if __name__ == "__main__":
+    # 打包成 exe 后多进程需要
+    multiprocessing.freeze_support()
+
+    # 带参数运行时进入命令行批处理模式：python pdf工具合集.py 清单.json -j 8
+    if len(sys.argv) > 1:
+        from pdf_tools_engine.batch import main
+
+        sys.exit(main(sys.argv[1:]))
+
     root = tk.Tk()
     app = PDFToolApp(root)
     root.mainloop()
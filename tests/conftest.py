@@ -0,0 +1,60 @@
+"""测试用的PDF文件"""
+
+import os
+import sys
+
+import pypdf
+import pytest
+from reportlab.pdfgen import canvas
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def write_labeled_pdf(path, label, count, size=(200, 200)):
+    """生成每页写有 "标签 页码" 的PDF文件（传统交叉引用表）"""
+    pdf = canvas.Canvas(str(path), pagesize=size)
+    for page_num in range(1, count + 1):
+        pdf.drawString(20, 100, f"{label} {page_num}")
+        pdf.showPage()
+    pdf.save()
+    return str(path)
+
+
+def page_labels(path):
+    """按顺序返回每页的文字"""
+    reader = pypdf.PdfReader(path)
+    return [page.extract_text().strip() for page in reader.pages]
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """make_pdf(标签, 页数) 在临时目录中生成PDF文件，返回路径"""
+
+    def make(label, count, size=(200, 200)):
+        return write_labeled_pdf(tmp_path / f"{label}.pdf", label, count, size)
+
+    return make
+
+
+@pytest.fixture
+def labels():
+    """labels(路径) 按顺序返回每页的文字"""
+    return page_labels
+
+
+@pytest.fixture
+def make_encrypted(make_pdf, tmp_path):
+    """
+    make_encrypted(标签, 页数, user_password="") 生成加密的PDF文件
+
+    user_password 为空时只设置权限密码，不用密码就能打开。
+    """
+
+    def make(label, count, user_password=""):
+        writer = pypdf.PdfWriter(clone_from=make_pdf(label, count))
+        writer.encrypt(user_password, owner_password="owner", algorithm="RC4-128")
+        path = str(tmp_path / f"{label}_encrypted.pdf")
+        writer.write(path)
+        return path
+
+    return make
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from pdf_tools_engine.batch import load_manifest, main, resolve_job, run_jobs
+from pdf_tools_engine.merge import merge_pdfs
+
+
+def write_manifest(tmp_path, jobs):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps(jobs), encoding="utf-8")
+    return str(path)
+
+
+def test_resolve_job_converts_strings():
+    func, kwargs = resolve_job(
+        {"op": "merge", "input_files": ["a.pdf"], "output_path": "out.pdf",
+         "dedup": "no", "prefetch": "3"}
+    )
+    assert func is merge_pdfs
+    assert kwargs["dedup"] is False
+    assert kwargs["prefetch"] == 3
+
+    _, kwargs = resolve_job(
+        {"op": "watermark", "type": "text", "color": "0.1;0.2,0.3",
+         "page_indices": "0;2;"}
+    )
+    assert kwargs["color"] == (0.1, 0.2, 0.3)
+    assert kwargs["page_indices"] == [0, 2]
+
+
+def test_resolve_job_errors():
+    with pytest.raises(ValueError, match="未知的操作"):
+        resolve_job({"op": "compress"})
+    with pytest.raises(ValueError, match="不支持参数"):
+        resolve_job({"op": "split", "nonsense": 1})
+    with pytest.raises(ValueError, match="的值无效"):
+        resolve_job({"op": "merge", "dedup": "maybe"})
+
+
+def test_csv_manifest(tmp_path):
+    path = tmp_path / "jobs.csv"
+    path.write_text(
+        "op,input_files,output_path,dedup\n"
+        "merge,a.pdf; b.pdf,out.pdf,\n",
+        encoding="utf-8",
+    )
+    assert load_manifest(str(path)) == [
+        {"op": "merge", "input_files": ["a.pdf", "b.pdf"], "output_path": "out.pdf"}
+    ]
+
+
+def test_run_jobs_keeps_order_and_reports_failures(make_pdf, labels, tmp_path):
+    a = make_pdf("A", 1)
+    b = make_pdf("B", 2)
+    output = str(tmp_path / "sub" / "ab.pdf")
+    jobs = [
+        {"op": "merge", "input_files": [a, "missing.pdf"],
+         "output_path": str(tmp_path / "bad.pdf")},
+        {"op": "merge", "input_files": [a, b], "output_path": output},
+    ]
+    done = []
+    results = run_jobs(jobs, workers=1, on_done=lambda index, _: done.append(index))
+    assert done == [0, 1]
+    assert [r["ok"] for r in results] == [False, True]
+    assert "InputFileError" in results[0]["error"]
+    assert labels(output) == ["A 1", "B 1", "B 2"]
+
+
+def test_main_exit_codes(make_pdf, tmp_path, capsys):
+    a = make_pdf("A", 1)
+    good = {"op": "merge", "input_files": [a], "output_path": str(tmp_path / "o.pdf")}
+    bad = {"op": "merge", "input_files": [str(tmp_path / "missing.pdf")],
+           "output_path": str(tmp_path / "x.pdf")}
+
+    assert main([write_manifest(tmp_path, [good]), "-j", "1"]) == 0
+    assert main([write_manifest(tmp_path, [good, bad]), "-j", "2"]) == 1
+    assert "失败 1 个" in capsys.readouterr().out
+    assert main([str(tmp_path / "none.json")]) == 2
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+    assert main([str(tmp_path / "broken.json")]) == 2
@@ -0,0 +1,110 @@
+import os
+
+import pytest
+
+from pdf_tools_engine.doccache import (
+    DocumentCache,
+    borrow_fitz,
+    borrow_reader,
+    release_file,
+    set_document_cache,
+)
+
+
+@pytest.fixture
+def document_cache():
+    cache = DocumentCache()
+    set_document_cache(cache)
+    yield cache
+    set_document_cache(None)
+    cache.close()
+
+
+class Opener:
+    """记录打开和关闭的次数，文档为 (路径, 序号)"""
+
+    def __init__(self):
+        self.opened = []
+        self.closed = []
+
+    def open(self, file_path):
+        document = (file_path, len(self.opened))
+        self.opened.append(document)
+        return document
+
+    def close(self, document):
+        self.closed.append(document)
+
+
+def test_borrowed_documents_are_reused(make_pdf, document_cache):
+    path = make_pdf("A", 2)
+    with borrow_reader(path) as first:
+        assert len(first.pages) == 2
+    with borrow_reader(path) as second:
+        assert second is first
+    with borrow_fitz(path) as document:
+        assert document.page_count == 2
+    with borrow_fitz(path) as again:
+        assert again is document
+    assert document_cache.memory_used == 2 * os.path.getsize(path)
+
+
+def test_changed_file_is_reopened(make_pdf, document_cache):
+    path = make_pdf("A", 2)
+    with borrow_reader(path) as first:
+        pass
+    assert make_pdf("A", 3) == path
+    with borrow_reader(path) as second:
+        assert second is not first
+        assert len(second.pages) == 3
+
+
+def test_document_in_use_is_not_shared(make_pdf):
+    path = make_pdf("A", 1)
+    cache = DocumentCache()
+    opener = Opener()
+    with cache.borrow(path, "test", opener.open, opener.close) as first:
+        with cache.borrow(path, "test", opener.open, opener.close) as second:
+            assert second is not first
+        # 借用期间另开的一份用完即关闭
+        assert opener.closed == [second]
+    with cache.borrow(path, "test", opener.open, opener.close) as third:
+        assert third is first
+
+
+def test_memory_budget_evicts_least_recently_used(make_pdf):
+    a, b, c = make_pdf("A", 1), make_pdf("B", 1), make_pdf("C", 1)
+    cache = DocumentCache(memory_budget=2 * max(map(os.path.getsize, [a, b, c])))
+    opener = Opener()
+    for path in (a, b, a, c):
+        with cache.borrow(path, "test", opener.open, opener.close):
+            pass
+    assert [document[0] for document in opener.closed] == [b]
+    assert cache.memory_used <= cache.memory_budget
+
+    # 超过预算的文件不缓存，用完即关闭
+    small = DocumentCache(memory_budget=1)
+    with small.borrow(a, "test", opener.open, opener.close) as document:
+        pass
+    assert opener.closed[-1] is document
+    assert small.memory_used == 0
+
+
+def test_evicted_while_borrowed_closes_on_return(make_pdf):
+    path = make_pdf("A", 1)
+    cache = DocumentCache()
+    opener = Opener()
+    with cache.borrow(path, "test", opener.open, opener.close) as document:
+        cache.invalidate(path)
+        assert opener.closed == []
+    assert opener.closed == [document]
+
+
+def test_release_file(make_pdf, document_cache):
+    path = make_pdf("A", 1)
+    with borrow_reader(path) as first:
+        pass
+    release_file(path)
+    assert document_cache.memory_used == 0
+    with borrow_reader(path) as second:
+        assert second is not first
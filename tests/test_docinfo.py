@@ -0,0 +1,88 @@
+import pytest
+
+from pdf_tools_engine import docinfo
+from pdf_tools_engine.docinfo import (
+    DocumentInfoCache,
+    cached_document_info,
+    document_info,
+    page_count,
+    set_document_info_cache,
+)
+from pdf_tools_engine.errors import InputFileError
+
+
+@pytest.fixture
+def info_cache(tmp_path):
+    cache = DocumentInfoCache(str(tmp_path / "info.sqlite3"))
+    set_document_info_cache(cache)
+    yield cache
+    set_document_info_cache(None)
+    cache.close()
+
+
+@pytest.fixture
+def count_reads(monkeypatch):
+    """统计完整解析文件的次数"""
+    reads = []
+    read = docinfo.read_document_info
+
+    def counting_read(file_path):
+        reads.append(file_path)
+        return read(file_path)
+
+    monkeypatch.setattr(docinfo, "read_document_info", counting_read)
+    return reads
+
+
+def test_read_document_info(make_pdf):
+    path = make_pdf("A", 3, size=(300, 400))
+    info = docinfo.read_document_info(path)
+    assert info["page_count"] == 3
+    assert info["encrypted"] is False
+    assert info["page_sizes"] == [[300, 400]] * 3
+    assert info["image_xrefs"] == [[], [], []]
+    data = open(path, "rb").read()
+    assert data[info["xref_offset"]:].startswith(b"xref")
+
+
+def test_cache_hit(make_pdf, info_cache, count_reads):
+    path = make_pdf("A", 3)
+    first = document_info(path)
+    assert document_info(path) == first
+    assert cached_document_info(path) == first
+    assert len(count_reads) == 1
+
+    # 另开一个连接（相当于下次启动程序）也能命中
+    reopened = DocumentInfoCache(info_cache.db_path)
+    assert document_info(path, reopened) == first
+    assert len(count_reads) == 1
+    reopened.close()
+
+
+def test_cache_invalidated_when_file_changes(make_pdf, info_cache, count_reads):
+    path = make_pdf("A", 3)
+    assert document_info(path)["page_count"] == 3
+    assert make_pdf("A", 5) == path
+    assert cached_document_info(path) is None
+    assert document_info(path)["page_count"] == 5
+    assert len(count_reads) == 2
+
+
+def test_quick_page_count_is_cached(make_pdf, info_cache, count_reads):
+    path = make_pdf("A", 4)
+    assert page_count(path) == 4
+    assert cached_document_info(path) == {"page_count": 4, "encrypted": False}
+    assert page_count(path) == 4
+    assert count_reads == []
+
+    # 只有页数的缓存不完整，需要完整信息时解析文件并更新缓存
+    assert len(document_info(path)["page_sizes"]) == 4
+    assert "page_sizes" in cached_document_info(path)
+    assert len(count_reads) == 1
+
+
+def test_page_count_rejects_files_needing_password(make_encrypted, info_cache):
+    path = make_encrypted("A", 2, user_password="secret")
+    with pytest.raises(InputFileError):
+        page_count(path)
+    assert cached_document_info(path)["encrypted"] is True
@@ -0,0 +1,83 @@
+import glob
+import os
+import shutil
+
+import pytest
+
+from pdf_tools_engine import fonts
+from pdf_tools_engine.fonts import FALLBACK_FONT_NAME, FontIndex, register_chinese_fonts
+from pdf_tools_engine.watermark_batch import watermark_files
+
+SYSTEM_FONTS = sorted(glob.glob("/usr/share/fonts/truetype/dejavu/DejaVuSans*.ttf"))
+
+
+@pytest.fixture
+def font_dir(tmp_path):
+    """复制两个系统字体到临时目录，再放一个无法解析的字体文件"""
+    if len(SYSTEM_FONTS) < 2:
+        pytest.skip("没有可用的 TrueType 字体")
+    directory = tmp_path / "fonts"
+    directory.mkdir()
+    for path in SYSTEM_FONTS[:2]:
+        shutil.copy(path, directory)
+    (directory / "broken.ttf").write_bytes(b"not a font")
+    return directory
+
+
+def test_index_is_cached_on_disk(font_dir, tmp_path):
+    index_path = str(tmp_path / "index.json")
+    index = FontIndex(index_path)
+    assert index.refresh([str(font_dir)]) == 3
+    assert "error" in index.files[str(font_dir / "broken.ttf")]
+    assert index.refresh([str(font_dir)]) == 0
+
+    # 下次启动直接读取索引文件，只重新解析变化的文件
+    reopened = FontIndex(index_path)
+    assert reopened.files == index.files
+    changed = font_dir / os.path.basename(SYSTEM_FONTS[0])
+    os.utime(changed, (1, 1))
+    (font_dir / "broken.ttf").unlink()
+    assert reopened.refresh([str(font_dir)]) == 1
+    assert str(font_dir / "broken.ttf") not in reopened.files
+    assert FontIndex(index_path).files == reopened.files
+
+
+def test_best_face_by_coverage(font_dir, tmp_path):
+    index = FontIndex(str(tmp_path / "index.json"))
+    index.refresh([str(font_dir)])
+    path, subfont, face, covered = index.best_face("WM ab")
+    assert path.startswith(str(font_dir)) and subfont == 0
+    assert covered == 4
+    assert index.best_face("中文")[3] == 0
+
+
+def test_register_fonts_once_per_text(font_dir, tmp_path, monkeypatch):
+    index = FontIndex(str(tmp_path / "index.json"))
+    index.refresh([str(font_dir)])
+    monkeypatch.setattr(fonts, "_font_index", index)
+    monkeypatch.setattr(fonts, "_registered_fonts", {})
+    monkeypatch.setattr(fonts, "_font_choices", {})
+
+    name = register_chinese_fonts("WM")
+    assert name != FALLBACK_FONT_NAME
+    assert register_chinese_fonts("MW") == name
+    assert len(fonts._registered_fonts) == 1
+    # 没有字体覆盖的文字使用英文字体
+    assert register_chinese_fonts("中文") == FALLBACK_FONT_NAME
+
+
+def test_single_worker_batch_refreshes_index(make_pdf, tmp_path, monkeypatch):
+    if os.name == "nt":
+        pytest.skip("索引文件位置按 XDG_CACHE_HOME 设置")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr(fonts, "_font_index", None)
+    monkeypatch.setattr(fonts, "_registered_fonts", {})
+    monkeypatch.setattr(fonts, "_font_choices", {})
+
+    result = watermark_files(
+        [make_pdf("A", 1)], str(tmp_path / "out"), "text", workers=1, text="WM"
+    )
+    assert result["errors"] == {}
+    # 在当前进程内处理时也先刷新索引，而不是只读取（可能不存在的）索引文件
+    assert fonts._font_index.files or not fonts.font_directories()
+    assert fonts._font_index.index_path == fonts.font_index_path()
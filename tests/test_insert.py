@@ -0,0 +1,38 @@
+import pytest
+
+from pdf_tools_engine.errors import InputFileError
+from pdf_tools_engine.insert import insert_multiple, insert_pdf
+
+
+def test_insert(make_pdf, labels, tmp_path):
+    a = make_pdf("A", 3)
+    b = make_pdf("B", 3)
+    output = str(tmp_path / "inserted.pdf")
+    insert_pdf(a, b, output, position=2, insert_range="1,3")
+    assert labels(output) == ["A 1", "B 1", "B 3", "A 2", "A 3"]
+    insert_pdf(a, b, output, method="tail", insert_range="2")
+    assert labels(output) == ["A 1", "A 2", "A 3", "B 2"]
+
+
+def test_insert_multiple(make_pdf, labels, tmp_path):
+    a = make_pdf("A", 3)
+    b = make_pdf("B", 2)
+    output = str(tmp_path / "inserted.pdf")
+    insert_multiple(
+        a, [("tail", b, "2"), (2, b, "1"), ("head", b, ""), (2, b, "2")], output
+    )
+    assert labels(output) == [
+        "B 1", "B 2", "A 1", "B 1", "B 2", "A 2", "A 3", "B 2",
+    ]
+
+
+def test_insert_owner_password_only(make_pdf, make_encrypted, labels, tmp_path):
+    a = make_encrypted("A", 2)
+    b = make_encrypted("B", 1)
+    output = str(tmp_path / "inserted.pdf")
+    insert_pdf(a, b, output, position=2)
+    assert labels(output) == ["A 1", "B 1", "A 2"]
+
+    locked = make_encrypted("C", 1, user_password="secret")
+    with pytest.raises(InputFileError):
+        insert_pdf(make_pdf("D", 1), locked, output, method="tail")
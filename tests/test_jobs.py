@@ -0,0 +1,95 @@
+import time
+
+from pdf_tools_engine.docinfo import page_count
+from pdf_tools_engine.jobs import BackgroundJob, JobExecutor
+from pdf_tools_engine.merge import merge_pdfs
+from pdf_tools_engine.split import split_pdf
+
+
+def cancel_after(job, pages):
+    """处理完 pages 页后请求取消（模拟用户点击取消按钮）"""
+    report = job.report_progress
+
+    def progress(done, total):
+        if done >= pages:
+            job.cancel()
+        report(done, total)
+
+    job.report_progress = progress
+
+
+def wait_events(job, timeout=10):
+    events = []
+    deadline = time.monotonic() + timeout
+    while not job.finished and time.monotonic() < deadline:
+        events.extend(job.poll())
+        time.sleep(0.01)
+    return events
+
+
+def test_job_reports_progress_and_result(make_pdf, tmp_path):
+    executor = JobExecutor()
+    try:
+        job = executor.submit(
+            split_pdf, make_pdf("A", 3), str(tmp_path), "out", method="single"
+        )
+        events = wait_events(job)
+    finally:
+        executor.shutdown()
+    assert [event[:2] for event in events[:-1]] == [
+        ("progress", 1), ("progress", 2), ("progress", 3)
+    ]
+    assert events[-1][0] == "done"
+    assert len(events[-1][1]) == 3
+
+
+def test_cancel_split_removes_partial_output(make_pdf, tmp_path):
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    job = BackgroundJob(
+        split_pdf, (make_pdf("A", 5), str(output_dir), "out"), {"method": "single"}
+    )
+    cancel_after(job, 2)
+    job.run()
+    events = job.poll()
+    assert events[-1] == ("cancelled", None)
+    assert job.finished
+    assert list(output_dir.iterdir()) == []
+
+
+def test_cancel_merge_removes_partial_output(make_pdf, tmp_path):
+    output = tmp_path / "merged.pdf"
+    job = BackgroundJob(
+        merge_pdfs, ([make_pdf("A", 3), make_pdf("B", 3)], str(output))
+    )
+    cancel_after(job, 1)
+    job.run()
+    assert job.poll()[-1] == ("cancelled", None)
+    assert not output.exists()
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_cancel_before_start(make_pdf, tmp_path):
+    job = BackgroundJob(split_pdf, (make_pdf("A", 2), str(tmp_path), "out"))
+    job.cancel()
+    job.run()
+    assert job.poll() == [("cancelled", None)]
+    assert not list(tmp_path.glob("out*"))
+
+
+def test_error_is_reported(tmp_path):
+    job = BackgroundJob(merge_pdfs, ([str(tmp_path / "missing.pdf")], "out.pdf"))
+    job.run()
+    events = job.poll()
+    assert events[-1][0] == "error"
+
+
+def test_map_job(make_pdf):
+    paths = [make_pdf("A", 2), make_pdf("B", 3)]
+    executor = JobExecutor(max_workers=2)
+    try:
+        job = executor.map(page_count, paths)
+        events = wait_events(job)
+    finally:
+        executor.shutdown()
+    assert sorted(events) == [("result", 0, 2), ("result", 1, 3)]
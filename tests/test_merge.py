@@ -0,0 +1,88 @@
+import shutil
+
+import pypdf
+import pytest
+from pypdf.generic import ArrayObject, NameObject, NumberObject
+
+from pdf_tools_engine.errors import InputFileError
+from pdf_tools_engine.merge import merge_pdfs
+
+
+def test_merge(make_pdf, labels, tmp_path):
+    a = make_pdf("A", 3)
+    b = make_pdf("B", 2)
+    output = str(tmp_path / "merged.pdf")
+    merge_pdfs([a, b, a], output)
+    assert labels(output) == ["A 1", "A 2", "A 3", "B 1", "B 2", "A 1", "A 2", "A 3"]
+
+
+def test_merge_skips_bad_input(make_pdf, labels, tmp_path):
+    a = make_pdf("A", 2)
+    bad = tmp_path / "bad.pdf"
+    bad.write_bytes(b"not a pdf")
+    output = str(tmp_path / "merged.pdf")
+    with pytest.raises(InputFileError):
+        merge_pdfs([a, str(bad)], output)
+    result = merge_pdfs([a, str(bad), a], output, on_error="skip")
+    assert list(result["skipped"]) == [str(bad)]
+    assert labels(output) == ["A 1", "A 2", "A 1", "A 2"]
+
+
+def test_merge_dedup_shares_streams(make_pdf, tmp_path):
+    a = make_pdf("A", 3)
+    # 内容相同的不同文件
+    copies = []
+    for index in range(4):
+        copy = tmp_path / f"copy{index}.pdf"
+        shutil.copyfile(a, copy)
+        copies.append(str(copy))
+    shared = str(tmp_path / "shared.pdf")
+    separate = str(tmp_path / "separate.pdf")
+    merge_pdfs(copies, shared)
+    merge_pdfs(copies, separate, dedup=False)
+    assert len(pypdf.PdfReader(shared).pages) == 12
+    assert (tmp_path / "shared.pdf").stat().st_size < (
+        tmp_path / "separate.pdf"
+    ).stat().st_size
+
+
+def test_merge_append_keeps_original_bytes(make_pdf, labels, tmp_path):
+    a = make_pdf("A", 2)
+    b = make_pdf("B", 2)
+    output = str(tmp_path / "archive.pdf")
+    merge_pdfs([a], output)
+    original = (tmp_path / "archive.pdf").read_bytes()
+    result = merge_pdfs([b], output, append=True)
+    assert result["page_count"] == 4
+    assert (tmp_path / "archive.pdf").read_bytes().startswith(original)
+    assert labels(output) == ["A 1", "A 2", "B 1", "B 2"]
+
+
+def test_merge_append_ignores_inherited_boxes(make_pdf, tmp_path):
+    a = make_pdf("A", 1)
+    b = make_pdf("B", 1, size=(300, 400))
+    # 原文件的页面树根节点上有 /CropBox，页面自己也有
+    writer = pypdf.PdfWriter(clone_from=a)
+    box = ArrayObject(NumberObject(value) for value in (0, 0, 100, 100))
+    writer._root_object["/Pages"][NameObject("/CropBox")] = box
+    writer.pages[0][NameObject("/CropBox")] = ArrayObject(writer.pages[0].mediabox)
+    output = str(tmp_path / "archive.pdf")
+    writer.write(output)
+
+    merge_pdfs([b], output, append=True)
+    page = pypdf.PdfReader(output).pages[1]
+    assert list(page.cropbox) == [0, 0, 300, 400]
+
+
+def test_merge_owner_password_only(make_pdf, make_encrypted, labels, tmp_path):
+    a = make_encrypted("A", 2)
+    b = make_pdf("B", 1)
+    output = str(tmp_path / "merged.pdf")
+    merge_pdfs([a, b], output)
+    assert labels(output) == ["A 1", "A 2", "B 1"]
+    merge_pdfs([a, b], output, prefetch=0)
+    assert labels(output) == ["A 1", "A 2", "B 1"]
+
+    locked = make_encrypted("C", 1, user_password="secret")
+    with pytest.raises(InputFileError):
+        merge_pdfs([b, locked], output)
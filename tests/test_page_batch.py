@@ -0,0 +1,83 @@
+"""批量插入、替换的测试"""
+
+import csv
+import os
+
+import pytest
+
+from pdf_tools_engine.errors import InputFileError
+from pdf_tools_engine.page_batch import insert_into_files, replace_in_files
+
+
+@pytest.fixture
+def targets(make_pdf, tmp_path):
+    """页数不同的三个目标文件，以及一个损坏的目标文件"""
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    return [make_pdf("T", 2), make_pdf("U", 3), make_pdf("V", 4), str(broken)]
+
+
+def test_insert_into_files_owner_password_only(make_pdf, make_encrypted, labels,
+                                               tmp_path):
+    source = make_encrypted("S", 1)
+    target = make_pdf("T", 2)
+    output_dir = tmp_path / "out"
+    result = insert_into_files(source, [target], str(output_dir), position=2,
+                               workers=1)
+    assert result["errors"] == {}
+    assert labels(result["outputs"][target]) == ["T 1", "S 1", "T 2"]
+
+    locked = make_encrypted("L", 1, user_password="secret")
+    with pytest.raises(InputFileError):
+        insert_into_files(locked, [target], str(output_dir), workers=1)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_insert_into_files(make_pdf, targets, labels, tmp_path, workers):
+    cover = make_pdf("C", 2)
+    summary = tmp_path / "summary.csv"
+    progress = []
+    result = insert_into_files(
+        cover, targets, str(tmp_path / "out"), method="head", insert_range="2",
+        workers=workers, summary_path=str(summary),
+        progress=lambda done, total: progress.append((done, total)),
+    )
+    t, u, v, broken = targets
+    assert labels(result["outputs"][t]) == ["C 2", "T 1", "T 2"]
+    assert labels(result["outputs"][v])[:2] == ["C 2", "V 1"]
+    assert result["page_counts"] == {t: 3, u: 4, v: 5}
+    assert list(result["errors"]) == [broken]
+    assert sorted(progress) == [(n, 4) for n in range(1, 5)]
+
+    with open(summary, encoding="utf-8-sig") as f:
+        rows = {row["目标文件"]: row for row in csv.DictReader(f)}
+    assert rows[u]["页数"] == "4" and rows[u]["结果"] == "成功"
+    assert rows[broken]["结果"].startswith("失败")
+
+
+@pytest.mark.parametrize("mode", ["rewrite", "incremental"])
+def test_replace_in_files(make_pdf, targets, labels, tmp_path, mode):
+    notice = make_pdf("N", 1)
+    result = replace_in_files(
+        notice, targets[:3], str(tmp_path / "out"), method="range",
+        target_range="last", mode=mode, workers=2,
+    )
+    t, u, v = targets[:3]
+    assert result["errors"] == {}
+    assert labels(result["outputs"][t]) == ["T 1", "N 1"]
+    assert labels(result["outputs"][v]) == ["V 1", "V 2", "V 3", "N 1"]
+    if mode == "incremental":
+        original = open(u, "rb").read()
+        assert open(result["outputs"][u], "rb").read().startswith(original)
+
+
+def test_per_target_errors_do_not_stop_batch(make_pdf, targets, tmp_path):
+    notice = make_pdf("N", 1)
+    # 第3页超出 T 的范围，其他目标文件照常处理
+    result = replace_in_files(
+        notice, targets[:3], str(tmp_path / "out"), position=3, workers=1
+    )
+    assert list(result["errors"]) == [targets[0]]
+    assert sorted(map(os.path.basename, result["outputs"].values())) == [
+        "U_replaced.pdf", "V_replaced.pdf"
+    ]
@@ -0,0 +1,73 @@
+import pytest
+
+from pdf_tools_engine.errors import PageRangeError
+from pdf_tools_engine.pages import PageSet, parse_page_ranges
+
+
+def test_parse_ranges():
+    assert list(PageSet.parse("1-3,5", 10)) == [1, 2, 3, 5]
+    assert list(PageSet.parse("8-", 10)) == [8, 9, 10]
+    assert list(PageSet.parse("-2", 10)) == [1, 2]
+    assert list(PageSet.parse("last,3-last", 5)) == [3, 4, 5]
+    assert list(PageSet.parse("", 3)) == [1, 2, 3]
+    assert parse_page_ranges("3,1,2-3", 5) == [1, 2, 3]
+
+
+def test_parse_steps():
+    assert list(PageSet.parse("1-9:2", 10)) == [1, 3, 5, 7, 9]
+    assert list(PageSet.parse("2-:2", 7)) == [2, 4, 6]
+    assert list(PageSet.parse("1-12:2,1-12:3", 12)) == [1, 3, 4, 5, 7, 9, 10, 11]
+    assert list(PageSet.parse("1-9:2,4-6", 10)) == [1, 3, 4, 5, 6, 7, 9]
+
+
+def test_parse_errors():
+    for range_str in ("0", "6", "4-2", "x", "1-3:0"):
+        with pytest.raises(PageRangeError):
+            PageSet.parse(range_str, 5)
+
+
+def test_clamp():
+    assert list(PageSet.parse("4-8", 5, clamp=True)) == [4, 5]
+    assert list(PageSet.parse("3-20:3", 10, clamp=True)) == [3, 6, 9]
+
+
+def test_membership_and_length():
+    pages = PageSet.parse("1-5000000:2,8", 5000000)
+    assert len(pages) == 2500001
+    assert 4999999 in pages
+    assert 8 in pages
+    assert 5000000 not in pages
+    assert 0 not in pages
+    assert pages.first() == 1
+    assert list(pages.runs()) == [(1, 7, 2), (8, 8, 1), (9, 4999999, 2)]
+
+
+def test_step_range_is_one_block():
+    # 带步长的区间不逐页展开
+    pages = PageSet.parse("1-5000000:2", 5000000)
+    assert len(pages._starts) == 1
+
+
+def test_runs():
+    assert list(PageSet.parse("1-3,5,6-8", 10).runs()) == [(1, 3, 1), (5, 8, 1)]
+    assert list(PageSet.parse("2-10:4", 10).runs()) == [(2, 10, 4)]
+    # 多个偏移的块按每个周期内连续的页码生成
+    pages = PageSet.parse("1-12:2,1-12:3", 12)
+    assert list(pages.runs()) == [(1, 1, 1), (3, 5, 1), (7, 7, 1), (9, 11, 1)]
+
+
+def test_complement():
+    assert list(PageSet.parse("2-3,7", 8).complement(8)) == [1, 4, 5, 6, 8]
+    assert list(PageSet.parse("1-9:2", 10).complement(10)) == [2, 4, 6, 8, 10]
+    assert list(PageSet.parse("", 4).complement(4)) == []
+    assert list(PageSet().complement(3)) == [1, 2, 3]
+    pages = PageSet.parse("1-12:2,1-12:3", 12)
+    assert list(pages.complement(12)) == [2, 6, 8, 12]
+
+
+def test_equality_and_merging():
+    assert PageSet([(1, 3), (4, 6)]) == PageSet([(1, 6)])
+    assert PageSet.parse("1-9:2,11-19:2", 20) == PageSet([(1, 19, 2)])
+    assert PageSet.parse("1,3,5", 5) == PageSet.parse("1-5:2", 5)
+    assert PageSet.parse("1-3", 5) != PageSet.parse("1-4", 5)
+    assert not PageSet()
@@ -0,0 +1,46 @@
+import pytest
+
+from pdf_tools_engine.errors import PageRangeError
+from pdf_tools_engine.pages import PageSet
+from pdf_tools_engine.plan import PagePlan
+
+
+def test_plan_runs(make_pdf, labels, tmp_path):
+    a = make_pdf("A", 5)
+    b = make_pdf("B", 2)
+    plan = PagePlan()
+    plan.add(a, (4, 5))
+    plan.add(b)
+    plan.add(a, (1, 1))
+    plan.add(a, (4, 4))  # 同一页用到两次
+    output = str(tmp_path / "out.pdf")
+    result = plan.execute(output)
+    assert result["page_count"] == 6
+    assert labels(output) == ["A 4", "A 5", "B 1", "B 2", "A 1", "A 4"]
+
+
+def test_plan_checks_before_writing(make_pdf, tmp_path):
+    a = make_pdf("A", 3)
+    plan = PagePlan()
+    plan.add(a, (2, 4))
+    output = tmp_path / "out.pdf"
+    with pytest.raises(PageRangeError):
+        plan.execute(str(output))
+    assert not output.exists()
+
+
+def test_plan_step_runs(make_pdf, labels, tmp_path):
+    a = make_pdf("A", 10)
+    plan = PagePlan()
+    plan.add(a, PageSet.parse("1-9:2", 10))
+    assert [(run.start, run.end, run.step) for run in plan.runs] == [(1, 9, 2)]
+    plan.add(a, PageSet.parse("2-4:2", 10))
+    runs, _ = plan.compile()
+    assert [(run.start, run.end, run.step) for run in runs] == [(1, 9, 2), (2, 4, 2)]
+
+    progress = []
+    output = str(tmp_path / "out.pdf")
+    result = plan.execute(output, progress=lambda done, total: progress.append(total))
+    assert result["page_count"] == 7
+    assert labels(output) == ["A 1", "A 3", "A 5", "A 7", "A 9", "A 2", "A 4"]
+    assert set(progress) == {7}
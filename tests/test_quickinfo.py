@@ -0,0 +1,50 @@
+import fitz
+import pytest
+
+from pdf_tools_engine.quickinfo import QuickReadError, quick_page_count
+
+
+def test_xref_table(make_pdf):
+    path = make_pdf("A", 7)
+    assert b"\nxref" in open(path, "rb").read()
+    assert quick_page_count(path) == 7
+
+
+def test_xref_stream(make_pdf, tmp_path):
+    document = fitz.open(make_pdf("A", 5))
+    path = str(tmp_path / "objstm.pdf")
+    document.save(path, use_objstms=1)
+    document.close()
+    data = open(path, "rb").read()
+    assert b"/XRef" in data and b"\nxref" not in data
+    assert quick_page_count(path) == 5
+
+
+def test_incremental_update(make_pdf):
+    path = make_pdf("A", 3)
+    document = fitz.open(path)
+    document.new_page()
+    document.new_page()
+    document.saveIncr()
+    document.close()
+    assert open(path, "rb").read().count(b"%%EOF") == 2
+    assert quick_page_count(path) == 5
+
+
+def test_incremental_update_of_xref_stream(make_pdf, tmp_path):
+    document = fitz.open(make_pdf("A", 2))
+    path = str(tmp_path / "objstm.pdf")
+    document.save(path, use_objstms=1)
+    document.close()
+    document = fitz.open(path)
+    document.delete_page(0)
+    document.saveIncr()
+    document.close()
+    assert quick_page_count(path) == 1
+
+
+def test_damaged_file(tmp_path):
+    path = tmp_path / "bad.pdf"
+    path.write_bytes(b"%PDF-1.4\nnot really a pdf\n")
+    with pytest.raises(QuickReadError):
+        quick_page_count(str(path))
@@ -0,0 +1,62 @@
+from io import BytesIO
+
+import pypdf
+from pypdf.generic import DictionaryObject, NameObject
+
+from pdf_tools_engine.plan import pages_node
+from pdf_tools_engine.rawpdf import ObjectCopier, StreamWriter
+
+
+def copy_document(source_path, output, dedup=False):
+    """用 StreamWriter 和 ObjectCopier 复制整个文档"""
+    reader = pypdf.PdfReader(source_path)
+    writer = StreamWriter(output)
+    copier = ObjectCopier(writer, dedup)
+    pages_ref = writer.allocate()
+    refs = [copier.reserve(page.indirect_reference) for page in reader.pages]
+    for ref, page in zip(refs, reader.pages):
+        page_dict = copier.copy(
+            DictionaryObject(
+                {name: value for name, value in page.items() if name != "/Parent"}
+            )
+        )
+        page_dict[NameObject("/Parent")] = pages_ref
+        writer.write(ref, page_dict)
+        copier.flush()
+    writer.write(pages_ref, pages_node(refs))
+    root_ref = writer.add(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Catalog"),
+                NameObject("/Pages"): pages_ref,
+            }
+        )
+    )
+    writer.finish(root_ref)
+    return writer
+
+
+def test_stream_writer_round_trip(make_pdf, labels, tmp_path):
+    source = make_pdf("A", 3)
+    output = tmp_path / "copy.pdf"
+    with open(output, "wb") as f:
+        copy_document(source, f)
+    reader = pypdf.PdfReader(str(output), strict=True)
+    assert len(reader.pages) == 3
+    assert labels(str(output)) == ["A 1", "A 2", "A 3"]
+
+
+def test_fingerprints_shared_only_after_flush(make_pdf):
+    source = make_pdf("A", 1)
+    page = pypdf.PdfReader(source).pages[0]
+    writer = StreamWriter(BytesIO())
+    copier = ObjectCopier(writer, dedup=True)
+    copier.copy(page.raw_get("/Contents"))
+    # 还没有写出的流不能被其他文档引用
+    assert writer.shared_streams == {}
+    copier.flush()
+    assert len(writer.shared_streams) == 1
+
+    other = ObjectCopier(writer, dedup=True)
+    contents = pypdf.PdfReader(source).pages[0].raw_get("/Contents")
+    assert other.copy(contents) == list(writer.shared_streams.values())[0]
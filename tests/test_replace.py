@@ -0,0 +1,49 @@
+import pypdf
+import pytest
+
+from pdf_tools_engine.replace import replace_pdf
+
+
+def test_replace(make_pdf, labels, tmp_path):
+    a = make_pdf("A", 4)
+    b = make_pdf("B", 3)
+    output = str(tmp_path / "replaced.pdf")
+    replace_pdf(a, b, output, position=3, source_range="2")
+    assert labels(output) == ["A 1", "A 2", "B 2", "A 4"]
+    replace_pdf(
+        a, b, output, method="range", target_range="1,4", source_range="1,3"
+    )
+    assert labels(output) == ["B 1", "A 2", "A 3", "B 3"]
+
+
+def test_replace_incremental(make_pdf, labels, tmp_path):
+    a = make_pdf("A", 4)
+    b = make_pdf("B", 3, size=(300, 400))
+    original = open(a, "rb").read()
+    output = str(tmp_path / "replaced.pdf")
+    replace_pdf(
+        a, b, output, method="range", target_range="2-3", source_range="3,1",
+        mode="incremental",
+    )
+    data = open(output, "rb").read()
+    assert data.startswith(original)
+    assert data.count(b"%%EOF") == original.count(b"%%EOF") + 1
+    assert labels(output) == ["A 1", "B 1", "B 3", "A 4"]
+    assert list(pypdf.PdfReader(output).pages[1].mediabox) == [0, 0, 300, 400]
+
+
+def test_replace_incremental_in_place(make_pdf, labels):
+    a = make_pdf("A", 3)
+    b = make_pdf("B", 1)
+    replace_pdf(a, b, a, position=3, mode="incremental")
+    assert labels(a) == ["A 1", "A 2", "B 1"]
+    with pytest.raises(ValueError):
+        replace_pdf(a, b, a, mode="unknown")
+
+
+def test_replace_owner_password_only(make_pdf, make_encrypted, labels, tmp_path):
+    a = make_encrypted("A", 3)
+    b = make_pdf("B", 1)
+    output = str(tmp_path / "replaced.pdf")
+    replace_pdf(a, b, output, position=2)
+    assert labels(output) == ["A 1", "B 1", "A 3"]
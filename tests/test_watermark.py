@@ -0,0 +1,182 @@
+import os
+
+import fitz
+import pypdf
+import pytest
+from PIL import Image
+from reportlab.pdfgen import canvas
+
+from pdf_tools_engine.fonts import FALLBACK_FONT_NAME
+from pdf_tools_engine.watermark import (
+    OverlayCache,
+    add_image_watermark,
+    add_text_watermark,
+    render_text_overlay,
+)
+
+
+def page_pixels(path, page_index=0):
+    """渲染一页，返回像素数据"""
+    with fitz.open(path) as document:
+        return document[page_index].get_pixmap(dpi=36).samples
+
+
+@pytest.mark.parametrize("mode", ["merge", "xobject", "incremental"])
+@pytest.mark.parametrize("style", ["repeat", "pattern", "single"])
+def test_text_styles_and_modes(make_pdf, labels, tmp_path, style, mode):
+    source = make_pdf("A", 3)
+    output = str(tmp_path / "out.pdf")
+    assert add_text_watermark(source, output, "WM", style=style, mode=mode) == output
+    # 原页面的文字不变
+    assert all(f"A {n}" in label for n, label in enumerate(labels(output), 1))
+    for page_index in range(3):
+        assert page_pixels(output, page_index) != page_pixels(source, page_index)
+
+
+def test_pattern_overlay_size_is_fixed():
+    def size(style, side):
+        return len(
+            render_text_overlay(side, side, "WM", FALLBACK_FONT_NAME, 30, style)
+        )
+
+    # 平铺图案的内容大小与页面大小无关，逐个绘制的平铺水印随页面面积增长
+    assert abs(size("pattern", 4000) - size("pattern", 200)) < 64
+    assert size("repeat", 4000) > 2 * size("repeat", 200)
+
+
+def stream_count(path, subtype):
+    """文件中 /Subtype 为 subtype 的流对象个数"""
+    reader = pypdf.PdfReader(path)
+    count = 0
+    for number in range(1, reader.trailer["/Size"]):
+        obj = reader.get_object(number)
+        if isinstance(obj, pypdf.generic.StreamObject):
+            count += obj.get("/Subtype") == subtype
+    return count
+
+
+@pytest.mark.parametrize("mode", ["merge", "xobject"])
+def test_page_parallel(make_pdf, labels, tmp_path, mode):
+    source = make_pdf("A", 45)
+    serial = str(tmp_path / "serial.pdf")
+    parallel = str(tmp_path / "parallel.pdf")
+    add_text_watermark(source, serial, "WM", mode=mode)
+    progress = []
+    add_text_watermark(
+        source, parallel, "WM", mode=mode, workers=2,
+        progress=lambda done, total: progress.append((done, total)),
+    )
+    assert labels(parallel) == labels(serial)
+    assert progress[-1] == (45, 45)
+    # 各块的水印拼接后只保留一份
+    if mode == "xobject":
+        assert stream_count(parallel, "/Form") == 1
+    assert not list(tmp_path.glob("*.part"))
+
+
+@pytest.fixture
+def logo(tmp_path):
+    path = str(tmp_path / "logo.png")
+    Image.new("RGB", (40, 20), (200, 30, 30)).save(path)
+    return path
+
+
+def write_mixed_sizes(path, sizes):
+    """每页尺寸依次取 sizes 中的值"""
+    pdf = canvas.Canvas(str(path))
+    for page_num, size in enumerate(sizes, 1):
+        pdf.setPageSize(size)
+        pdf.drawString(20, 20, f"M {page_num}")
+        pdf.showPage()
+    pdf.save()
+    return str(path)
+
+
+def test_overlay_rendered_once_per_page_size(tmp_path, logo):
+    source = write_mixed_sizes(
+        tmp_path / "mixed.pdf", [(200, 200), (300, 200), (200, 200), (300, 200)]
+    )
+    cache = OverlayCache()
+    add_text_watermark(source, str(tmp_path / "a.pdf"), "WM", overlay_cache=cache)
+    assert (cache.misses, cache.hits) == (2, 2)
+
+    # 同一个缓存用于其他文档时直接复用
+    add_text_watermark(source, str(tmp_path / "b.pdf"), "WM", overlay_cache=cache)
+    assert (cache.misses, cache.hits) == (2, 6)
+
+    # 参数不同时重新绘制，图片水印也使用缓存
+    add_text_watermark(
+        source, str(tmp_path / "c.pdf"), "WM", alpha=0.5, overlay_cache=cache
+    )
+    add_image_watermark(source, str(tmp_path / "d.pdf"), logo, overlay_cache=cache)
+    assert (cache.misses, cache.hits) == (6, 10)
+
+
+def test_overlay_cache_evicts_least_recently_used():
+    cache = OverlayCache(max_entries=2)
+
+    def get(key):
+        def render():
+            return render_text_overlay(100, 100, key, FALLBACK_FONT_NAME, 12, "single")
+
+        return cache.get(key, render)
+
+    a, b = get("a"), get("b")
+    assert get("a") is a
+    get("c")
+    # 加入 c 时淘汰最久未用的 b，a 保留
+    assert get("a") is a
+    assert get("b") is not b
+    assert (cache.misses, cache.hits) == (4, 2)
+
+
+@pytest.mark.parametrize("style", ["repeat", "pattern", "single"])
+def test_xobject_mode_writes_watermark_once(make_pdf, tmp_path, logo, style):
+    source = make_pdf("A", 20)
+    merged = str(tmp_path / "merge.pdf")
+    shared = str(tmp_path / "xobject.pdf")
+    add_image_watermark(source, merged, logo, style=style, mode="merge")
+    add_image_watermark(source, shared, logo, style=style, mode="xobject")
+    assert stream_count(shared, "/Form") == 1
+    assert stream_count(shared, "/Image") == 1
+    assert os.path.getsize(shared) <= os.path.getsize(merged)
+    for page_index in (0, 19):
+        assert page_pixels(shared, page_index) == page_pixels(merged, page_index)
+
+
+def test_xobject_mode_one_form_per_page_size(tmp_path, logo):
+    source = write_mixed_sizes(
+        tmp_path / "mixed.pdf", [(200, 200), (300, 200), (200, 200)]
+    )
+    output = str(tmp_path / "out.pdf")
+    add_image_watermark(source, output, logo, mode="xobject")
+    assert stream_count(output, "/Form") == 2
+
+
+def test_incremental_mode_appends_to_original(make_pdf, labels, tmp_path):
+    source = make_pdf("A", 4)
+    original = open(source, "rb").read()
+    output = str(tmp_path / "out.pdf")
+    add_text_watermark(source, output, "WM", mode="incremental", page_indices=[1, 3])
+
+    data = open(output, "rb").read()
+    assert data.startswith(original)
+    assert data.count(b"%%EOF") == original.count(b"%%EOF") + 1
+    assert open(source, "rb").read() == original
+    # 只有指定的页加了水印，其他页面原样保留
+    assert all(f"A {n}" in label for n, label in enumerate(labels(output), 1))
+    changed = [
+        page_pixels(output, page_index) != page_pixels(source, page_index)
+        for page_index in range(4)
+    ]
+    assert changed == [False, True, False, True]
+
+
+def test_incremental_mode_in_place(make_pdf, tmp_path):
+    source = make_pdf("A", 2)
+    before = page_pixels(source)
+    size = os.path.getsize(source)
+    add_text_watermark(source, source, "WM", mode="incremental")
+    assert os.path.getsize(source) > size
+    assert page_pixels(source) != before
+    assert not list(tmp_path.glob("*.part"))
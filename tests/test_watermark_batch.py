@@ -0,0 +1,65 @@
+import os
+
+import pytest
+from PIL import Image
+
+from pdf_tools_engine.errors import WatermarkError
+from pdf_tools_engine.watermark_batch import watermark_files
+
+
+@pytest.fixture
+def documents(make_pdf, tmp_path):
+    """文件夹中的三个PDF文件和一个损坏的PDF文件"""
+    folder = tmp_path / "in"
+    folder.mkdir()
+    paths = [make_pdf(label, 2) for label in ("A", "B", "C")]
+    for path in paths:
+        os.replace(path, folder / os.path.basename(path))
+    (folder / "broken.pdf").write_bytes(b"not a pdf")
+    return folder
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_text_watermark_files(documents, labels, tmp_path, workers):
+    output_dir = tmp_path / "out"
+    progress = []
+    result = watermark_files(
+        str(documents), str(output_dir), "text", workers=workers,
+        progress=lambda done, total: progress.append((done, total)), text="WM",
+    )
+    assert sorted(os.path.basename(path) for path in result["outputs"].values()) == [
+        "A_watermarked.pdf", "B_watermarked.pdf", "C_watermarked.pdf"
+    ]
+    for output in result["outputs"].values():
+        name = os.path.basename(output)[0]
+        assert all(f"{name} {n}" in label for n, label in enumerate(labels(output), 1))
+    assert list(result["errors"]) == [str(documents / "broken.pdf")]
+    assert sorted(progress) == [(n, 4) for n in range(1, 5)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_image_watermark_files(documents, tmp_path, monkeypatch, workers):
+    logo = tmp_path / "logo.png"
+    Image.new("RGB", (40, 20), (200, 30, 30)).save(logo)
+    work_dir = tmp_path / "cwd"
+    work_dir.mkdir()
+    monkeypatch.chdir(work_dir)
+    result = watermark_files(
+        [str(documents / "A.pdf"), str(documents / "B.pdf")], str(tmp_path / "out"),
+        "image", workers=workers, image_path=str(logo), mode="xobject",
+    )
+    assert len(result["outputs"]) == 2 and result["errors"] == {}
+    # 不使用共享的临时图片文件
+    assert list(work_dir.iterdir()) == []
+
+
+def test_watermark_files_checks_arguments(documents, tmp_path):
+    with pytest.raises(WatermarkError):
+        watermark_files(str(documents), str(tmp_path / "out"), "text", text="")
+    with pytest.raises(WatermarkError):
+        watermark_files(
+            str(documents), str(tmp_path / "out"), "image",
+            image_path=str(tmp_path / "missing.png"),
+        )
+    with pytest.raises(WatermarkError):
+        watermark_files(str(documents), str(tmp_path / "out"), "stamp")